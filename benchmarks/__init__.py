@@ -0,0 +1,14 @@
+"""Performance benchmarks for the :mod:`fauxfactory` factories.
+
+Every ``gen_*`` factory exported by :mod:`fauxfactory` is timed with a few
+representative argument sets (see :mod:`benchmarks.cases`) and the results
+are printed as a table and optionally saved as JSON::
+
+    python -m benchmarks
+    python -m benchmarks --filter gen_alpha --output results.json
+
+Run ``python -m benchmarks --help`` for all the options. Saved results can be
+compared with :mod:`fauxfactory.bench`::
+
+    python -m fauxfactory.bench compare old.json new.json
+"""
@@ -0,0 +1,124 @@
+"""Run the benchmarks: ``python -m benchmarks --help``."""
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Any
+
+from .cases import Case, all_cases
+from .harness import run
+
+
+def format_duration(nanoseconds: float) -> str:
+    """Return a duration in the most readable unit."""
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if nanoseconds >= scale:
+            return f"{nanoseconds / scale:.2f} {unit}"
+    return f"{nanoseconds:.0f} ns"
+
+
+def format_bytes(size: float) -> str:
+    """Return a size in the most readable unit."""
+    for unit, scale in (("MiB", 1 << 20), ("KiB", 1 << 10)):
+        if size >= scale:
+            return f"{size / scale:.1f} {unit}"
+    return f"{size:.0f} B"
+
+
+def print_result(case: Case, result: dict[str, Any]) -> None:
+    """Print the results of a case as a row of the results table."""
+    print(
+        f"{case.name:<52} {result['ops_per_sec']:>14,.0f}"
+        f" {format_duration(result['p50_ns']):>11}"
+        f" {format_duration(result['p99_ns']):>11}"
+        f" {format_bytes(result['peak_bytes']):>11}",
+        flush=True,
+    )
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark every fauxfactory gen_* factory.",
+    )
+    parser.add_argument(
+        "-k",
+        "--filter",
+        action="append",
+        default=[],
+        metavar="REGEX",
+        help="only run the cases whose name matches REGEX (can be repeated)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        metavar="FILE",
+        help="save the results as JSON to FILE ('-' for the standard output)",
+    )
+    parser.add_argument(
+        "--rounds", type=int, default=5, help="number of throughput rounds"
+    )
+    parser.add_argument(
+        "--round-time",
+        type=float,
+        default=0.1,
+        metavar="SECONDS",
+        help="minimum duration of a throughput round",
+    )
+    parser.add_argument(
+        "--max-samples",
+        type=int,
+        default=1000,
+        help="maximum number of calls timed one by one for latencies",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="seed of the random generator"
+    )
+    parser.add_argument("--list", action="store_true", help="list the cases and exit")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmarks and report the results."""
+    args = parse_args(argv)
+    patterns = [re.compile(pattern) for pattern in args.filter]
+    cases = [
+        case
+        for case in all_cases()
+        if not patterns or any(pattern.search(case.name) for pattern in patterns)
+    ]
+    if args.list:
+        for case in cases:
+            print(case.name)
+        return 0
+    if not cases:
+        print("No benchmark case matches the filters", file=sys.stderr)
+        return 1
+
+    # Keep the standard output for the JSON report if requested
+    to_stdout = args.output == "-"
+    if not to_stdout:
+        print(f"{'case':<52} {'ops/sec':>14} {'p50':>11} {'p99':>11} {'peak mem':>11}")
+    report = run(
+        cases,
+        progress=None if to_stdout else print_result,
+        rounds=args.rounds,
+        round_time=args.round_time,
+        max_samples=args.max_samples,
+        seed=args.seed,
+    )
+
+    if to_stdout:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    elif args.output:
+        with Path(args.output).open("w", encoding="utf-8") as handler:
+            json.dump(report, handler, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
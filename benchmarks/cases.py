@@ -0,0 +1,233 @@
+"""Argument sets used to benchmark every ``gen_*`` factory."""
+
+import datetime
+from collections.abc import Callable
+from functools import partial
+from typing import Any
+
+import fauxfactory
+from fauxfactory import (
+    gen_alpha,
+    gen_boolean,
+    gen_date,
+    gen_email,
+    gen_integer,
+    gen_ipaddr,
+    gen_uuid,
+)
+
+
+class Case:
+    """A factory called with a given set of arguments.
+
+    :param str factory: Name of the factory, as exported by
+        :mod:`fauxfactory`.
+    :param str params: Short description of the arguments, unique for the
+        factory.
+    :param call: Function calling the factory once with the arguments.
+    """
+
+    __slots__ = ("call", "factory", "params")
+
+    def __init__(self, factory: str, params: str, call: Callable[[], Any]) -> None:
+        self.factory = factory
+        self.params = params
+        self.call = call
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.name!r})"
+
+    @property
+    def name(self) -> str:
+        """Return the unique name of the case, e.g. ``gen_alpha[length=10]``."""
+        return f"{self.factory}[{self.params}]"
+
+
+def case(factory: str, params: str, /, *args: Any, **kwargs: Any) -> Case:
+    """Return a case calling ``factory`` with ``args`` and ``kwargs``."""
+    return Case(
+        factory, params, partial(getattr(fauxfactory, factory), *args, **kwargs)
+    )
+
+
+SMALL_SCHEMA: dict[str, Any] = {
+    "id": gen_uuid,
+    "name": gen_alpha,
+    "email": gen_email,
+    "active": True,
+}
+
+LARGE_SCHEMA: dict[str, Any] = {
+    "id": gen_uuid,
+    "name": gen_alpha,
+    "email": gen_email,
+    "age": lambda: gen_integer(min_value=18, max_value=99),
+    "active": gen_boolean,
+    "created": lambda: gen_date().isoformat(),
+    "address": {
+        "street": lambda: gen_alpha(length=20),
+        "city": gen_alpha,
+        "zip": lambda: gen_integer(min_value=10000, max_value=99999),
+        "country": "US",
+    },
+    "servers": [
+        {
+            "ip": gen_ipaddr,
+            "ipv6": lambda: gen_ipaddr(ipv6=True),
+            "cores": lambda: gen_integer(min_value=1, max_value=64),
+        }
+    ],
+    "tags": [gen_alpha],
+    "meta": {"source": "benchmark", "version": 1, "nested": {"flag": gen_boolean}},
+}
+LARGE_LIST_SIZES = {"servers": 10, "tags": 20}
+
+# Regular expressions matched by every string of the factory, so that the
+# validated cases measure the cost of validation and not of retries
+STRING_VALIDATORS = {
+    "gen_alpha": "^[A-Za-z]+$",
+    "gen_alphanumeric": "^[A-Za-z0-9]+$",
+    "gen_numeric_string": "^[0-9]+$",
+}
+
+MIN_DATE = datetime.date(2000, 1, 1)
+MAX_DATE = datetime.date(2030, 12, 31)
+
+
+def _string_cases() -> list[Case]:
+    cases = []
+    for factory in (
+        "gen_alpha",
+        "gen_alphanumeric",
+        "gen_cjk",
+        "gen_cyrillic",
+        "gen_html",
+        "gen_latin1",
+        "gen_numeric_string",
+        "gen_special",
+        "gen_utf8",
+    ):
+        cases.append(case(factory, "length=10", length=10))
+        cases.append(case(factory, "length=1000", length=1000))
+        cases.append(
+            case(
+                factory,
+                "length=10,validator=callable",
+                length=10,
+                validator=bool,
+                default="",
+            )
+        )
+        if factory in STRING_VALIDATORS:
+            cases.append(
+                case(
+                    factory,
+                    "length=10,validator=regex",
+                    length=10,
+                    validator=STRING_VALIDATORS[factory],
+                    default="",
+                )
+            )
+    cases.append(case("gen_string", "alpha,length=10", "alpha", 10))
+    cases.append(case("gen_string", "utf8,length=1000", "utf8", 1000))
+    cases.append(case("gen_string_many", "alpha,count=100", "alpha", 100, 10))
+    cases.append(case("gen_string_many", "utf8,count=100", "utf8", 100, 10))
+    cases.append(case("gen_from_regex", "id", r"[A-Z]{3}-\d{4}"))
+    cases.append(case("gen_from_regex", "email", r"[a-z]{5,10}@[a-z]{5}\.(com|org)"))
+    cases.append(case("gen_from_template", "id", "usr-{alpha:8}-{int:0:999}"))
+    cases.append(case("gen_from_template", "email", "{alpha:8}@{domain}"))
+    cases.append(case("gen_iplum", "default"))
+    cases.append(case("gen_iplum", "words=1000", words=1000))
+    cases.append(case("gen_iplum", "paragraphs=10", paragraphs=10))
+    return cases
+
+
+def _structure_cases() -> list[Case]:
+    return [
+        case("gen_dict", "small", SMALL_SCHEMA),
+        case("gen_dict", "large", LARGE_SCHEMA, list_sizes=LARGE_LIST_SIZES),
+        case(
+            "gen_dict",
+            "small,validator=callable",
+            SMALL_SCHEMA,
+            validator=lambda value: "id" in value,
+            default={},
+        ),
+        case("gen_json", "small", SMALL_SCHEMA),
+        case("gen_json", "large", LARGE_SCHEMA, list_sizes=LARGE_LIST_SIZES),
+        case("gen_json", "large,indent=2", LARGE_SCHEMA, indent=2),
+        case("gen_list", "small", gen_alpha),
+        case("gen_list", "large", SMALL_SCHEMA, size=100),
+        case("gen_columns", "small,count=100", SMALL_SCHEMA, 100),
+        case(
+            "gen_columns",
+            "large,count=100",
+            LARGE_SCHEMA,
+            100,
+            list_sizes=LARGE_LIST_SIZES,
+        ),
+        case(
+            "gen_columns",
+            "small,count=1000,string_buffers",
+            SMALL_SCHEMA,
+            1000,
+            string_buffers=True,
+        ),
+    ]
+
+
+def _fleet(count: int) -> list[dict[str, Any]]:
+    return list(fauxfactory.gen_fleet(count, processes=1))
+
+
+def _unique(factory: str, /, *args: Any, **kwargs: Any) -> Case:
+    """Return a case drawing 100 values out of a ``gen_unique_*`` factory."""
+
+    def call() -> list[Any]:
+        return list(getattr(fauxfactory, factory)(*args, count=100, **kwargs))
+
+    params = ",".join([*map(repr, args), *(f"{k}={v!r}" for k, v in kwargs.items())])
+    return Case(factory, ",".join(filter(None, [params, "count=100"])), call)
+
+
+def all_cases() -> list[Case]:
+    """Return the benchmark cases of every factory.
+
+    :returns: A list of cases, at least one per ``gen_*`` factory.
+    :rtype: list
+    """
+    return [
+        case("gen_boolean", "default"),
+        case("gen_choice", "range(100)", range(100)),
+        case("gen_choice", "tuple(3)", ("a", "b", "c")),
+        case("gen_uuid", "default"),
+        case("gen_date", "default"),
+        case("gen_date", "bounded", MIN_DATE, MAX_DATE),
+        case("gen_datetime", "default"),
+        case("gen_time", "default"),
+        case("gen_domain", "default"),
+        case("gen_email", "default"),
+        case("gen_ipaddr", "ipv4"),
+        case("gen_ipaddr", "ipv6", ipv6=True),
+        case("gen_ipaddr", "prefix", prefix=[10, 0]),
+        case("gen_mac", "default"),
+        _unique("gen_unique_ipaddrs"),
+        _unique("gen_unique_ipaddrs", ipv6=True),
+        _unique("gen_unique_macs"),
+        case("gen_netmask", "default"),
+        case("gen_url", "default"),
+        case("gen_integer", "default"),
+        case("gen_integer", "bounded", min_value=0, max_value=100),
+        case("gen_negative_integer", "default"),
+        case("gen_positive_integer", "default"),
+        case("gen_number", "default"),
+        case("gen_octagonal", "default"),
+        case("gen_hexadecimal", "default"),
+        _unique("gen_unique_integers"),
+        _unique("gen_unique_integers", 0, 999),
+        *_string_cases(),
+        *_structure_cases(),
+        case("gen_system_facts", "default"),
+        case("gen_system_facts", "materialize=False", materialize=False),
+        Case("gen_fleet", "count=10", partial(_fleet, 10)),
+    ]
@@ -0,0 +1,168 @@
+"""Time benchmark cases and collect their results."""
+
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Iterable
+from datetime import datetime, timezone
+from importlib import metadata
+from itertools import repeat
+from typing import Any
+
+from fauxfactory import seeded
+from fauxfactory.bench import REPORT_FORMAT
+
+from .cases import Case
+
+
+def _time_loop(call: Callable[[], Any], loops: int) -> float:
+    """Return the number of seconds taken by ``loops`` calls to ``call``."""
+    start = time.perf_counter()
+    for _ in repeat(None, loops):
+        call()
+    return time.perf_counter() - start
+
+
+def calibrate(call: Callable[[], Any], round_time: float) -> int:
+    """Return how many calls to ``call`` take at least ``round_time`` seconds."""
+    loops = 1
+    while True:
+        elapsed = _time_loop(call, loops)
+        if elapsed >= round_time:
+            return loops
+        # Aim a bit above the target to avoid one more iteration
+        loops = max(loops * 2, int(loops * 1.2 * round_time / max(elapsed, 1e-9)))
+
+
+def timer_overhead() -> int:
+    """Return the cost of reading the clock twice, in nanoseconds."""
+    clock = time.perf_counter_ns
+    return min(-clock() + clock() for _ in range(1000))
+
+
+def latencies(call: Callable[[], Any], samples: int) -> list[int]:
+    """Return the duration of ``samples`` calls to ``call``, in nanoseconds."""
+    clock = time.perf_counter_ns
+    overhead = timer_overhead()
+    durations = []
+    for _ in repeat(None, samples):
+        start = clock()
+        call()
+        durations.append(max(clock() - start - overhead, 0))
+    return durations
+
+
+def peak_allocations(call: Callable[[], Any], samples: int) -> int:
+    """Return the median memory peak of a call to ``call``, in bytes.
+
+    The peak is the highest amount of memory allocated by Python during the
+    call on top of the memory allocated before it, as traced by
+    :mod:`tracemalloc`.
+    """
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in repeat(None, samples):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            call()
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+    return int(statistics.median(peaks))
+
+
+def percentile(values: list[int], fraction: float) -> int:
+    """Return the value below which ``fraction`` of ``values`` fall."""
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def measure(
+    case: Case,
+    *,
+    rounds: int = 5,
+    round_time: float = 0.1,
+    max_samples: int = 1000,
+    seed: int = 0,
+) -> dict[str, Any]:
+    """Benchmark a case.
+
+    The throughput is measured over ``rounds`` rounds of back to back calls,
+    each of them lasting about ``round_time`` seconds, and the latency
+    percentiles over calls timed one by one.
+
+    :param case: The case to benchmark.
+    :param int rounds: Number of throughput rounds.
+    :param float round_time: Minimum duration of a round, in seconds.
+    :param int max_samples: Maximum number of calls timed one by one.
+    :param int seed: Seed of the generator the factory draws values from.
+    :returns: The results of the case, as stored in the JSON report.
+    :rtype: dict
+    """
+    call = case.call
+    with seeded(seed):
+        # Warm up caches and lazy imports before timing anything
+        call()
+        loops = calibrate(call, round_time)
+        throughput = [loops / _time_loop(call, loops) for _ in range(rounds)]
+        samples = max(min(2 * loops, max_samples), 10)
+        durations = latencies(call, samples)
+        peak = peak_allocations(call, min(samples, 20))
+
+    return {
+        "factory": case.factory,
+        "params": case.params,
+        "loops": loops,
+        "rounds": throughput,
+        "ops_per_sec": statistics.median(throughput),
+        "samples": samples,
+        "p50_ns": percentile(durations, 0.5),
+        "p99_ns": percentile(durations, 0.99),
+        "peak_bytes": peak,
+    }
+
+
+def fauxfactory_version() -> str:
+    """Return the version of the installed fauxfactory distribution."""
+    try:
+        return metadata.version("fauxfactory")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def run(
+    cases: Iterable[Case],
+    *,
+    progress: Callable[[Case, dict[str, Any]], None] | None = None,
+    **options: Any,
+) -> dict[str, Any]:
+    """Benchmark several cases.
+
+    :param cases: The cases to benchmark.
+    :param progress: Function called with every case and its results as soon
+        as it is benchmarked.
+    :param options: Keyword arguments passed to :func:`measure`.
+    :returns: The JSON report: the environment the benchmarks ran in and the
+        results of every case, by case name.
+    :rtype: dict
+    """
+    # datetime.UTC is not available on Python 3.10
+    created = datetime.now(timezone.utc)  # noqa: UP017
+    results = {}
+    for case in cases:
+        results[case.name] = measure(case, **options)
+        if progress is not None:
+            progress(case, results[case.name])
+    return {
+        "format": REPORT_FORMAT,
+        "created": created.isoformat(timespec="seconds"),
+        "fauxfactory": fauxfactory_version(),
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "options": options,
+        "results": results,
+    }
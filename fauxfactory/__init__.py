@@ -1,33 +1,124 @@
 """Generate random data for your tests."""
 
+# Factories are loaded lazily: importing the package only builds the table
+# below and each submodule is imported the first time one of its symbols is
+# looked up through the module level ``__getattr__``. This keeps ``import
+# fauxfactory`` cheap for short-lived processes.
+#
 # Note flake8 do not like star imports. It makes tracking down the file/module
 # containg the symbol much harder than with explicit imports. This is an issue
-# especially for a human reader. As symbols in this file were always taken from
-# submodules dynamically this problem was there before introducing the start
-# imports. Star imports seem to not be a problem for (perhaps) smarter tools
-# like PyCharm and using them improves the analysis and navigation trough
-# the code.
-
-from fauxfactory.factories.booleans import *  # noqa: F403
-from fauxfactory.factories.choices import *  # noqa: F403
-from fauxfactory.factories.dates import *  # noqa: F403
-from fauxfactory.factories.internet import *  # noqa: F403
-from fauxfactory.factories.numbers import *  # noqa: F403
-from fauxfactory.factories.strings import *  # noqa: F403
-from fauxfactory.factories.structures import *  # noqa: F403
-from fauxfactory.factories.systems import *  # noqa: F403
-
-__factories = {name: obj for name, obj in locals().items() if name.startswith("gen_")}
+# especially for a human reader. Star imports seem to not be a problem for
+# (perhaps) smarter tools like PyCharm and using them improves the analysis
+# and navigation trough the code, hence they are kept for type checkers.
+
+import os
+import random
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+# Seeded at import time, not when the first factory module is loaded, so
+# that seeding the global generator after importing the package is honored
+if "FAUXFACTORY_DISABLE_SEED_RANDOMIZATION" not in os.environ:
+    random.seed()
+
+if TYPE_CHECKING:
+    from fauxfactory.backends import BufferedSystemRandom as BufferedSystemRandom
+    from fauxfactory.backends import NumpyRandom as NumpyRandom
+    from fauxfactory.factories.booleans import *  # noqa: F403
+    from fauxfactory.factories.choices import *  # noqa: F403
+    from fauxfactory.factories.dates import *  # noqa: F403
+    from fauxfactory.factories.internet import *  # noqa: F403
+    from fauxfactory.factories.numbers import *  # noqa: F403
+    from fauxfactory.factories.numbers import (
+        IntegerPermutation as IntegerPermutation,
+    )
+    from fauxfactory.factories.regex import *  # noqa: F403
+    from fauxfactory.factories.regex import compile_regex as compile_regex
+    from fauxfactory.factories.strings import *  # noqa: F403
+    from fauxfactory.factories.structures import *  # noqa: F403
+    from fauxfactory.factories.structures import compile_schema as compile_schema
+    from fauxfactory.factories.structures import (
+        parallel_generate as parallel_generate,
+    )
+    from fauxfactory.factories.systems import *  # noqa: F403
+    from fauxfactory.factories.templates import *  # noqa: F403
+    from fauxfactory.factories.templates import compile_template as compile_template
+    from fauxfactory.faux import Faux as Faux
+    from fauxfactory.rng import derive_seed as derive_seed
+    from fauxfactory.rng import seeded as seeded
+    from fauxfactory.uniqueness import UniqueRegistry as UniqueRegistry
+    from fauxfactory.uniqueness import unique as unique
+
+# Public symbols grouped by the module defining them. Every ``gen_*`` name
+# listed in the ``__all__`` of a factories module must be listed here too.
+__modules = {
+    "fauxfactory.backends": ("BufferedSystemRandom", "NumpyRandom"),
+    "fauxfactory.factories.booleans": ("gen_boolean",),
+    "fauxfactory.factories.choices": ("gen_choice", "gen_uuid"),
+    "fauxfactory.factories.dates": ("gen_date", "gen_datetime", "gen_time"),
+    "fauxfactory.factories.internet": (
+        "gen_domain",
+        "gen_email",
+        "gen_ipaddr",
+        "gen_mac",
+        "gen_netmask",
+        "gen_unique_ipaddrs",
+        "gen_unique_macs",
+        "gen_url",
+    ),
+    "fauxfactory.factories.numbers": (
+        "gen_integer",
+        "gen_negative_integer",
+        "gen_positive_integer",
+        "gen_number",
+        "gen_octagonal",
+        "gen_hexadecimal",
+        "gen_unique_integers",
+        "IntegerPermutation",
+    ),
+    "fauxfactory.factories.regex": ("compile_regex", "gen_from_regex"),
+    "fauxfactory.factories.strings": (
+        "gen_string",
+        "gen_string_many",
+        "gen_alpha",
+        "gen_alphanumeric",
+        "gen_cjk",
+        "gen_cyrillic",
+        "gen_html",
+        "gen_iplum",
+        "gen_latin1",
+        "gen_numeric_string",
+        "gen_utf8",
+        "gen_special",
+    ),
+    "fauxfactory.factories.structures": (
+        "compile_schema",
+        "gen_dict",
+        "gen_json",
+        "gen_list",
+        "gen_columns",
+        "parallel_generate",
+    ),
+    "fauxfactory.factories.systems": ("gen_fleet", "gen_system_facts"),
+    "fauxfactory.factories.templates": ("compile_template", "gen_from_template"),
+    "fauxfactory.faux": ("Faux",),
+    "fauxfactory.rng": ("derive_seed", "seeded"),
+    "fauxfactory.uniqueness": ("UniqueRegistry", "unique"),
+}
+__symbols = {name: module for module, names in __modules.items() for name in names}
 
 # Add all method names to __all__
-__all__ = tuple(__factories.keys())
+__all__ = tuple(__symbols)
 
 
 def __dir__():
     return __all__
 
 
-def __getattr__(name):
-    if name in __factories:
-        return __factories[name]
+def __getattr__(name: str) -> Any:
+    if name in __symbols:
+        value = getattr(import_module(__symbols[name]), name)
+        # Cache the symbol so that next lookups do not go through here
+        globals()[name] = value
+        return value
     raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,287 @@
+"""Random number generator backends.
+
+Factories draw their values from the generator returned by
+:func:`fauxfactory.rng.get_random`, so they use any :class:`random.Random`
+instance or subclass activated with :func:`~fauxfactory.rng.use_random`,
+:func:`~fauxfactory.rng.seeded` or ``Faux(rng=...)``. A backend is such a
+subclass: :class:`random.Random` derives ``randrange()``, ``randint()``,
+``choice()``, ``choices()``, ``sample()`` and the other methods used by the
+factories from three primitives, ``random()``, ``getrandbits()`` and
+``randbytes()``, which are the only methods a backend has to provide.
+Backends may also provide an ``integers(min_value, max_value, count)``
+method generating integers in bulk, used through :func:`random_integers`.
+
+The backends available are:
+
+* :class:`random.Random`, the Mersenne Twister of the standard library. It
+  is the default and the fastest backend for most factories, and its
+  streams are reproducible from a seed.
+* :class:`BufferedSystemRandom`, drawing from the operating system
+  randomness source like :class:`random.SystemRandom`, but reading it in
+  blocks to save a system call on every value. Its values are suitable for
+  secrets (passwords, tokens...) and are not reproducible.
+* :class:`NumpyRandom`, the PCG64 generator of NumPy, when NumPy is
+  installed. Its streams are reproducible from a seed and it generates
+  integers in bulk much faster than :class:`random.Random`.
+
+Choosing a backend for a whole test suite is a matter of activating it, for
+example from a ``conftest.py`` file::
+
+    import pytest
+    from fauxfactory.backends import BufferedSystemRandom
+    from fauxfactory.rng import use_random
+
+    @pytest.fixture(autouse=True)
+    def secure_random():
+        with use_random(BufferedSystemRandom()) as rng:
+            yield rng
+"""
+
+import abc
+import os
+import random
+import weakref
+from array import array
+from collections.abc import Iterator
+from importlib import import_module
+from typing import Any
+
+from fauxfactory.rng import Seed, derive_seed
+
+# Number of bytes read from the randomness source at once
+BUFFER_SIZE = 4096
+
+# Scale of the 53 random bits of a float
+_FLOAT_SCALE = 2.0**-53
+
+_INT64_MIN = -(2**63)
+_INT64_MAX = 2**63 - 1
+
+
+def random_integers(
+    rng: random.Random, min_value: int, max_value: int, count: int
+) -> list[int]:
+    """Generate ``count`` integers between ``min_value`` and ``max_value``.
+
+    The integers are generated by the ``integers`` method of the backend
+    when it has one, otherwise by calling ``rng.randint`` ``count`` times.
+
+    :param rng: The random number generator.
+    :param int min_value: The minimum value, included.
+    :param int max_value: The maximum value, included.
+    :param int count: The number of integers to generate.
+    :returns: A list of random integers.
+    :rtype: list[int]
+
+    """
+    integers = getattr(rng, "integers", None)
+    if integers is not None:
+        values: list[int] = integers(min_value, max_value, count)
+        return values
+    randint = rng.randint
+    return [randint(min_value, max_value) for _ in range(count)]
+
+
+class BufferedRandom(random.Random, metaclass=abc.ABCMeta):
+    """Base class of the generators drawing random words from a buffer.
+
+    Subclasses implement ``_fill(size)``, returning ``size`` random bytes.
+    The buffer is an iterator over the 64-bit words of these bytes, refilled
+    ``buffer_size`` bytes at a time. Taking a word from it is atomic, so
+    several threads can share a generator without ever getting the same
+    word. Requests of more than 8 bytes bypass the buffer and are served
+    by a single ``_fill`` call. A subclass without ``_fill`` cannot be
+    instantiated.
+
+    :param seed: Passed to :meth:`seed`.
+    :param int buffer_size: The number of bytes generated at once, rounded
+        up to a multiple of 8.
+    :raises: ValueError if ``buffer_size`` is not a positive integer.
+
+    """
+
+    def __new__(cls, *args: Any, **kwargs: Any) -> "BufferedRandom":
+        # random.Random allocates instances itself, skipping the abstract
+        # methods check of object.__new__
+        if cls.__abstractmethods__:
+            methods = ", ".join(sorted(cls.__abstractmethods__))
+            raise TypeError(
+                f"Can't instantiate abstract class {cls.__name__} "
+                f"without an implementation for abstract methods {methods}"
+            )
+        return super().__new__(cls, *args, **kwargs)
+
+    def __init__(self, seed: Seed = None, *, buffer_size: int = BUFFER_SIZE) -> None:
+        if not isinstance(buffer_size, int) or buffer_size < 1:
+            raise ValueError(f"{buffer_size} is an invalid buffer size.")
+        self.buffer_size = buffer_size
+        self._words: Iterator[int] = iter(())
+        super().__init__(seed)
+
+    @abc.abstractmethod
+    def _fill(self, size: int) -> bytes:
+        """Return ``size`` random bytes."""
+
+    def _refill(self) -> int:
+        """Refill the buffer and return its first word."""
+        size = (self.buffer_size + 7) // 8 * 8
+        self._words = words = iter(array("Q", self._fill(size)))
+        return next(words)
+
+    def random(self) -> float:
+        """Return a random float in the interval [0.0, 1.0)."""
+        word = next(self._words, None)
+        if word is None:
+            word = self._refill()
+        return (word >> 11) * _FLOAT_SCALE
+
+    def getrandbits(self, k: int, /) -> int:
+        """Return a non-negative integer of ``k`` random bits."""
+        if k <= 64:
+            if k < 0:
+                raise ValueError("number of bits must be non-negative")
+            word = next(self._words, None)
+            if word is None:
+                word = self._refill()
+            return word >> (64 - k)
+        value = int.from_bytes(self._fill((k + 7) // 8), "little")
+        return value >> (-k % 8)
+
+    def randbytes(self, n: int) -> bytes:
+        """Return ``n`` random bytes."""
+        if n > 8:
+            return self._fill(n)
+        if n < 0:
+            raise ValueError("number of bytes must be non-negative")
+        if not n:
+            return b""
+        word = next(self._words, None)
+        if word is None:
+            word = self._refill()
+        return word.to_bytes(8, "little")[:n]
+
+
+# Instances whose buffer must not be shared with forked child processes
+_system_randoms: "weakref.WeakSet[BufferedSystemRandom]" = weakref.WeakSet()
+
+
+class BufferedSystemRandom(BufferedRandom):
+    """Generator drawing from the operating system randomness source.
+
+    Values are as unpredictable as those of :class:`random.SystemRandom`,
+    but :func:`os.urandom` is called once every ``buffer_size`` bytes
+    instead of once per value. The buffer is discarded in forked child
+    processes, so that they never reuse the bytes of their parent.
+
+    As with :class:`random.SystemRandom`, seeding has no effect (other
+    than discarding the buffer) and the state cannot be saved or restored.
+
+    :param seed: Ignored.
+    :param int buffer_size: The number of bytes read at once.
+    :raises: ValueError if ``buffer_size`` is not a positive integer.
+
+    """
+
+    def __init__(self, seed: Seed = None, *, buffer_size: int = BUFFER_SIZE) -> None:
+        super().__init__(seed, buffer_size=buffer_size)
+        _system_randoms.add(self)
+
+    def _fill(self, size: int) -> bytes:
+        return os.urandom(size)
+
+    def seed(self, a: Any = None, version: int = 2) -> None:
+        """Discard the buffered words, ``a`` is ignored."""
+        self._words = iter(())
+
+    def getstate(self) -> Any:
+        """Not implemented, the randomness source has no state."""
+        raise NotImplementedError("System entropy source does not have state.")
+
+    def setstate(self, state: Any) -> None:
+        """Not implemented, the randomness source has no state."""
+        raise NotImplementedError("System entropy source does not have state.")
+
+
+def _after_fork_in_child() -> None:
+    for rng in _system_randoms:
+        rng.seed()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+class NumpyRandom(BufferedRandom):
+    """Generator backed by the NumPy PCG64 bit generator.
+
+    Seeding with a non-negative integer gives the same stream of 64-bit
+    words as ``numpy.random.PCG64(seed)``, other seeds are hashed with
+    :func:`~fauxfactory.rng.derive_seed` first. :meth:`integers` generates
+    bulk integers directly with NumPy.
+
+    :param seed: Any value accepted by :meth:`random.Random.seed`.
+    :param int buffer_size: The number of bytes generated at once, rounded
+        up to a multiple of 8.
+    :raises: ImportError if NumPy is not installed.
+    :raises: ValueError if ``buffer_size`` is not a positive integer.
+
+    """
+
+    def __init__(self, seed: Seed = None, *, buffer_size: int = BUFFER_SIZE) -> None:
+        try:
+            self._numpy = import_module("numpy")
+        except ImportError as err:
+            raise ImportError("NumpyRandom requires NumPy to be installed.") from err
+        super().__init__(seed, buffer_size=buffer_size)
+
+    def _fill(self, size: int) -> bytes:
+        words = self._generator.bit_generator.random_raw((size + 7) // 8)
+        data: bytes = words.tobytes()[:size]
+        return data
+
+    def seed(self, a: Any = None, version: int = 2) -> None:
+        """Reseed the generator.
+
+        :param a: Any value accepted by :meth:`random.Random.seed`.
+
+        """
+        if a is not None and not (isinstance(a, int) and a >= 0):
+            a = derive_seed(a)
+        numpy_random = self._numpy.random
+        self._generator = numpy_random.Generator(numpy_random.PCG64(a))
+        self._words = iter(())
+        self.gauss_next = None
+
+    def getstate(self) -> Any:
+        """Return the state of the generator, buffered words included."""
+        words = tuple(self._words)
+        self._words = iter(words)
+        return (self._generator.bit_generator.state, words, self.gauss_next)
+
+    def setstate(self, state: Any) -> None:
+        """Restore a state returned by :meth:`getstate`."""
+        bit_state, words, self.gauss_next = state
+        self._generator.bit_generator.state = bit_state
+        self._words = iter(words)
+
+    def integers(self, min_value: int, max_value: int, count: int) -> list[int]:
+        """Generate ``count`` integers between ``min_value`` and ``max_value``.
+
+        :param int min_value: The minimum value, included.
+        :param int max_value: The maximum value, included.
+        :param int count: The number of integers to generate.
+        :returns: A list of random integers.
+        :rtype: list[int]
+        :raises: ValueError if ``min_value`` is greater than ``max_value``.
+
+        """
+        if min_value > max_value:
+            raise ValueError(f"Invalid range: {min_value} > {max_value}")
+        if min_value < _INT64_MIN or max_value > _INT64_MAX:
+            randint = self.randint
+            return [randint(min_value, max_value) for _ in range(count)]
+        values = self._generator.integers(
+            min_value, max_value, size=count, endpoint=True, dtype="int64"
+        )
+        result: list[int] = values.tolist()
+        return result
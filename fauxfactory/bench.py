@@ -0,0 +1,344 @@
+"""Compare benchmark results to catch performance regressions.
+
+The reports compared are the JSON files written by the benchmark suite of
+the project (``python -m benchmarks --output results.json``), which hold the
+throughput of every round of every case. Comparing a baseline with a new run
+flags the cases whose throughput dropped by more than a threshold::
+
+    python -m fauxfactory.bench compare old.json new.json --threshold 5
+
+The exit status is 1 if any case regressed, which makes it usable as a
+release gate. Timings vary from one run to another more than between the
+rounds of a single run, so gating on the merged reports of a few runs of
+each version is more reliable::
+
+    python -m fauxfactory.bench merge old-1.json old-2.json old-3.json -o old.json
+"""
+
+import argparse
+import json
+import math
+import re
+import statistics
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+# Version of the report layout written by the benchmark suite, bumped on
+# incompatible changes
+REPORT_FORMAT = 1
+
+REGRESSION = "regression"
+IMPROVEMENT = "improvement"
+UNCHANGED = "unchanged"
+INCONCLUSIVE = "inconclusive"
+
+
+def load_report(path: str | Path) -> dict[str, Any]:
+    """Load a benchmark report.
+
+    :param path: Path of the JSON report.
+    :returns: The report.
+    :rtype: dict
+    :raises: ValueError if the file is not a benchmark report.
+    """
+    with Path(path).open(encoding="utf-8") as handler:
+        try:
+            report = json.load(handler)
+        except json.JSONDecodeError as err:
+            raise ValueError(f"{path} is not a JSON file: {err}") from err
+    if not isinstance(report, dict) or "results" not in report:
+        raise ValueError(f"{path} is not a benchmark report")
+    if report.get("format") != REPORT_FORMAT:
+        raise ValueError(
+            f"{path} has an unsupported report format: {report.get('format')}"
+        )
+    return report
+
+
+def merge_reports(reports: Sequence[dict[str, Any]]) -> dict[str, Any]:
+    """Merge the reports of repeated benchmark runs.
+
+    The rounds of every case are pooled, so that the confidence intervals of
+    a comparison account for the noise between runs (other processes, CPU
+    frequency changes...) and not only for the noise within a run.
+
+    :param reports: The reports to merge, usually of the same code.
+    :returns: A report holding the rounds of every case of every report. The
+        latencies and memory peaks are the medians of the merged reports.
+    :rtype: dict
+    :raises: ValueError if ``reports`` is empty.
+    """
+    if not reports:
+        raise ValueError("No report to merge")
+    merged = {key: value for key, value in reports[0].items() if key != "results"}
+    merged["runs"] = sum(report.get("runs", 1) for report in reports)
+    merged["results"] = {}
+    for report in reports:
+        for name, result in report["results"].items():
+            merged["results"].setdefault(name, []).append(result)
+    for name, results in merged["results"].items():
+        result = dict(results[0])
+        result["rounds"] = [value for item in results for value in item["rounds"]]
+        result["ops_per_sec"] = statistics.median(result["rounds"])
+        result["samples"] = sum(item["samples"] for item in results)
+        for key in ("p50_ns", "p99_ns", "peak_bytes"):
+            result[key] = statistics.median(item[key] for item in results)
+        merged["results"][name] = result
+    return merged
+
+
+def t_quantile(probability: float, df: float) -> float:
+    """Return the quantile of the Student's t distribution.
+
+    Uses the Cornish-Fisher expansion around the normal quantile, which is
+    accurate to about 1% from 2 degrees of freedom on.
+
+    :param float probability: Cumulative probability, between 0 and 1.
+    :param float df: Degrees of freedom.
+    :returns: The value below which ``probability`` of the distribution lies.
+    :rtype: float
+    """
+    z = statistics.NormalDist().inv_cdf(probability)
+    if math.isinf(df):
+        return z
+    terms = (
+        (z**3 + z) / 4,
+        (5 * z**5 + 16 * z**3 + 3 * z) / 96,
+        (3 * z**7 + 19 * z**5 + 17 * z**3 - 15 * z) / 384,
+        (79 * z**9 + 776 * z**7 + 1482 * z**5 - 1920 * z**3 - 945 * z) / 92160,
+    )
+    return z + sum(term / df ** (power + 1) for power, term in enumerate(terms))
+
+
+class Comparison:
+    """Throughput change of a benchmark case between two runs.
+
+    The change is the ratio of the geometric means of the rounds throughput,
+    minus one (``-0.1`` means 10% slower), along with its confidence
+    interval computed with Welch's t-test on the logarithms of the rounds
+    throughput. A case is only reported as a regression (or improvement)
+    when the whole interval is on the slower (or faster) side, so noisy
+    cases need more rounds to be flagged.
+
+    :param str name: Name of the case.
+    :param old: Throughput of every round of the baseline, in ops/sec.
+    :param new: Throughput of every round of the new run, in ops/sec.
+    :param float threshold: Minimum relative slowdown considered a
+        regression (e.g. ``0.05`` for 5%), and speedup considered an
+        improvement.
+    :param float confidence: Confidence level of the interval.
+    """
+
+    __slots__ = ("change", "high", "low", "name", "new", "old", "status")
+
+    def __init__(
+        self,
+        name: str,
+        old: Sequence[float],
+        new: Sequence[float],
+        threshold: float = 0.05,
+        confidence: float = 0.95,
+    ) -> None:
+        if not old or not new:
+            raise ValueError(f"No rounds to compare for {name}")
+        self.name = name
+        samples = [[math.log(value) for value in rounds] for rounds in (old, new)]
+        self.old, self.new = (math.exp(statistics.fmean(logs)) for logs in samples)
+        diff = statistics.fmean(samples[1]) - statistics.fmean(samples[0])
+
+        # Standard error and Welch-Satterthwaite degrees of freedom
+        parts = [
+            (statistics.variance(logs) / len(logs), len(logs) - 1)
+            for logs in samples
+            if len(logs) > 1
+        ]
+        error = math.sqrt(sum(part for part, _ in parts))
+        if error:
+            df = error**4 / sum(part**2 / dof for part, dof in parts)
+            margin = t_quantile((1 + confidence) / 2, df) * error
+        else:
+            # Without repeated rounds there is no way to estimate the noise
+            margin = 0.0
+        self.change = math.expm1(diff)
+        self.low = math.expm1(diff - margin)
+        self.high = math.expm1(diff + margin)
+
+        if self.change <= -threshold and self.high < 0:
+            self.status = REGRESSION
+        elif self.change >= threshold and self.low > 0:
+            self.status = IMPROVEMENT
+        elif -threshold < self.low and self.high < threshold:
+            self.status = UNCHANGED
+        else:
+            self.status = INCONCLUSIVE
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}({self.name!r}, change={self.change:+.2%},"
+            f" status={self.status!r})"
+        )
+
+
+def compare(
+    old: dict[str, Any],
+    new: dict[str, Any],
+    *,
+    threshold: float = 0.05,
+    confidence: float = 0.95,
+    pattern: str | None = None,
+) -> tuple[list[Comparison], list[str], list[str]]:
+    """Compare the cases of two benchmark reports.
+
+    :param old: The baseline report.
+    :param new: The report to compare with the baseline.
+    :param float threshold: Minimum relative slowdown considered a
+        regression.
+    :param float confidence: Confidence level of the intervals.
+    :param str pattern: Only compare the cases whose name matches this
+        regular expression.
+    :returns: The comparisons of the cases found in both reports, sorted by
+        change (biggest slowdown first), the names of the cases only found in
+        the baseline and the names of the cases only found in the new report.
+    :rtype: tuple
+    """
+    old_results = old["results"]
+    new_results = new["results"]
+    if pattern is not None:
+        regex = re.compile(pattern)
+        old_results = {k: v for k, v in old_results.items() if regex.search(k)}
+        new_results = {k: v for k, v in new_results.items() if regex.search(k)}
+    comparisons = [
+        Comparison(
+            name,
+            old_results[name]["rounds"],
+            new_results[name]["rounds"],
+            threshold,
+            confidence,
+        )
+        for name in old_results
+        if name in new_results
+    ]
+    comparisons.sort(key=lambda comparison: comparison.change)
+    removed = [name for name in old_results if name not in new_results]
+    added = [name for name in new_results if name not in old_results]
+    return comparisons, removed, added
+
+
+def format_table(comparisons: Sequence[Comparison]) -> str:
+    """Return the comparisons as a plain text table."""
+    width = max([len("case"), *(len(item.name) for item in comparisons)])
+    lines = [
+        f"{'case':<{width}} {'old ops/s':>13} {'new ops/s':>13} {'change':>8}"
+        f" {'confidence interval':>21}  status"
+    ]
+    for item in comparisons:
+        interval = f"[{item.low:+.1%}, {item.high:+.1%}]"
+        lines.append(
+            f"{item.name:<{width}} {item.old:>13,.0f} {item.new:>13,.0f}"
+            f" {item.change:>+8.1%} {interval:>21}  {item.status}"
+        )
+    return "\n".join(lines)
+
+
+def _compare_command(args: argparse.Namespace) -> int:
+    old = load_report(args.old)
+    new = load_report(args.new)
+    comparisons, removed, added = compare(
+        old,
+        new,
+        threshold=args.threshold / 100,
+        confidence=args.confidence,
+        pattern=args.filter,
+    )
+    print(f"old: {args.old} (fauxfactory {old.get('fauxfactory', 'unknown')})")
+    print(f"new: {args.new} (fauxfactory {new.get('fauxfactory', 'unknown')})")
+    print()
+    print(format_table(comparisons))
+    for label, names in (("only in old", removed), ("only in new", added)):
+        if names:
+            print(f"\n{label}: {', '.join(names)}")
+
+    regressions = [item for item in comparisons if item.status == REGRESSION]
+    print(
+        f"\n{len(regressions)} regression(s) above {args.threshold:g}%"
+        f" out of {len(comparisons)} case(s)"
+    )
+    return 1 if regressions else 0
+
+
+def _merge_command(args: argparse.Namespace) -> int:
+    merged = merge_reports([load_report(path) for path in args.reports])
+    with Path(args.output).open("w", encoding="utf-8") as handler:
+        json.dump(merged, handler, indent=2)
+    print(f"Merged {merged['runs']} run(s) into {args.output}")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the ``python -m fauxfactory.bench`` command line interface."""
+    parser = argparse.ArgumentParser(
+        prog="python -m fauxfactory.bench",
+        description="Work with fauxfactory benchmark reports.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    compare_parser = commands.add_parser(
+        "compare",
+        help="compare two benchmark reports",
+        description=(
+            "Compare the throughput of every case of two benchmark reports and"
+            " exit with status 1 if any case is significantly slower."
+        ),
+    )
+    compare_parser.add_argument("old", help="baseline JSON report")
+    compare_parser.add_argument("new", help="JSON report to compare")
+    compare_parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=5.0,
+        metavar="PERCENT",
+        help="minimum slowdown reported as a regression (default: %(default)s)",
+    )
+    compare_parser.add_argument(
+        "-c",
+        "--confidence",
+        type=float,
+        default=0.95,
+        help="confidence level of the intervals (default: %(default)s)",
+    )
+    compare_parser.add_argument(
+        "-k",
+        "--filter",
+        metavar="REGEX",
+        help="only compare the cases whose name matches REGEX",
+    )
+    compare_parser.set_defaults(function=_compare_command)
+
+    merge_parser = commands.add_parser(
+        "merge",
+        help="merge the reports of repeated runs",
+        description=(
+            "Pool the rounds of several benchmark reports of the same code, so"
+            " that comparisons account for the noise between runs."
+        ),
+    )
+    merge_parser.add_argument("reports", nargs="+", help="JSON reports to merge")
+    merge_parser.add_argument(
+        "-o", "--output", required=True, help="path of the merged JSON report"
+    )
+    merge_parser.set_defaults(function=_merge_command)
+
+    args = parser.parse_args(argv)
+    if args.command == "compare" and not 0 < args.confidence < 1:
+        parser.error("confidence must be between 0 and 1")
+    try:
+        return int(args.function(args))
+    except (OSError, ValueError) as err:
+        print(f"error: {err}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,16 +9,16 @@
 
 # The above constant descriptions can be found by Sphinx and via help().
 import datetime
-import json
 import string
 from pathlib import Path
-from typing import Any, Final
+from typing import TYPE_CHECKING, Any, Final
 
 VALID_DIGITS: Final[str] = string.digits + string.ascii_letters
 
 FACTS_JSON_FILE: Final[Path] = Path(__file__).parent / "facts.json"
-with FACTS_JSON_FILE.open(encoding="utf-8") as data:
-    FACTS_JSON: Final[dict[str, Any]] = json.load(data)
+if TYPE_CHECKING:
+    # Parsed from FACTS_JSON_FILE on first access, see __getattr__ below
+    FACTS_JSON: dict[str, Any]
 
 LOREM_IPSUM_TEXT: Final[str] = (
     "Lorem ipsum dolor sit amet, consectetur adipisicing elit, sed do "
@@ -194,3 +194,24 @@ HTML_TAGS: Final[tuple[str, ...]] = (
     "ul",
     "var",
 )
+
+
+def load_facts_json() -> dict[str, Any]:
+    """Parse the system facts template shipped along with fauxfactory.
+
+    :returns: The content of :data:`FACTS_JSON_FILE`.
+
+    """
+    # Only pay for the json module when facts are needed
+    import json
+
+    with FACTS_JSON_FILE.open(encoding="utf-8") as data:
+        return json.load(data)  # type: ignore[no-any-return]
+
+
+def __getattr__(name: str) -> Any:
+    # FACTS_JSON is parsed on first access, then cached as a regular global
+    if name == "FACTS_JSON":
+        value = globals()[name] = load_facts_json()
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,11 +1,11 @@
 """Module to keep methods related to selecting values."""
 
-import random
 import uuid
 from collections.abc import Sequence
 from typing import TypeVar
 
 from fauxfactory.helpers import check_validation
+from fauxfactory.rng import get_active_random, get_random
 
 T = TypeVar("T")
 
@@ -31,18 +31,28 @@ def gen_choice(choices: Sequence[T]) -> T:
     if len(choices) == 1:
         return choices[0]
 
-    return random.choice(choices)
+    return get_random().choice(choices)
 
 
 @check_validation
 def gen_uuid() -> str:
     """Generate a UUID string (universally unique identifiers).
 
+    The generated value is a version 4 (random) UUID. Its bits are drawn
+    from the generator activated with :func:`fauxfactory.rng.use_random`,
+    :func:`~fauxfactory.rng.seeded` or ``Faux``, so it is reproducible when
+    that generator is seeded. Otherwise :func:`uuid.uuid4` is used, so that
+    processes sharing the seed of the global generator (test workers, forked
+    children...) still generate unique UUIDs.
+
     :returns: Returns a string representation for a UUID.
     :rtype: str
 
     """
-    return str(uuid.uuid4())
+    rng = get_active_random()
+    if rng is None:
+        return str(uuid.uuid4())
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
 
 
 __all__ = tuple(name for name in locals() if name.startswith("gen_"))
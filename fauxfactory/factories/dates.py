@@ -1,9 +1,9 @@
 """Methods related to generating date/time related values."""
 
 import datetime
-import random
 
 from fauxfactory.constants import MAX_YEARS, MIN_YEARS
+from fauxfactory.rng import get_random
 
 
 def gen_date(
@@ -40,7 +40,7 @@ def gen_date(
 
     # Pick a day between min and max dates
     diff = max_date - min_date
-    days = random.randint(0, diff.days)
+    days = get_random().randint(0, diff.days)
     date = min_date + datetime.timedelta(days=days)
 
     return date
@@ -80,7 +80,7 @@ def gen_datetime(
 
     # Pick a time between min and max dates
     diff = max_date - min_date
-    seconds = random.randint(0, diff.days * 3600 * 24 + diff.seconds)
+    seconds = get_random().randint(0, diff.days * 3600 * 24 + diff.seconds)
 
     return min_date + datetime.timedelta(seconds=seconds)
 
@@ -91,11 +91,12 @@ def gen_time() -> datetime.time:
     :returns: A random ``datetime.time`` object.
 
     """
+    rng = get_random()
     return datetime.time(
-        random.randint(0, 23),
-        random.randint(0, 59),
-        random.randint(0, 59),
-        random.randint(0, 999999),
+        rng.randint(0, 23),
+        rng.randint(0, 59),
+        rng.randint(0, 59),
+        rng.randint(0, 999999),
     )
 
 
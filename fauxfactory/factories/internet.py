@@ -1,13 +1,14 @@
 """Methods related to generating internet related values."""
 
-import random
 import re
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 
 from fauxfactory.constants import SCHEMES, SUBDOMAINS, TLDS, VALID_NETMASKS
 from fauxfactory.helpers import check_validation
+from fauxfactory.rng import Seed, get_random
 
 from .choices import gen_choice
+from .numbers import IntegerPermutation, permutation_values
 from .strings import gen_alpha
 
 
@@ -102,12 +103,13 @@ def gen_ipaddr(
     if rng < 0:
         raise ValueError(f"Prefix {prefix!r} is too long for this configuration")
 
+    randint = get_random().randint
     if ipv6:
         # StackOverflow.com questions: generate-random-ipv6-address
-        random_fields = [f"{random.randint(0, 2**16 - 1):x}" for _ in range(rng)]
+        random_fields = [f"{randint(0, 2**16 - 1):x}" for _ in range(rng)]
         ipaddr = ":".join(prefix_str + random_fields)
     else:
-        random_fields = [str(random.randrange(0, 255, 1)) for _ in range(rng)]
+        random_fields = [str(randint(0, 254)) for _ in range(rng)]
         ipaddr = ".".join(prefix_str + random_fields)
 
         if ip3:
@@ -116,6 +118,87 @@ def gen_ipaddr(
     return ipaddr
 
 
+def gen_unique_ipaddrs(
+    count: int | None = None,
+    *,
+    ip3: bool = False,
+    ipv6: bool = False,
+    prefix: Sequence[str | int] = (),
+    seed: Seed = None,
+) -> Iterator[str]:
+    """Generate random IP addresses, each of them once at most.
+
+    The addresses are the ones :func:`gen_ipaddr` generates with the same
+    arguments, enumerated in the order of an
+    :class:`~fauxfactory.factories.numbers.IntegerPermutation`: they are
+    drawn in constant time and memory, and iterating until the end
+    exhausts every address.
+
+    :param int count: Number of addresses to generate, all of them by
+        default.
+    :param bool ip3: Whether to generate a 3 or 4 group IP.
+    :param bool ipv6: Whether to generate IPv6 or IPv4
+    :param list prefix: A prefix to be used for every IP (e.g. [10, 0, 1]).
+    :param seed: Seed of the permutation. By default, it is drawn from
+        :func:`fauxfactory.rng.get_random`.
+    :returns: An iterator over distinct IP addresses.
+    :rtype: iterator
+    :raises: ``ValueError`` if ``prefix`` leaves no random field (see
+        :func:`gen_ipaddr`) or ``count`` is greater than the number of
+        addresses.
+
+    """
+    fields = (8 if ipv6 else 3 if ip3 else 4) - len(prefix)
+    if fields == 0:
+        raise ValueError(f"Prefix {prefix!r} would lead to no randomness at all")
+    if fields < 0:
+        raise ValueError(f"Prefix {prefix!r} is too long for this configuration")
+    prefix_str = [str(field) for field in prefix]
+    # Same field values as gen_ipaddr
+    base = 2**16 if ipv6 else 255
+    permutation = IntegerPermutation(0, base**fields - 1, seed)
+
+    def address(index: int) -> str:
+        values = []
+        for _ in range(fields):
+            index, value = divmod(index, base)
+            values.append(f"{value:x}" if ipv6 else str(value))
+        if ipv6:
+            return ":".join(prefix_str + values)
+        return ".".join(prefix_str + values) + (".0" if ip3 else "")
+
+    return map(address, permutation_values(permutation, count))
+
+
+def gen_unique_macs(
+    count: int | None = None, *, delimiter: str = ":", seed: Seed = None
+) -> Iterator[str]:
+    """Generate random MAC addresses, each of them once at most.
+
+    The addresses are enumerated in the order of an
+    :class:`~fauxfactory.factories.numbers.IntegerPermutation` of the 48
+    bit addresses, so they are drawn in constant time and memory.
+
+    :param int count: Number of addresses to generate, all of them by
+        default.
+    :param str delimiter: Valid MAC delimiter (e.g ':', '-').
+    :param seed: Seed of the permutation. By default, it is drawn from
+        :func:`fauxfactory.rng.get_random`.
+    :returns: An iterator over distinct MAC addresses.
+    :rtype: iterator
+    :raises: ``ValueError`` if ``delimiter`` is not valid or ``count`` is
+        greater than the number of addresses.
+
+    """
+    if delimiter not in [":", "-"]:
+        raise ValueError(f"Delimiter is not a valid option: {delimiter}")
+    permutation = IntegerPermutation(0, 2**48 - 1, seed)
+    return (
+        value.to_bytes(6, "big").hex(delimiter)
+        for value in permutation_values(permutation, count)
+    )
+
+
 @check_validation
 def gen_mac(
     delimiter: str = ":", multicast: bool | None = None, locally: bool | None = None
@@ -139,12 +222,13 @@ def gen_mac(
     """
     if delimiter not in [":", "-"]:
         raise ValueError(f"Delimiter is not a valid option: {delimiter}")
+    randint = get_random().randint
     if multicast is None:
-        multicast = bool(random.randint(0, 1))
+        multicast = bool(randint(0, 1))
     if locally is None:
-        locally = bool(random.randint(0, 1))
+        locally = bool(randint(0, 1))
 
-    first_octet = random.randint(0, 255)
+    first_octet = randint(0, 255)
     if multicast:
         # Ensure that the first least significant bit is 1
         first_octet |= 0b00000001
@@ -159,7 +243,7 @@ def gen_mac(
         first_octet &= 0b11111101
 
     octets = [first_octet]
-    octets.extend(random.randint(0, 255) for _ in range(5))
+    octets.extend(randint(0, 255) for _ in range(5))
     mac = delimiter.join([f"{octet:02x}" for octet in octets])
 
     return mac
@@ -186,7 +270,7 @@ def gen_netmask(min_cidr: int = 1, max_cidr: int = 31) -> str:
         raise ValueError(
             f"max_cidr must be less than {len(VALID_NETMASKS)}, but is {max_cidr}"
         )
-    return VALID_NETMASKS[random.randint(min_cidr, max_cidr)]
+    return VALID_NETMASKS[get_random().randint(min_cidr, max_cidr)]
 
 
 @check_validation
@@ -1,10 +1,20 @@
 """Methods that generate random number values."""
 
+import hashlib
 import random
 import sys
+from collections.abc import Iterator
 from functools import partial
+from itertools import islice
+from typing import overload
 
 from fauxfactory.helpers import base_repr
+from fauxfactory.rng import Seed, derive_seed, get_random
+
+# Number of rounds of the Feistel network of IntegerPermutation
+PERMUTATION_ROUNDS = 6
+
+_MASK64 = (1 << 64) - 1
 
 
 def gen_integer(min_value: int | None = None, max_value: int | None = None) -> int:
@@ -35,7 +45,7 @@ def gen_integer(min_value: int | None = None, max_value: int | None = None) -> i
     if not isinstance(max_value, integer_types) or max_value > _max_value:
         raise ValueError(f'"{max_value}" is not a valid maximum.')
 
-    value = random.randint(min_value, max_value)
+    value = get_random().randint(min_value, max_value)
 
     return value
 
@@ -82,6 +92,168 @@ def gen_number(
     )
 
 
+class IntegerPermutation:
+    """Pseudo random permutation of the integers of a range.
+
+    The integers are shuffled by a keyed Feistel network over the smallest
+    even number of bits holding the size of the range. Positions whose
+    image falls out of the range are encrypted again until it falls in
+    (cycle-walking), which takes less than 4 rounds on average. Looking up
+    the value at a position takes constant time and memory whatever the
+    size of the range, so a range of ``2**64`` integers can be enumerated
+    without repeats without storing anything.
+
+    The permutation is not cryptographically secure.
+
+    :param int min_value: The smallest integer of the range.
+    :param int max_value: The largest integer of the range.
+    :param seed: The key of the permutation. By default, it is drawn from
+        :func:`fauxfactory.rng.get_random`.
+
+    The number of integers of the range is its ``size`` attribute, which
+    unlike ``len()`` is not limited to ``sys.maxsize``.
+
+    :raises: ValueError if the bounds are not integers or ``min_value`` is
+        greater than ``max_value``.
+    """
+
+    __slots__ = (
+        "_half_bits",
+        "_half_mask",
+        "_keys",
+        "max_value",
+        "min_value",
+        "size",
+    )
+
+    def __init__(self, min_value: int, max_value: int, seed: Seed = None) -> None:
+        if not isinstance(min_value, int) or not isinstance(max_value, int):
+            raise ValueError(
+                f"Bounds must be integers, got {min_value!r} and {max_value!r}"
+            )
+        if min_value > max_value:
+            raise ValueError(f'"{min_value}" is greater than "{max_value}".')
+        if seed is None:
+            seed = get_random().getrandbits(64)
+        self.min_value = min_value
+        self.max_value = max_value
+        self.size = max_value - min_value + 1
+        self._half_bits = max(1, ((max_value - min_value).bit_length() + 1) // 2)
+        self._half_mask = (1 << self._half_bits) - 1
+        keys = random.Random(derive_seed(seed, "permutation"))
+        self._keys = tuple(keys.getrandbits(64) for _ in range(PERMUTATION_ROUNDS))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.min_value}, {self.max_value})"
+
+    def __len__(self) -> int:
+        # len() raises OverflowError past sys.maxsize, use size instead
+        return self.size
+
+    def _round(self, value: int, key: int) -> int:
+        """Return the output of the round function for half a block."""
+        if self._half_bits <= 64:
+            # SplitMix64 finalizer
+            value = ((value ^ key) * 0x9E3779B97F4A7C15) & _MASK64
+            value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+            value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK64
+            return (value ^ (value >> 31)) & self._half_mask
+        size = (self._half_bits + 7) // 8
+        digest = hashlib.blake2b(
+            value.to_bytes(size, "little"),
+            key=key.to_bytes(8, "little"),
+            digest_size=min(size, 64),
+        ).digest()
+        return int.from_bytes(digest * -(-size // 64), "little") & self._half_mask
+
+    def _encrypt(self, block: int) -> int:
+        bits = self._half_bits
+        mask = self._half_mask
+        left, right = block >> bits, block & mask
+        for key in self._keys:
+            left, right = right, left ^ self._round(right, key)
+        return (left << bits) | right
+
+    @overload
+    def __getitem__(self, index: int) -> int: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[int]: ...
+
+    def __getitem__(self, index: int | slice) -> int | list[int]:
+        if isinstance(index, slice):
+            return [self[position] for position in range(self.size)[index]]
+        size = self.size
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("IntegerPermutation index out of range")
+        value = self._encrypt(index)
+        while value >= size:
+            value = self._encrypt(value)
+        return self.min_value + value
+
+    def __iter__(self) -> Iterator[int]:
+        for index in range(self.size):
+            yield self[index]
+
+
+def permutation_values(
+    permutation: IntegerPermutation, count: int | None = None
+) -> Iterator[int]:
+    """Return the first ``count`` values of ``permutation``, or all of them.
+
+    :raises: ValueError if ``count`` is negative or greater than the size
+        of the permutation.
+    """
+    if count is None:
+        return iter(permutation)
+    if not isinstance(count, int) or not 0 <= count <= permutation.size:
+        raise ValueError(f"{count} is an invalid count for {permutation!r}.")
+    return islice(permutation, count)
+
+
+def gen_unique_integers(
+    min_value: int | None = None,
+    max_value: int | None = None,
+    count: int | None = None,
+    *,
+    seed: Seed = None,
+) -> Iterator[int]:
+    """Generate random integers of a range, each of them once at most.
+
+    The integers are the values of an :class:`IntegerPermutation` of the
+    range, in order, so they are drawn in constant time and memory whatever
+    the size of the range and how many were drawn already.
+
+    :param int min_value: The minimum allowed value, the platform minimum
+        by default (see :func:`gen_integer`).
+    :param int max_value: The maximum allowed value, the platform maximum
+        by default.
+    :param int count: Number of integers to generate, all the integers of
+        the range by default.
+    :param seed: Seed of the permutation. By default, it is drawn from
+        :func:`fauxfactory.rng.get_random`.
+    :returns: An iterator over distinct random integers.
+    :rtype: iterator
+    :raises: ValueError if the bounds are invalid or ``count`` is negative
+        or greater than the number of integers of the range.
+
+    Example::
+
+        from fauxfactory import gen_unique_integers
+
+        ports = gen_unique_integers(1024, 65535)
+        next(ports), next(ports)  # e.g. (40123, 2231), never the same twice
+
+    """
+    if min_value is None:
+        min_value = -sys.maxsize - 1
+    if max_value is None:
+        max_value = sys.maxsize
+    return permutation_values(IntegerPermutation(min_value, max_value, seed), count)
+
+
 gen_octagonal: partial[str] = partial(gen_number, base=8)
 gen_hexadecimal: partial[str] = partial(gen_number, base=16)
 
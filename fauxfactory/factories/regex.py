@@ -0,0 +1,518 @@
+"""Generate strings matching regular expressions."""
+
+import re
+from collections.abc import Callable, Sequence
+from functools import lru_cache
+from random import Random
+from typing import Any
+
+try:
+    from re import _constants as sre_constants  # type: ignore[attr-defined]
+    from re import _parser as sre_parse  # type: ignore[attr-defined]
+except ImportError:  # Python 3.10
+    import sre_constants
+    import sre_parse
+
+from fauxfactory.helpers import CodepointSet
+from fauxfactory.rng import generate_shard, get_random
+
+# Number of compiled regular expressions kept in memory
+REGEX_CACHE_SIZE = 256
+
+# Characters drawn for "." and negated character classes: printable ASCII
+PRINTABLE = (0x20, 0x7E)
+
+# Code points of the character class escapes, restricted to ASCII: every
+# ASCII digit, word or space character matches the unicode classes as well
+CATEGORIES = {
+    sre_constants.CATEGORY_DIGIT: ((0x30, 0x39),),
+    sre_constants.CATEGORY_SPACE: ((0x09, 0x0D), (0x20, 0x20)),
+    sre_constants.CATEGORY_WORD: (
+        (0x30, 0x39),
+        (0x41, 0x5A),
+        (0x5F, 0x5F),
+        (0x61, 0x7A),
+    ),
+}
+NEGATED_CATEGORIES = {
+    sre_constants.CATEGORY_NOT_DIGIT: sre_constants.CATEGORY_DIGIT,
+    sre_constants.CATEGORY_NOT_SPACE: sre_constants.CATEGORY_SPACE,
+    sre_constants.CATEGORY_NOT_WORD: sre_constants.CATEGORY_WORD,
+}
+# Anchors always satisfied by a generated string as a whole
+BEGINNING_ANCHORS = {
+    sre_constants.AT_BEGINNING,
+    sre_constants.AT_BEGINNING_LINE,
+    sre_constants.AT_BEGINNING_STRING,
+}
+END_ANCHORS = {
+    sre_constants.AT_END,
+    sre_constants.AT_END_LINE,
+    sre_constants.AT_END_STRING,
+}
+REPEATS = {
+    sre_constants.MAX_REPEAT,
+    sre_constants.MIN_REPEAT,
+    # Added by Python 3.11
+    getattr(sre_constants, "POSSESSIVE_REPEAT", sre_constants.MAX_REPEAT),
+}
+# Added by Python 3.11
+ATOMIC_GROUP = getattr(sre_constants, "ATOMIC_GROUP", None)
+
+# Appends generated text to a list, given the random generator and the text
+# of the groups generated so far
+Emitter = Callable[[Random, list[str], dict[int, str]], None]
+
+
+def _merge_ranges(ranges: Sequence[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Sort ``ranges`` and merge the overlapping or adjacent ones."""
+    merged: list[tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(end, merged[-1][1]))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _printable_complement(
+    ranges: Sequence[tuple[int, int]], ignorecase: bool
+) -> list[tuple[int, int]]:
+    """Return the printable characters out of ``ranges``, as ranges."""
+
+    def excluded(char: str) -> bool:
+        variants = {char, char.lower(), char.upper()} if ignorecase else {char}
+        return any(
+            start <= ord(variant) <= end
+            for variant in variants
+            if len(variant) == 1
+            for start, end in ranges
+        )
+
+    members = [
+        (codepoint, codepoint)
+        for codepoint in range(PRINTABLE[0], PRINTABLE[1] + 1)
+        if not excluded(chr(codepoint))
+    ]
+    return _merge_ranges(members)
+
+
+def _charset(items: Sequence[tuple[Any, Any]], ignorecase: bool) -> CodepointSet:
+    """Return the characters matched by the items of a character class."""
+    negate = bool(items) and items[0][0] is sre_constants.NEGATE
+    ranges: list[tuple[int, int]] = []
+    for op, av in items[1:] if negate else items:
+        if op is sre_constants.LITERAL:
+            ranges.append((av, av))
+        elif op is sre_constants.RANGE:
+            ranges.append(av)
+        elif op is sre_constants.CATEGORY and av in CATEGORIES:
+            ranges.extend(CATEGORIES[av])
+        elif op is sre_constants.CATEGORY and av in NEGATED_CATEGORIES:
+            ranges.extend(
+                _printable_complement(CATEGORIES[NEGATED_CATEGORIES[av]], False)
+            )
+        else:
+            raise ValueError(f"Unsupported character class item: {op} {av}")
+    ranges = (
+        _printable_complement(ranges, ignorecase) if negate else _merge_ranges(ranges)
+    )
+    if not ranges:
+        raise ValueError("Character class matching no printable character")
+    return CodepointSet(*ranges)
+
+
+def _literal(text: str) -> Emitter:
+    def emit(rng: Random, out: list[str], groups: dict[int, str]) -> None:
+        out.append(text)
+
+    return emit
+
+
+def _character(charset: CodepointSet) -> Emitter:
+    size = len(charset)
+    if len(charset.ranges) == 1:
+        start = charset.ranges[0][0]
+
+        def emit(rng: Random, out: list[str], groups: dict[int, str]) -> None:
+            out.append(chr(start + rng.randrange(size)))
+
+    else:
+
+        def emit(rng: Random, out: list[str], groups: dict[int, str]) -> None:
+            out.append(charset[rng.randrange(size)])
+
+    return emit
+
+
+def _sequence(emitters: list[Emitter]) -> Emitter:
+    if len(emitters) == 1:
+        return emitters[0]
+
+    def emit(rng: Random, out: list[str], groups: dict[int, str]) -> None:
+        for emitter in emitters:
+            emitter(rng, out, groups)
+
+    return emit
+
+
+def _repeat(
+    low: int, high: int, body: Emitter, charset: CodepointSet | None
+) -> Emitter:
+    if charset is not None:
+        # Draw all the characters of a repeated character class at once
+        def emit(rng: Random, out: list[str], groups: dict[int, str]) -> None:
+            out.append(charset.sample(rng.randint(low, high)))
+
+    else:
+
+        def emit(rng: Random, out: list[str], groups: dict[int, str]) -> None:
+            for _ in range(rng.randint(low, high)):
+                body(rng, out, groups)
+
+    return emit
+
+
+def _branch(alternatives: list[Emitter]) -> Emitter:
+    count = len(alternatives)
+
+    def emit(rng: Random, out: list[str], groups: dict[int, str]) -> None:
+        alternatives[rng.randrange(count)](rng, out, groups)
+
+    return emit
+
+
+def _group(group: int, body: Emitter) -> Emitter:
+    def emit(rng: Random, out: list[str], groups: dict[int, str]) -> None:
+        start = len(out)
+        body(rng, out, groups)
+        groups[group] = "".join(out[start:])
+
+    return emit
+
+
+def _group_reference(group: int) -> Emitter:
+    def emit(rng: Random, out: list[str], groups: dict[int, str]) -> None:
+        out.append(groups.get(group, ""))
+
+    return emit
+
+
+def _group_exists(group: int, yes: Emitter, no: Emitter) -> Emitter:
+    def emit(rng: Random, out: list[str], groups: dict[int, str]) -> None:
+        (yes if group in groups else no)(rng, out, groups)
+
+    return emit
+
+
+class _Compiler:
+    """Turn a parsed regular expression into a tree of emitters."""
+
+    def __init__(self, max_repeat: int) -> None:
+        self.max_repeat = max_repeat
+
+    def sequence(
+        self,
+        nodes: Any,
+        flags: int,
+        defined: set[int],
+        at_start: bool = False,
+        at_end: bool = False,
+    ) -> Emitter:
+        """Compile a sequence of nodes.
+
+        ``defined`` holds the groups always generated before the sequence,
+        which backreferences may refer to, and is updated with the groups
+        the sequence always generates. ``at_start`` and ``at_end`` tell
+        whether the sequence starts or ends the pattern, where anchors are
+        allowed.
+        """
+        nodes = list(nodes)
+        # Anchors match an empty string, the nodes before the first node
+        # which is not an anchor (and after the last one) are at the start
+        # (and at the end) of the sequence too
+        first = 0
+        while first < len(nodes) and nodes[first][0] is sre_constants.AT:
+            first += 1
+        last = len(nodes) - 1
+        while last >= 0 and nodes[last][0] is sre_constants.AT:
+            last -= 1
+        emitters: list[Emitter] = []
+        literal: list[str] = []
+        for index, (op, av) in enumerate(nodes):
+            if op is sre_constants.LITERAL:
+                literal.append(chr(av))
+                continue
+            if literal:
+                emitters.append(_literal("".join(literal)))
+                literal = []
+            emitter = self.node(
+                op,
+                av,
+                flags,
+                defined,
+                at_start and index <= first,
+                at_end and index >= last,
+            )
+            if emitter is not None:
+                emitters.append(emitter)
+        if literal:
+            emitters.append(_literal("".join(literal)))
+        return _sequence(emitters) if emitters else _literal("")
+
+    def charset(self, op: Any, av: Any, flags: int) -> CodepointSet | None:
+        """Return the characters matched by a node matching one character."""
+        ignorecase = bool(flags & re.IGNORECASE)
+        if op is sre_constants.IN:
+            return _charset(av, ignorecase)
+        if op is sre_constants.NOT_LITERAL:
+            return _charset(
+                [(sre_constants.NEGATE, None), (sre_constants.LITERAL, av)], ignorecase
+            )
+        if op is sre_constants.ANY:
+            return CodepointSet(PRINTABLE)
+        return None
+
+    def node(
+        self,
+        op: Any,
+        av: Any,
+        flags: int,
+        defined: set[int],
+        at_start: bool,
+        at_end: bool,
+    ) -> Emitter | None:
+        charset = self.charset(op, av, flags)
+        if charset is not None:
+            return _character(charset)
+        if op in REPEATS:
+            low, high, body = av
+            if high is sre_constants.MAXREPEAT:
+                high = low + self.max_repeat
+            single = None
+            if len(body) == 1:
+                single = self.charset(body[0][0], body[0][1], flags)
+            # Repeated bodies follow (and precede) each other
+            if high > 1:
+                at_start = at_end = False
+            body_defined = set(defined)
+            emitter = self.sequence(body, flags, body_defined, at_start, at_end)
+            if low > 0:
+                defined |= body_defined
+            return _repeat(low, high, emitter, single)
+        if op is sre_constants.BRANCH:
+            alternatives = []
+            alternatives_defined = []
+            for item in av[1]:
+                item_defined = set(defined)
+                alternatives.append(
+                    self.sequence(item, flags, item_defined, at_start, at_end)
+                )
+                alternatives_defined.append(item_defined)
+            defined |= set.intersection(*alternatives_defined)
+            return _branch(alternatives)
+        if op is sre_constants.SUBPATTERN:
+            group, add_flags, del_flags, body = av
+            emitter = self.sequence(
+                body, (flags | add_flags) & ~del_flags, defined, at_start, at_end
+            )
+            if group is None:
+                return emitter
+            defined.add(group)
+            return _group(group, emitter)
+        if op is ATOMIC_GROUP:
+            return self.sequence(av, flags, defined, at_start, at_end)
+        if op is sre_constants.GROUPREF:
+            # Backreferences to a group which did not participate in the
+            # match never match, whatever is generated for them
+            if av not in defined:
+                raise ValueError(
+                    f"Backreferences are only supported to groups always"
+                    f" generated before them, group {av} may be missing"
+                )
+            return _group_reference(av)
+        if op is sre_constants.GROUPREF_EXISTS:
+            group, yes, no = av
+            yes_defined = defined | {group}
+            no_defined = set(defined)
+            emitter = _group_exists(
+                group,
+                self.sequence(yes, flags, yes_defined, at_start, at_end),
+                (
+                    self.sequence(no, flags, no_defined, at_start, at_end)
+                    if no is not None
+                    else _literal("")
+                ),
+            )
+            defined |= yes_defined & no_defined
+            return emitter
+        if op is sre_constants.AT and (av in BEGINNING_ANCHORS or av in END_ANCHORS):
+            if av in BEGINNING_ANCHORS and not at_start:
+                raise ValueError(
+                    "Anchors matching the beginning of the string are only"
+                    " supported at the start of the pattern"
+                )
+            if av in END_ANCHORS and not at_end:
+                raise ValueError(
+                    "Anchors matching the end of the string are only supported"
+                    " at the end of the pattern"
+                )
+            return None
+        raise ValueError(f"Unsupported regular expression construct: {op} {av}")
+
+
+class RegexPlan:
+    """Compiled plan generating strings matching a regular expression.
+
+    Instances are created by :func:`compile_regex`.
+
+    :param str pattern: The regular expression.
+    :param int flags: The flags of the regular expression.
+    :param emit: The root emitter of the plan.
+    """
+
+    __slots__ = ("_emit", "flags", "pattern")
+
+    def __init__(self, pattern: str, flags: int, emit: Emitter) -> None:
+        self.pattern = pattern
+        self.flags = flags
+        self._emit = emit
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.pattern!r}, flags={self.flags})"
+
+    def generate(self) -> str:
+        """Generate a string matching the regular expression.
+
+        :returns: A random matching string.
+        :rtype: str
+        """
+        out: list[str] = []
+        self._emit(get_random(), out, {})
+        return "".join(out)
+
+    def generate_many(
+        self, count: int, *, shard_index: int = 0, shard_count: int | None = None
+    ) -> list[str]:
+        """Generate ``count`` strings matching the regular expression.
+
+        With ``shard_count``, only the part of the strings of the shard
+        ``shard_index`` is generated (see
+        :func:`fauxfactory.rng.generate_shard`): the shards of identically
+        seeded generators put together give the strings generated with
+        ``shard_count=1``.
+
+        :param int count: The number of strings to generate, for all the
+            shards.
+        :param int shard_index: The index of the shard, from 0 to
+            ``shard_count - 1``.
+        :param int shard_count: The number of shards the strings are split
+            into.
+        :returns: A list of random matching strings.
+        :rtype: list[str]
+        :raises: ValueError if ``count`` is not a non-negative integer or the
+            shard is invalid.
+        """
+        if not isinstance(count, int) or count < 0:
+            raise ValueError(f"Count must be a non-negative integer, got {count}")
+        if shard_count is not None or shard_index != 0:
+            chunks = generate_shard(
+                self.generate_many, count, shard_index, shard_count, "regex"
+            )
+            return [string for strings in chunks for string in strings]
+        emit = self._emit
+        rng = get_random()
+        strings = []
+        for _ in range(count):
+            out: list[str] = []
+            emit(rng, out, {})
+            strings.append("".join(out))
+        return strings
+
+
+@lru_cache(maxsize=REGEX_CACHE_SIZE)
+def _compile_regex(pattern: str, flags: int, max_repeat: int) -> RegexPlan:
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except re.error as err:
+        raise ValueError(f"Invalid regular expression {pattern!r}: {err}") from err
+    flags = parsed.state.flags
+    emit = _Compiler(max_repeat).sequence(
+        parsed, flags, set(), at_start=True, at_end=True
+    )
+    return RegexPlan(pattern, flags, emit)
+
+
+def compile_regex(
+    pattern: str | re.Pattern[str], flags: int = 0, *, max_repeat: int = 10
+) -> RegexPlan:
+    """Compile a regular expression into a plan generating matching strings.
+
+    The pattern is parsed by the parser of the :mod:`re` module and turned
+    into a tree of generators: literals are copied, character classes are
+    sampled directly and the alternatives and repetition counts are drawn
+    at random, so no string is ever rejected. Plans are cached, compiling
+    the same pattern again is cheap.
+
+    Generated characters for ``.`` and negated classes (such as ``[^a-z]``
+    or ``\\W``) are printable ASCII characters and ``\\d``, ``\\s`` and
+    ``\\w`` generate ASCII characters only. Lookahead and lookbehind
+    assertions and word boundaries are not supported, the ``^``, ``$``,
+    ``\\A`` and ``\\Z`` anchors are only supported at the start (or end) of
+    the pattern and backreferences only to groups always generated before
+    them (``(a)?\\1`` is rejected, ``(a)?(?(1)\\1)`` is not).
+
+    :param pattern: The regular expression, either a string or a compiled
+        pattern.
+    :param int flags: Flags of the regular expression (e.g.
+        ``re.IGNORECASE``), added to those of a compiled pattern.
+    :param int max_repeat: Maximum number of repetitions added to the
+        minimum of unbounded quantifiers (``*``, ``+`` and ``{n,}``).
+    :returns: A plan whose ``generate()`` and ``generate_many(count)`` methods
+        generate matching strings.
+    :rtype: RegexPlan
+    :raises: ValueError if the pattern is invalid or not supported.
+    """
+    if isinstance(pattern, re.Pattern):
+        flags |= pattern.flags
+        pattern = pattern.pattern
+    if not isinstance(pattern, str):
+        raise ValueError(f"Pattern must be a string, got {pattern!r}")
+    if not isinstance(max_repeat, int) or max_repeat < 0:
+        raise ValueError(f"{max_repeat} is an invalid max_repeat.")
+    return _compile_regex(pattern, flags, max_repeat)
+
+
+def gen_from_regex(
+    pattern: str | re.Pattern[str], flags: int = 0, *, max_repeat: int = 10
+) -> str:
+    """Generate a random string matching a regular expression.
+
+    Unlike passing a regular expression as ``validator`` to other string
+    factories, which generates strings until one of them matches, the
+    string is built from the pattern itself (see :func:`compile_regex`).
+
+    :param pattern: The regular expression, either a string or a compiled
+        pattern.
+    :param int flags: Flags of the regular expression.
+    :param int max_repeat: Maximum number of repetitions added to the
+        minimum of unbounded quantifiers (``*``, ``+`` and ``{n,}``).
+    :returns: A random string matching ``pattern``.
+    :rtype: str
+    :raises: ValueError if the pattern is invalid or not supported.
+
+    Example::
+
+        from fauxfactory import gen_from_regex
+
+        gen_from_regex(r"[A-Z]{3}-\\d{4}")  # e.g. 'QZB-0427'
+
+    """
+    return compile_regex(pattern, flags, max_repeat=max_repeat).generate()
+
+
+__all__ = tuple(name for name in locals() if name.startswith("gen_"))
+
+
+def __dir__():
+    return __all__
@@ -1,21 +1,78 @@
 """Collection of string generating functions."""
 
-import random
 import string
+import time
 from collections.abc import Callable
 from re import Pattern
 from typing import Any
 
 from fauxfactory.constants import HTML_TAGS, LOREM_IPSUM_TEXT
 from fauxfactory.helpers import (
+    AsciiAlphabet,
+    CodepointSet,
     check_len,
     check_validation,
     is_positive_int,
-    unicode_letters_generator,
+    record_validation,
+    unicode_letters,
+    validation_stats_of,
+    validator_function,
 )
+from fauxfactory.rng import get_random
 
 ValidatorType = Callable[[str], bool] | Pattern[str] | str | None
 
+# gen_string_many validates its strings itself, not through check_validation
+STRING_MANY_VALIDATION_STATS = validation_stats_of("gen_string_many")
+
+# These should represent the ranges for valid CJK characters. Blocks end at
+# their last character assigned in Unicode 13.0, the database of the oldest
+# supported Python, so that every character has a name whatever the Python
+# version
+CJK_BMP_CODEPOINTS = CodepointSet(
+    # CJK Unified Ideographs (BMP), U+9FFD to U+9FFF were added in 14.0
+    (0x4E00, 0x9FFC),
+    # CJK Unified Ideographs Extension A (BMP)
+    (0x3400, 0x4DBF),
+)
+CJK_CODEPOINTS = CodepointSet(
+    *CJK_BMP_CODEPOINTS.ranges,
+    # CJK Unified Ideographs Extension B
+    (0x20000, 0x2A6DD),
+    # CJK Unified Ideographs Extension C
+    (0x2A700, 0x2B734),
+    # CJK Unified Ideographs Extension D
+    (0x2B740, 0x2B81D),
+)
+# Letters of the Latin-1 Supplement block, leaving out the multiplication
+# (U+00D7) and division (U+00F7) signs
+LATIN1_CODEPOINTS = CodepointSet((0x00C0, 0x00D6), (0x00D8, 0x00F6), (0x00F8, 0x00FF))
+CYRILLIC_CODEPOINTS = CodepointSet((0x0400, 0x04FF))
+
+ALPHA_ALPHABET = AsciiAlphabet(string.ascii_letters)
+ALPHANUMERIC_ALPHABET = AsciiAlphabet(string.ascii_letters + string.digits)
+NUMERIC_ALPHABET = AsciiAlphabet(string.digits)
+PUNCTUATION_ALPHABET = AsciiAlphabet(string.punctuation)
+
+
+def _sample_utf8(k: int, smp: bool = True) -> str:
+    """Return ``k`` random UTF-8 letters characters."""
+    return "".join(get_random().choices(unicode_letters(smp), k=k))
+
+
+# Functions returning ``k`` random characters for every string type made up
+# of independent characters. Those types can be generated in batches.
+CHARACTER_SAMPLERS: dict[str, Callable[[int], str]] = {
+    "alpha": ALPHA_ALPHABET.sample,
+    "alphanumeric": ALPHANUMERIC_ALPHABET.sample,
+    "cjk": CJK_CODEPOINTS.sample,
+    "cyrillic": CYRILLIC_CODEPOINTS.sample,
+    "latin1": LATIN1_CODEPOINTS.sample,
+    "numeric": NUMERIC_ALPHABET.sample,
+    "utf8": _sample_utf8,
+    "punctuation": PUNCTUATION_ALPHABET.sample,
+}
+
 
 def gen_string(
     str_type: str,
@@ -79,6 +136,108 @@ def gen_string(
     return method(length, validator=validator, default=default, tries=tries)  # type: ignore[no-any-return, operator]
 
 
+def gen_string_many(
+    str_type: str,
+    count: int,
+    length: int | None = None,
+    validator: ValidatorType = None,
+    default: str | None = None,
+    tries: int = 10,
+) -> list[str]:
+    """Return a list of random strings of the same type.
+
+    This is the batched counterpart of :func:`gen_string`: arguments are
+    checked once for the whole batch and, for string types made up of
+    independent characters, the characters of every string are drawn in a
+    single call and then sliced into ``count`` strings. When a ``validator``
+    is given, the rejected strings are generated again as a smaller batch,
+    up to ``tries`` times, before being replaced by ``default``.
+
+    :param str str_type: The type of string which should be generated. See
+        :func:`gen_string` for the valid values.
+    :param int count: The number of strings to generate.
+    :param int length: The length of each generated string. Must be 1 or
+        greater. Default is 10.
+    :param validator: Function or regex (str), see :func:`gen_string`.
+    :param default: Value used in place of a string that was rejected by
+        ``validator`` a number of ``tries`` times. Must be defined if
+        validator is not None
+    :param tries: number of times validator must be called before using
+        `default`. Default is 10.
+    :raises: ``ValueError`` if an invalid ``str_type``, ``count`` or
+        ``length`` is specified.
+    :returns: A list of ``count`` strings.
+    :rtype: list[str]
+
+    """
+    str_type_lower = str_type.lower()  # do not modify user data
+    if str_type_lower != "html" and str_type_lower not in CHARACTER_SAMPLERS:
+        raise ValueError(
+            f"{str_type_lower} is not a supported string type. "
+            "Valid string types are {0}.".format(
+                ",".join(["html", *CHARACTER_SAMPLERS])
+            )
+        )
+    if not isinstance(count, int) or count < 0:
+        raise ValueError(f"{count} is an invalid count.")
+    if length is None:
+        length = 10
+    is_positive_int(length)
+    if validator and default is None:
+        raise ValueError(
+            'If "validator" param is defined, "default" parameter must not be None'
+        )
+    validator_fcn = validator_function(validator)
+
+    if str_type_lower == "html":
+
+        def generate(size: int) -> list[str]:
+            """Generate ``size`` html strings."""
+            return [gen_html(length) for _ in range(size)]
+
+    else:
+        sampler = CHARACTER_SAMPLERS[str_type_lower]
+
+        def generate(size: int) -> list[str]:
+            """Slice ``size`` strings out of a single draw of characters."""
+            chars = sampler(length * size)
+            return [chars[pos : pos + length] for pos in range(0, len(chars), length)]
+
+    result = generate(count)
+    if validator is None:
+        return result
+
+    clock = time.perf_counter_ns
+    start = clock()
+    pending = [index for index, value in enumerate(result) if not validator_fcn(value)]
+    validator_ns = clock() - start
+    attempts, rejections = count, len(pending)
+    for _ in range(tries - 1):
+        if not pending:
+            break
+        values = generate(len(pending))
+        start = clock()
+        rejected = []
+        for index, value in zip(pending, values, strict=True):
+            result[index] = value
+            if not validator_fcn(value):
+                rejected.append(index)
+        validator_ns += clock() - start
+        attempts += len(pending)
+        rejections += len(rejected)
+        pending = rejected
+    record_validation(
+        STRING_MANY_VALIDATION_STATS,
+        attempts,
+        rejections,
+        len(pending),
+        validator_ns,
+    )
+    for index in pending:
+        result[index] = default  # type: ignore[assignment]
+    return result
+
+
 @check_len
 @check_validation
 def gen_alpha(
@@ -98,7 +257,7 @@ def gen_alpha(
     :rtype: str
 
     """
-    output_string = "".join(random.choices(string.ascii_letters, k=length))
+    output_string = ALPHA_ALPHABET.sample(length)
 
     if start:
         output_string = f"{start}{separator}{output_string}"[:length]
@@ -124,9 +283,7 @@ def gen_alphanumeric(
     :rtype: str
 
     """
-    output_string = "".join(
-        random.choices(string.ascii_letters + string.digits, k=length)
-    )
+    output_string = ALPHANUMERIC_ALPHABET.sample(length)
 
     if start:
         output_string = f"{start}{separator}{output_string}"[:length]
@@ -158,36 +315,8 @@ def gen_cjk(
     :rtype: str
 
     """
-    # These should represent the ranges for valid CJK characters
-    unicode_block: tuple[tuple[int, int], ...]
-    if bmp_only:
-        unicode_block = (
-            # CJK Unified Ideographs (BMP)
-            (0x4E00, 0x9FFF),
-            # CJK Unified Ideographs Extension A (BMP)
-            (0x3400, 0x4DBF),
-        )
-    else:
-        unicode_block = (
-            # CJK Unified Ideographs
-            (0x4E00, 0x9FFF),
-            # CJK Unified Ideographs Extension A
-            (0x3400, 0x4DBF),
-            # CJK Unified Ideographs Extension B
-            (0x20000, 0x2A6DF),
-            # CJK Unified Ideographs Extension C
-            (0x2A700, 0x2B73F),
-            # CJK Unified Ideographs Extension D
-            (0x2B740, 0x2B81F),
-        )
-
-    output_array = []
-
-    for code_block in unicode_block:
-        for i in range(*code_block):
-            output_array.append(i)
-
-    output_string = "".join(map(chr, random.choices(output_array, k=length)))
+    codepoints = CJK_BMP_CODEPOINTS if bmp_only else CJK_CODEPOINTS
+    output_string = codepoints.sample(length)
 
     if start:
         output_string = f"{start}{separator}{output_string}"[0:length]
@@ -213,10 +342,7 @@ def gen_cyrillic(
     :rtype: str
 
     """
-    # Generate codepoints, then convert the codepoints to a string. The
-    # valid range of Cyrillic codepoints is 0x0400 - 0x04FF, inclusive.
-    codepoints = [random.randint(0x0400, 0x04FF) for _ in range(length)]
-    output_string = "".join(chr(codepoint) for codepoint in codepoints)
+    output_string = CYRILLIC_CODEPOINTS.sample(length)
 
     if start:
         output_string = f"{start}{separator}{output_string}"[0:length]
@@ -239,7 +365,7 @@ def gen_html(
     :rtype: str
 
     """
-    html_tag = random.choice(HTML_TAGS)
+    html_tag = get_random().choice(HTML_TAGS)
 
     if not include_tags:
         if length < 8:
@@ -337,19 +463,7 @@ def gen_latin1(
     :rtype: str
 
     """
-    range0 = ["00C0", "00D6"]
-    range1 = ["00D8", "00F6"]
-    range2 = ["00F8", "00FF"]
-    output_array = []
-
-    for i in range(int(range0[0], 16), int(range0[1], 16)):
-        output_array.append(i)
-    for i in range(int(range1[0], 16), int(range1[1], 16)):
-        output_array.append(i)
-    for i in range(int(range2[0], 16), int(range2[1], 16)):
-        output_array.append(i)
-
-    output_string = "".join(map(chr, random.choices(output_array, k=length)))
+    output_string = LATIN1_CODEPOINTS.sample(length)
 
     if start:
         output_string = f"{start}{separator}{output_string}"[0:length]
@@ -375,7 +489,7 @@ def gen_numeric_string(
     :rtype: str
 
     """
-    output_string = "".join(random.choices(string.digits, k=length))
+    output_string = NUMERIC_ALPHABET.sample(length)
 
     if start:
         output_string = f"{start}{separator}{output_string}"[0:length]
@@ -408,8 +522,7 @@ def gen_utf8(
     .. _`RFC 3629`: http://www.rfc-editor.org/rfc/rfc3629.txt
 
     """
-    unicode_letters = list(unicode_letters_generator(smp))
-    output_string = "".join(random.choices(unicode_letters, k=length))
+    output_string = _sample_utf8(length, smp)
 
     if start:
         output_string = f"{start}{separator}{output_string}"[0:length]
@@ -434,7 +547,7 @@ def gen_special(
     :returns: A random string made up of special characters.
     :rtype: str
     """
-    output_string = "".join(random.choices(string.punctuation, k=length))
+    output_string = PUNCTUATION_ALPHABET.sample(length)
 
     if start:
         output_string = f"{start}{separator}{output_string}"[0:length]
@@ -1,10 +1,21 @@
 """Collection of computer systems generating functions."""
 
-from copy import deepcopy
-from typing import Any
-
-from fauxfactory.constants import FACTS_JSON
-from fauxfactory.helpers import is_positive_int
+import os
+import random
+from collections.abc import Iterator, Mapping, MutableMapping
+from functools import cache
+from types import MappingProxyType
+from typing import Any, Literal, overload
+
+from fauxfactory import constants
+from fauxfactory.helpers import is_positive_int, map_chunks
+from fauxfactory.rng import (
+    call_with_random,
+    derive_seed,
+    get_random,
+    shard_chunks,
+    use_random,
+)
 
 from .choices import gen_choice, gen_uuid
 from .internet import gen_domain, gen_ipaddr, gen_mac, gen_netmask
@@ -12,20 +23,180 @@ from .numbers import gen_integer
 from .strings import gen_alpha, gen_alphanumeric
 
 
+def _freeze(value: Any) -> Any:
+    """Return an immutable version of a JSON value."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(val) for key, val in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Return a mutable copy of a value frozen by :func:`_freeze`."""
+    if isinstance(value, MappingProxyType):
+        return {key: _thaw(val) for key, val in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+class FactsTemplate:
+    """Immutable system facts shared by every generated host.
+
+    The template is compiled once out of
+    :data:`fauxfactory.constants.FACTS_JSON`, nested containers included,
+    so that hosts never need a deep copy of it: they are either a thin
+    :class:`FactsOverlay` on top of the template or a plain dictionary
+    where only the nested containers the host did not override are copied.
+
+    :param facts: The facts to use as template.
+    """
+
+    __slots__ = ("_containers", "_facts", "_flat")
+
+    def __init__(self, facts: Mapping[str, Any]) -> None:
+        self._facts: Mapping[str, Any] = _freeze(dict(facts))
+        # Scalar values can be shared as-is, only containers need a copy
+        self._flat = dict(self._facts)
+        self._containers = tuple(
+            key
+            for key, value in self._facts.items()
+            if isinstance(value, (MappingProxyType, tuple))
+        )
+
+    @property
+    def facts(self) -> Mapping[str, Any]:
+        """Return the read-only template facts."""
+        return self._facts
+
+    def overlay(self, overrides: dict[str, Any]) -> "FactsOverlay":
+        """Return a host whose facts are ``overrides`` on top of the template.
+
+        :param overrides: Facts of the host. The dictionary is owned by the
+            returned overlay and must not be modified afterwards.
+        :returns: A mapping looking up ``overrides`` first, then the template.
+        """
+        return FactsOverlay(self, overrides)
+
+    def materialize(self, overrides: Mapping[str, Any]) -> dict[str, Any]:
+        """Return a plain dictionary with ``overrides`` on top of the template.
+
+        :param overrides: Facts of the host.
+        :returns: A new dictionary, sharing no container with the template.
+        """
+        host = self._flat.copy()
+        host.update(overrides)
+        for key in self._containers:
+            if key not in overrides:
+                host[key] = _thaw(self._facts[key])
+        return host
+
+
+class FactsOverlay(MutableMapping[str, Any]):
+    """Copy-on-write system facts of a host.
+
+    Facts set on the host are stored in the overlay while the other ones are
+    looked up in the shared :class:`FactsTemplate`. Nested containers of the
+    template are copied the first time they are looked up, so they can be
+    modified in place without affecting other hosts.
+
+    :param template: The template holding the default facts.
+    :param overrides: Facts of the host.
+    """
+
+    __slots__ = ("_deleted", "_overrides", "_template")
+
+    def __init__(self, template: FactsTemplate, overrides: dict[str, Any]) -> None:
+        self._template = template
+        self._overrides = overrides
+        self._deleted: set[str] = set()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.materialize()!r})"
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._overrides[key]
+        except KeyError:
+            if key in self._deleted:
+                raise
+        value = self._template.facts[key]
+        if isinstance(value, (MappingProxyType, tuple)):
+            value = self._overrides[key] = _thaw(value)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._overrides[key] = value
+        self._deleted.discard(key)
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._overrides.pop(key, None)
+        if key in self._template.facts:
+            self._deleted.add(key)
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._overrides:
+            return True
+        return key in self._template.facts and key not in self._deleted
+
+    def __iter__(self) -> Iterator[str]:
+        deleted = self._deleted
+        template_facts = self._template.facts
+        for key in template_facts:
+            if key not in deleted:
+                yield key
+        for key in self._overrides:
+            if key not in template_facts:
+                yield key
+
+    def __len__(self) -> int:
+        template_facts = self._template.facts
+        return (
+            len(template_facts)
+            - len(self._deleted)
+            + sum(1 for key in self._overrides if key not in template_facts)
+        )
+
+    def materialize(self) -> dict[str, Any]:
+        """Return the facts of the host as a plain dictionary.
+
+        :returns: A new dictionary, sharing no container with the template.
+        """
+        host = self._template.materialize(self._overrides)
+        for key in self._deleted:
+            del host[key]
+        return host
+
+
+@cache
+def facts_template() -> FactsTemplate:
+    """Return the template shared by all hosts, compiled on first use."""
+    return FactsTemplate(constants.FACTS_JSON)
+
+
+# Smallest amount of RAM of a system, in GB, which is also its smallest
+# amount of free RAM
+MIN_MEMORY = 4
+
+
 def add_memory_info(count: int | None = None) -> dict[str, str]:
     """Generate fake memory facts.
 
-    :param int count: The total amount of RAM for a system.
+    :param int count: The total amount of RAM for a system, at least
+        :data:`MIN_MEMORY` GB.
     :returns: A dictionary representing memory facts.
     :rtype: dict
 
     """
     if count is None:
-        count = gen_choice(range(4, 128, 2))
+        count = gen_choice(range(MIN_MEMORY, 128, 2))
     else:
         is_positive_int(count)
 
-    free_ram = gen_integer(min_value=4, max_value=count)
+    free_ram = gen_integer(min_value=MIN_MEMORY, max_value=count)
 
     return {
         "dmi::memory::size": f"{free_ram * 1024}",
@@ -170,21 +341,16 @@ def add_processor_info(count: int | None = None) -> dict[str, Any]:
     return processors
 
 
-def gen_system_facts(name: str | None = None) -> dict[str, Any]:
-    """Generate system facts.
-
-    See https://docs.puppet.com/facter/3.6/core_facts.html for more
-    information.
-
-    :param str name: Name to be used as the system's hostname.
-    :returns: A Dictionary representing a system's facts.
-    :rtype: dict
-    """
-    fqdn = gen_domain() if name is None or name == "" else gen_domain(*name.split("."))
-
+def _host_facts(
+    fqdn: str,
+    memory: int | None = None,
+    processors: int | None = None,
+    extra_partitions: int | None = None,
+) -> dict[str, Any]:
+    """Generate the facts of a host which are not part of the template."""
     kernel = ".".join([f"{gen_integer(min_value=0, max_value=9)}" for _ in range(3)])
 
-    host = deepcopy(FACTS_JSON)
+    host: dict[str, Any] = {}
 
     host["architecture"] = gen_choice(("i386", "x86_64"))
     host["domain"] = ".".join(fqdn.split(".")[1:])
@@ -199,15 +365,15 @@ def gen_system_facts(name: str | None = None) -> dict[str, Any]:
     )
     host["kernelversion"] = kernel
 
-    host.update(add_memory_info())
+    host.update(add_memory_info(memory))
 
     host.update(add_network_devices())
 
     host.update(add_operating_system())
 
-    host.update(add_partitions())
+    host.update(add_partitions(extra_partitions))
 
-    host.update(add_processor_info())
+    host.update(add_processor_info(processors))
 
     host["path"] = "/usr/local/sbin:/usr/local/bin:/usr/sbin:/usr/bin:/root/bin:/sbin"
 
@@ -233,6 +399,214 @@ def gen_system_facts(name: str | None = None) -> dict[str, Any]:
     return host
 
 
+@overload
+def gen_system_facts(
+    name: str | None = None, materialize: Literal[True] = True
+) -> dict[str, Any]: ...
+
+
+@overload
+def gen_system_facts(
+    name: str | None = None, *, materialize: Literal[False]
+) -> FactsOverlay: ...
+
+
+@overload
+def gen_system_facts(name: str | None, materialize: Literal[False]) -> FactsOverlay: ...
+
+
+def gen_system_facts(
+    name: str | None = None, materialize: bool = True
+) -> dict[str, Any] | FactsOverlay:
+    """Generate system facts.
+
+    See https://docs.puppet.com/facter/3.6/core_facts.html for more
+    information.
+
+    Hosts share an immutable template of the facts which are not generated
+    (see :func:`facts_template`) instead of getting a deep copy of it.
+
+    :param str name: Name to be used as the system's hostname.
+    :param bool materialize: Return a plain dictionary. If False, return a
+        :class:`FactsOverlay` on top of the shared template, which is
+        cheaper to build and lighter to keep around, and can be turned into
+        a dictionary later with its ``materialize()`` method.
+    :returns: A Dictionary representing a system's facts.
+    :rtype: dict
+    """
+    fqdn = gen_domain() if name is None or name == "" else gen_domain(*name.split("."))
+    host = _host_facts(fqdn)
+    template = facts_template()
+    if materialize:
+        return template.materialize(host)
+    return template.overlay(host)
+
+
+# Fleets with at least this many hosts are generated by a process pool when
+# the number of processes is not given.
+FLEET_POOL_THRESHOLD = 5000
+
+
+def _fleet_chunk(
+    seed: int,
+    size: int,
+    domain: str | None,
+    memory: int | None,
+    processors: int | None,
+    extra_partitions: int | None,
+) -> list[dict[str, Any]]:
+    """Generate the facts not part of the template of ``size`` hosts.
+
+    This runs in the worker processes of :func:`gen_fleet`, only the
+    generated facts are sent back to keep the transfer cheap.
+    """
+    hosts = []
+    with use_random(random.Random(seed)):
+        for _ in range(size):
+            fqdn = (
+                gen_domain() if domain is None else f"{gen_alpha(8).lower()}.{domain}"
+            )
+            hosts.append(_host_facts(fqdn, memory, processors, extra_partitions))
+    return hosts
+
+
+class _FleetIdentifiers:
+    """Make sure hostnames, UUIDs and MAC addresses are unique in a fleet."""
+
+    __slots__ = ("hostnames", "macs", "uuids")
+
+    def __init__(self) -> None:
+        self.hostnames: set[str] = set()
+        self.uuids: set[str] = set()
+        self.macs: set[str] = set()
+
+    def claim(self, host: dict[str, Any]) -> None:
+        """Replace the identifiers of ``host`` already used by another host.
+
+        Replacements are drawn from the active generator, which the caller
+        must seed to get reproducible fleets.
+        """
+        while host["hostname"] in self.hostnames:
+            host["hostname"] = gen_alpha(8).lower()
+            host["fqdn"] = f"{host['hostname']}.{host['domain']}"
+        self.hostnames.add(host["hostname"])
+
+        while host["uuid"] in self.uuids:
+            host["uuid"] = host["dmi::system::uuid"] = gen_uuid()
+        self.uuids.add(host["uuid"])
+
+        for key in ("macaddress", "macaddress_enp11s0"):
+            while host[key] in self.macs:
+                host[key] = gen_mac()
+            self.macs.add(host[key])
+
+
+def gen_fleet(
+    count: int,
+    *,
+    domain: str | None = None,
+    memory: int | None = None,
+    processors: int | None = None,
+    extra_partitions: int | None = None,
+    seed: int | None = None,
+    processes: int | None = None,
+    chunk_size: int = 1000,
+) -> Iterator[dict[str, Any]]:
+    """Generate the system facts of a fleet of hosts.
+
+    Hosts are generated ``chunk_size`` at a time and yielded lazily, each of
+    them being a dictionary like the ones returned by
+    :func:`gen_system_facts`. Hostnames (hence FQDNs), UUIDs and MAC
+    addresses are unique across the fleet.
+
+    Large fleets are generated by a pool of processes, each of them
+    generating whole chunks. Every chunk is seeded from ``seed`` and its
+    position, so the same seed and chunk size give the same fleet whatever
+    the number of processes.
+
+    Unlike :func:`~fauxfactory.factories.structures.parallel_generate`,
+    fleets cannot be split into shards generated separately: identifiers
+    already used by a host are replaced in the hosts that follow, so every
+    host depends on all the hosts before it.
+
+    :param int count: Number of hosts in the fleet.
+    :param str domain: Domain of all the hosts (e.g. ``'example.com'``). By
+        default, every host gets a random domain.
+    :param int memory: Amount of RAM of every host, in GB, at least
+        :data:`MIN_MEMORY` (see :func:`add_memory_info`).
+    :param int processors: Number of processors of every host (see
+        :func:`add_processor_info`).
+    :param int extra_partitions: Number of extra partitions of every host
+        (see :func:`add_partitions`).
+    :param int seed: Seed of the fleet. By default, it is drawn from
+        :func:`fauxfactory.rng.get_random`.
+    :param int processes: Number of worker processes. ``1`` generates the
+        fleet in the current process. By default, a process per CPU is used
+        for fleets of at least :data:`FLEET_POOL_THRESHOLD` hosts.
+    :param int chunk_size: Number of hosts generated at once by a process.
+    :returns: An iterator over the facts of the hosts.
+    :rtype: iterator
+    :raises: ValueError if ``count`` is negative, if ``processes``,
+        ``chunk_size`` or the host options are not positive integers or if
+        ``memory`` is less than :data:`MIN_MEMORY`.
+
+    Example::
+
+        from fauxfactory import gen_fleet
+
+        for host in gen_fleet(100_000, domain='example.com', seed=42):
+            register(host)
+
+    """
+    if not isinstance(count, int) or count < 0:
+        raise ValueError(f"Count must be a non-negative integer, got {count}")
+    is_positive_int(chunk_size)
+    if processes is None:
+        processes = 1
+        if count >= FLEET_POOL_THRESHOLD:
+            processes = os.cpu_count() or 1
+    else:
+        is_positive_int(processes)
+    if seed is None:
+        seed = get_random().getrandbits(64)
+    # Validate the host options upfront rather than in a worker process
+    for value in (memory, processors, extra_partitions):
+        if value is not None:
+            is_positive_int(value)
+    if memory is not None and memory < MIN_MEMORY:
+        raise ValueError(f"{memory} GB is less than the {MIN_MEMORY} GB minimum.")
+
+    return _gen_fleet(
+        count,
+        seed,
+        processes,
+        chunk_size,
+        (domain, memory, processors, extra_partitions),
+    )
+
+
+def _gen_fleet(
+    count: int,
+    seed: int,
+    processes: int,
+    chunk_size: int,
+    options: tuple[Any, ...],
+) -> Iterator[dict[str, Any]]:
+    """Yield the hosts of a fleet validated by :func:`gen_fleet`."""
+    chunks = (
+        (chunk_seed, size, *options)
+        for chunk_seed, size in shard_chunks(count, chunk_size, 0, 1, seed, "fleet")
+    )
+    template = facts_template()
+    identifiers = _FleetIdentifiers()
+    replacements = random.Random(derive_seed(seed, "fleet", "identifiers"))
+
+    for hosts in map_chunks(_fleet_chunk, chunks, processes):
+        for host in hosts:
+            call_with_random(replacements, identifiers.claim, host)
+            yield template.materialize(host)
+
+
 __all__ = tuple(name for name in locals() if name.startswith("gen_"))
 
 
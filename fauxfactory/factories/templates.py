@@ -0,0 +1,301 @@
+"""Generate composite strings from format templates."""
+
+import inspect
+import string
+import sys
+from collections.abc import Callable
+from functools import lru_cache
+from random import Random
+from typing import Any
+
+from fauxfactory.backends import random_integers
+from fauxfactory.helpers import is_positive_int
+from fauxfactory.rng import generate_shard, get_random
+
+from .choices import gen_uuid
+from .internet import gen_domain, gen_email, gen_ipaddr, gen_mac
+from .strings import CHARACTER_SAMPLERS
+
+# Number of compiled templates kept in memory
+TEMPLATE_CACHE_SIZE = 256
+
+# Length of the strings generated by placeholders without a length
+DEFAULT_LENGTH = 10
+
+# Generate the value of a placeholder, given the random generator
+One = Callable[[Random], Any]
+# Generate a number of values of a placeholder, given the random generator
+Many = Callable[[Random, int], list[Any]]
+
+
+def _length(name: str, args: list[str]) -> int:
+    """Return the length argument of a string placeholder."""
+    if not args:
+        return DEFAULT_LENGTH
+    if len(args) > 1 or not args[0].isdigit():
+        raise ValueError(f"Invalid arguments for {{{name}}}: {':'.join(args)}")
+    length = int(args[0])
+    is_positive_int(length)
+    return length
+
+
+def _no_args(name: str, args: list[str]) -> None:
+    if args:
+        raise ValueError(f"{{{name}}} does not take arguments: {':'.join(args)}")
+
+
+def _characters(name: str, args: list[str]) -> tuple[One, Many]:
+    """Strings of independent characters of a string type."""
+    sampler = CHARACTER_SAMPLERS[name]
+    length = _length(name, args)
+
+    def one(rng: Random) -> str:
+        return sampler(length)
+
+    def many(rng: Random, count: int) -> list[str]:
+        chars = sampler(length * count)
+        return [chars[pos : pos + length] for pos in range(0, len(chars), length)]
+
+    return one, many
+
+
+def _integer(name: str, args: list[str]) -> tuple[One, Many]:
+    """Integers between optional bounds, as :func:`gen_integer`."""
+    min_value, max_value = -sys.maxsize - 1, sys.maxsize
+    if args:
+        try:
+            (min_value, max_value) = (int(arg) for arg in args)
+        except ValueError:
+            raise ValueError(
+                f"Invalid arguments for {{{name}}}: {':'.join(args)}"
+            ) from None
+    if min_value > max_value:
+        raise ValueError(f"Invalid range for {{{name}}}: {min_value} > {max_value}")
+
+    def one(rng: Random) -> int:
+        return rng.randint(min_value, max_value)
+
+    def many(rng: Random, count: int) -> list[int]:
+        return random_integers(rng, min_value, max_value, count)
+
+    return one, many
+
+
+def _choice(name: str, args: list[str]) -> tuple[One, Many]:
+    """One of the ``|`` separated choices, as :func:`gen_choice`."""
+    if len(args) != 1:
+        raise ValueError(f"{{{name}}} takes choices separated by '|'")
+    choices = args[0].split("|")
+
+    def one(rng: Random) -> str:
+        return rng.choice(choices)
+
+    def many(rng: Random, count: int) -> list[str]:
+        return rng.choices(choices, k=count)
+
+    return one, many
+
+
+def _factory(
+    factory: Callable[..., Any], **kwargs: Any
+) -> Callable[[str, list[str]], tuple[One, Many]]:
+    """Placeholders calling ``factory`` with ``kwargs``, without arguments.
+
+    The factory is called undecorated: placeholders take no validator, so
+    the :func:`~fauxfactory.helpers.check_validation` wrapper is skipped.
+    It draws from :func:`~fauxfactory.rng.get_random`, which is the
+    generator the plan renders with.
+    """
+    function = inspect.unwrap(factory)
+
+    def build(name: str, args: list[str]) -> tuple[One, Many]:
+        _no_args(name, args)
+
+        def one(rng: Random) -> Any:
+            return function(**kwargs)
+
+        def many(rng: Random, count: int) -> list[Any]:
+            return [function(**kwargs) for _ in range(count)]
+
+        return one, many
+
+    return build
+
+
+# Placeholder name to the function building its generators, given the ``:``
+# separated arguments of the placeholder
+PLACEHOLDERS: dict[str, Callable[[str, list[str]], tuple[One, Many]]] = {
+    **dict.fromkeys(CHARACTER_SAMPLERS, _characters),
+    "choice": _choice,
+    "domain": _factory(gen_domain),
+    "email": _factory(gen_email),
+    "int": _integer,
+    "ipv4": _factory(gen_ipaddr),
+    "ipv6": _factory(gen_ipaddr, ipv6=True),
+    "mac": _factory(gen_mac),
+    "uuid": _factory(gen_uuid),
+}
+
+
+class TemplatePlan:
+    """Compiled plan generating strings from a format template.
+
+    Instances are created by :func:`compile_template`.
+
+    :param str template: The template.
+    :param str layout: The template with every placeholder replaced by ``{}``
+        and the other braces escaped, suitable for :meth:`str.format`.
+    :param fields: The generators of every placeholder, in order.
+    """
+
+    __slots__ = ("_layout", "_many", "_one", "template")
+
+    def __init__(
+        self, template: str, layout: str, fields: list[tuple[One, Many]]
+    ) -> None:
+        self.template = template
+        self._layout = layout
+        self._one = tuple(one for one, _ in fields)
+        self._many = tuple(many for _, many in fields)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.template!r})"
+
+    def render(self) -> str:
+        """Generate a string from the template.
+
+        :returns: The template with a random value for every placeholder.
+        :rtype: str
+        """
+        rng = get_random()
+        return self._layout.format(*[one(rng) for one in self._one])
+
+    def render_many(
+        self, count: int, *, shard_index: int = 0, shard_count: int | None = None
+    ) -> list[str]:
+        """Generate ``count`` strings from the template.
+
+        The values of every placeholder are generated as a single batch.
+        With ``shard_count``, only the part of the strings of the shard
+        ``shard_index`` is generated (see
+        :func:`fauxfactory.rng.generate_shard`): the shards of identically
+        seeded generators put together give the strings generated with
+        ``shard_count=1``.
+
+        :param int count: The number of strings to generate, for all the
+            shards.
+        :param int shard_index: The index of the shard, from 0 to
+            ``shard_count - 1``.
+        :param int shard_count: The number of shards the strings are split
+            into.
+        :returns: A list of random strings.
+        :rtype: list[str]
+        :raises: ValueError if ``count`` is not a non-negative integer or the
+            shard is invalid.
+        """
+        if not isinstance(count, int) or count < 0:
+            raise ValueError(f"Count must be a non-negative integer, got {count}")
+        if shard_count is not None or shard_index != 0:
+            chunks = generate_shard(
+                self.render_many, count, shard_index, shard_count, "template"
+            )
+            return [string for strings in chunks for string in strings]
+        if not count:
+            return []
+        if not self._many:
+            return [self._layout.format()] * count
+        rng = get_random()
+        layout = self._layout.format
+        columns = [many(rng, count) for many in self._many]
+        return [layout(*row) for row in zip(*columns, strict=True)]
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def _compile_template(template: str) -> TemplatePlan:
+    try:
+        parsed = list(string.Formatter().parse(template))
+    except ValueError as err:
+        raise ValueError(f"Invalid template {template!r}: {err}") from err
+    layout = []
+    fields = []
+    for literal, field, spec, conversion in parsed:
+        layout.append(literal.replace("{", "{{").replace("}", "}}"))
+        if field is None:
+            continue
+        if conversion is not None:
+            raise ValueError(f"Conversions are not supported: {{{field}!{conversion}}}")
+        if field not in PLACEHOLDERS:
+            raise ValueError(
+                f"Unknown placeholder {{{field}}} in {template!r}. Valid"
+                f" placeholders are {','.join(sorted(PLACEHOLDERS))}."
+            )
+        args = spec.split(":") if spec else []
+        fields.append(PLACEHOLDERS[field](field, args))
+        layout.append("{}")
+    return TemplatePlan(template, "".join(layout), fields)
+
+
+def compile_template(template: str) -> TemplatePlan:
+    """Compile a format template into a plan generating strings.
+
+    Placeholders are written between braces, with their arguments separated
+    by colons, and literal braces are doubled as in :meth:`str.format`::
+
+        compile_template("usr-{alpha:8}-{int:0:999}@{domain}")
+
+    The supported placeholders are:
+
+    * ``{alpha}``, ``{alphanumeric}``, ``{cjk}``, ``{cyrillic}``,
+      ``{latin1}``, ``{numeric}``, ``{punctuation}`` and ``{utf8}``: strings
+      of the :func:`gen_string` type of the same name, 10 characters long or
+      ``{alpha:LENGTH}`` characters long;
+    * ``{int}`` or ``{int:MIN:MAX}``: integers, as :func:`gen_integer`;
+    * ``{choice:A|B|C}``: one of the ``|`` separated values;
+    * ``{uuid}``, ``{domain}``, ``{email}``, ``{ipv4}``, ``{ipv6}`` and
+      ``{mac}``: values generated by :func:`gen_uuid`,
+      :func:`gen_domain`, :func:`gen_email`, :func:`gen_ipaddr` (with
+      ``ipv6=True`` for ``{ipv6}``) and :func:`gen_mac` with their default
+      arguments.
+
+    The template is parsed once and every placeholder is bound to a
+    generator: strings and integers are drawn from the random generator
+    directly, in bulk for :meth:`TemplatePlan.render_many`, and the other
+    placeholders call their factory without its validation decorator.
+    Plans are cached, compiling the same template again is cheap.
+
+    :param str template: The template.
+    :returns: A plan whose ``render()`` and ``render_many(count)`` methods
+        generate strings.
+    :rtype: TemplatePlan
+    :raises: ValueError if the template is invalid or holds an unknown
+        placeholder.
+    """
+    if not isinstance(template, str):
+        raise ValueError(f"Template must be a string, got {template!r}")
+    return _compile_template(template)
+
+
+def gen_from_template(template: str) -> str:
+    """Generate a random string from a format template.
+
+    :param str template: The template, see :func:`compile_template`.
+    :returns: The template with a random value for every placeholder.
+    :rtype: str
+    :raises: ValueError if the template is invalid or holds an unknown
+        placeholder.
+
+    Example::
+
+        from fauxfactory import gen_from_template
+
+        gen_from_template("usr-{alpha:8}-{int:0:999}")  # e.g. 'usr-hQeRtaBc-42'
+
+    """
+    return compile_template(template).render()
+
+
+__all__ = tuple(name for name in locals() if name.startswith("gen_"))
+
+
+def __dir__():
+    return __all__
@@ -0,0 +1,93 @@
+"""Instance based access to all factories."""
+
+import random
+from collections.abc import Callable
+from functools import wraps
+from typing import Any
+
+import fauxfactory
+from fauxfactory.rng import Seed, call_with_random, fork_safe
+from fauxfactory.uniqueness import UniqueRegistry
+from fauxfactory.uniqueness import unique as unique_factory
+
+
+class Faux:
+    """Expose every ``gen_*`` factory bound to a private random generator.
+
+    Each instance owns its own :class:`random.Random`, so values generated
+    through it are reproducible for a given ``seed`` and isolated from the
+    global random state and from any other instance, which makes it safe to
+    give one instance to every test, worker or thread::
+
+        from fauxfactory import Faux
+
+        faux = Faux(seed=42)
+        faux.gen_alpha(8)
+        faux.gen_dict({"email": faux.gen_email})
+
+    Factories called indirectly while a method runs (for example callables
+    of a :func:`~fauxfactory.factories.structures.gen_dict` schema, even if
+    they refer to the module level factories) draw from the instance
+    generator as well.
+
+    :param seed: Seed for the instance generator. ``None`` seeds it from the
+        operating system randomness source.
+    :param rng: Use this random generator (any :class:`random.Random`
+        instance or subclass) instead of creating one. ``seed`` is ignored
+        when provided.
+    :param unique: Make every factory method of the instance never return
+        the same value twice, see :func:`fauxfactory.unique`. Each method
+        tracks its own values, ``faux.gen_email.clear()`` forgets them.
+        Given a :class:`~fauxfactory.uniqueness.UniqueRegistry`, values are
+        reserved in the registry, so that they are unique across all the
+        processes sharing it.
+
+    The instance generator is reseeded in forked child processes, see
+    :func:`fauxfactory.rng.set_fork_policy`.
+
+    """
+
+    def __init__(
+        self,
+        seed: Seed = None,
+        *,
+        rng: random.Random | None = None,
+        unique: bool | UniqueRegistry = False,
+    ) -> None:
+        self.random = fork_safe(random.Random(seed) if rng is None else rng)
+        self.unique = unique
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(rng={self.random!r})"
+
+    def __dir__(self) -> list[str]:
+        return sorted({*super().__dir__(), *fauxfactory.__all__})
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        if not name.startswith("gen_") or name not in fauxfactory.__all__:
+            raise AttributeError(
+                f"{type(self).__name__!r} object has no attribute {name!r}"
+            )
+        factory = getattr(fauxfactory, name)
+        rng = self.random
+
+        @wraps(factory)
+        def bound(*args: Any, **kwargs: Any) -> Any:
+            return call_with_random(rng, factory, *args, **kwargs)
+
+        method: Callable[..., Any] = bound
+        if isinstance(self.unique, UniqueRegistry):
+            method = unique_factory(bound, registry=self.unique)
+        elif self.unique:
+            method = unique_factory(bound)
+        # Cache the bound factory so the lookup only happens once
+        setattr(self, name, method)
+        return method
+
+    def seed(self, seed: Seed = None) -> None:
+        """Reseed the instance generator.
+
+        :param seed: Any value accepted by :meth:`random.Random.seed`.
+
+        """
+        self.random.seed(seed)
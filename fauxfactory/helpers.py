@@ -1,18 +1,36 @@
 """Collection of helper methods and functions."""
 
+import hashlib
+import logging
+import os
 import re
+import tempfile
+import threading
+import time
 import unicodedata
-from collections import namedtuple
-from collections.abc import Callable, Generator
-from functools import wraps
+from bisect import bisect_left, bisect_right
+from collections import deque, namedtuple
+from collections.abc import Callable, Generator, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache, wraps
+from itertools import islice
+from multiprocessing.context import BaseContext
+from pathlib import Path
 from typing import Any, TypeVar
 
 from fauxfactory.constants import VALID_DIGITS
+from fauxfactory.rng import get_random
 
 F = TypeVar("F", bound=Callable[..., Any])
+T = TypeVar("T")
+
+logger = logging.getLogger("fauxfactory")
 
 UnicodePlane = namedtuple("UnicodePlane", ["min", "max"])
 
+# Size of the BLAKE2b checksum stored ahead of the unicode letters table
+LETTERS_DIGEST_SIZE = 16
+
 BMP = UnicodePlane(int("0x0000", 16), int("0xffff", 16))
 SMP = UnicodePlane(int("0x10000", 16), int("0x1ffff", 16))
 
@@ -58,6 +76,149 @@ def base_repr(number: int, base: int) -> str:
     return "".join(digits)
 
 
+class AsciiAlphabet:
+    """An alphabet of ASCII characters sampled at the byte level.
+
+    Sampling reads random bytes with :meth:`random.Random.randbytes` and maps them
+    through a precomputed :meth:`bytes.translate` table, so no per-character
+    Python objects are ever created. To keep the distribution uniform, bytes
+    past the largest multiple of the alphabet size are rejected (deleted by
+    the same ``translate`` call) and new bytes are drawn to make up for them.
+
+    The alphabet also behaves as a read-only sequence of characters.
+
+    :param str alphabet: The characters to sample from.
+    :raises: ``ValueError`` if ``alphabet`` is empty, longer than 256
+        characters or not made up of ASCII characters only.
+
+    """
+
+    __slots__ = ("_accepted", "_alphabet", "_rejected", "_table")
+
+    def __init__(self, alphabet: str) -> None:
+        if not alphabet or len(alphabet) > 256 or not alphabet.isascii():
+            raise ValueError(f"{alphabet!r} is not a valid ASCII alphabet.")
+        size = len(alphabet)
+        accepted = 256 // size * size
+        self._alphabet = alphabet
+        self._accepted = accepted
+        self._table = bytes(
+            ord(alphabet[byte % size]) if byte < accepted else 0 for byte in range(256)
+        )
+        self._rejected = bytes(range(accepted, 256))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._alphabet!r})"
+
+    def __len__(self) -> int:
+        return len(self._alphabet)
+
+    def __getitem__(self, index: int) -> str:
+        return self._alphabet[index]
+
+    def __contains__(self, char: object) -> bool:
+        return isinstance(char, str) and len(char) == 1 and char in self._alphabet
+
+    def sample(self, k: int) -> str:
+        """Return a string of ``k`` characters drawn uniformly from the alphabet.
+
+        :param int k: The number of characters to draw.
+        :return: A string made up of ``k`` random characters of the alphabet.
+
+        """
+        rng = get_random()
+        chunks = []
+        missing = k
+        while missing > 0:
+            # Draw enough bytes to make up for the expected rejections
+            draw = rng.randbytes(missing * 256 // self._accepted + 8)
+            chunk = draw.translate(self._table, self._rejected)[:missing]
+            chunks.append(chunk)
+            missing -= len(chunk)
+        return b"".join(chunks).decode("ascii")
+
+
+class CodepointSet:
+    """A set of unicode code points described by inclusive ranges.
+
+    Only the ``(start, end)`` pairs and their cumulative sizes are kept, so
+    sampling never materializes the pool of candidate characters: a single
+    random integer is drawn over the total size and mapped back to a code
+    point with a bisect over the cumulative sizes.
+
+    The set behaves as a read-only sequence of characters, which means it
+    can be handed over to :func:`random.choice` or :func:`random.choices`.
+
+    :param ranges: ``(start, end)`` code point pairs, both ends included.
+    :raises: ``ValueError`` if no range is given or if a range is empty.
+
+    """
+
+    __slots__ = ("_offsets", "_ranges", "_size", "_starts")
+
+    def __init__(self, *ranges: tuple[int, int]) -> None:
+        if not ranges:
+            raise ValueError("At least one code point range is required.")
+        starts = []
+        offsets = []
+        size = 0
+        for start, end in ranges:
+            if start > end:
+                raise ValueError(f"Invalid code point range ({start}, {end}).")
+            starts.append(start)
+            offsets.append(size)
+            size += end - start + 1
+        self._ranges = tuple(ranges)
+        self._starts = tuple(starts)
+        self._offsets = tuple(offsets)
+        self._size = size
+
+    def __repr__(self) -> str:
+        ranges = ", ".join(f"({start:#06x}, {end:#06x})" for start, end in self._ranges)
+        return f"{type(self).__name__}({ranges})"
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("CodepointSet index out of range")
+        position = bisect_right(self._offsets, index) - 1
+        return chr(self._starts[position] + index - self._offsets[position])
+
+    def __contains__(self, char: object) -> bool:
+        if not isinstance(char, str) or len(char) != 1:
+            return False
+        codepoint = ord(char)
+        return any(start <= codepoint <= end for start, end in self._ranges)
+
+    @property
+    def ranges(self) -> tuple[tuple[int, int], ...]:
+        """Return the ``(start, end)`` pairs making up this set."""
+        return self._ranges
+
+    def sample(self, k: int) -> str:
+        """Return a string of ``k`` characters drawn uniformly from the set.
+
+        :param int k: The number of characters to draw.
+        :return: A string made up of ``k`` random characters of this set.
+
+        """
+        indexes = get_random().choices(range(self._size), k=k)
+        if len(self._starts) == 1:
+            start = self._starts[0]
+            return "".join([chr(start + index) for index in indexes])
+        starts = self._starts
+        offsets = self._offsets
+        chars = []
+        for index in indexes:
+            position = bisect_right(offsets, index) - 1
+            chars.append(chr(starts[position] + index - offsets[position]))
+        return "".join(chars)
+
+
 def check_len(fnc: F) -> F:
     """Validate generators requiring a `length` argument."""
 
@@ -77,15 +238,195 @@ def check_len(fnc: F) -> F:
     return wrapped  # type: ignore[return-value]
 
 
+def validator_function(validator: Any) -> Callable[[Any], Any]:
+    """Turn a ``validator`` argument into a predicate.
+
+    :param validator: ``None``, a callable or a regex (either a ``str`` or a
+        compiled pattern).
+    :return: A function receiving a generated value and returning a truthy
+        value if it can be used.
+
+    """
+    if validator is None:
+
+        def validator_fcn(_: Any) -> bool:
+            """No validation passed."""
+            return True
+
+        return validator_fcn
+
+    if not callable(validator):
+
+        def regex_validator(value: str) -> Any:
+            """Perform RegEx validation."""
+            return re.match(validator, value)
+
+        return regex_validator
+
+    return validator  # type: ignore[no-any-return]
+
+
+class ValidationStats:
+    """Counters of the values checked by the validator of a factory.
+
+    :param str name: Name of the factory.
+    """
+
+    __slots__ = ("attempts", "calls", "exhausted", "name", "rejections", "validator_ns")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.calls = 0
+        self.attempts = 0
+        self.rejections = 0
+        self.exhausted = 0
+        self.validator_ns = 0
+
+    @property
+    def rejection_ratio(self) -> float:
+        """Return the fraction of the generated values which were rejected."""
+        return self.rejections / self.attempts if self.attempts else 0.0
+
+    def clear(self) -> None:
+        """Reset all the counters."""
+        self.calls = self.attempts = self.rejections = 0
+        self.exhausted = self.validator_ns = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters as a dictionary."""
+        return {
+            "calls": self.calls,
+            "attempts": self.attempts,
+            "rejections": self.rejections,
+            "exhausted": self.exhausted,
+            "validator_ns": self.validator_ns,
+            "rejection_ratio": self.rejection_ratio,
+        }
+
+
+_validation_lock = threading.Lock()
+_validation_stats: dict[str, ValidationStats] = {}
+# Rejection ratio above which a warning is logged, None to never log
+_rejection_threshold: float | None = None
+_rejection_min_attempts = 100
+# Factories whose rejection ratio was already logged by this process
+_rejections_logged: set[str] = set()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_rejections_logged.clear)
+
+
+def validation_stats_of(name: str) -> ValidationStats:
+    """Return the validation counters of a factory, creating them if needed.
+
+    :param str name: Name of the factory.
+    :returns: The counters, shared by every caller asking for ``name``.
+    :rtype: ValidationStats
+    """
+    with _validation_lock:
+        stats = _validation_stats.get(name)
+        if stats is None:
+            stats = _validation_stats[name] = ValidationStats(name)
+        return stats
+
+
+def record_validation(
+    stats: ValidationStats,
+    attempts: int,
+    rejections: int,
+    exhausted: int,
+    validator_ns: int,
+) -> None:
+    """Add the outcome of a validated call to the counters of a factory.
+
+    :param stats: The counters of the factory.
+    :param int attempts: Number of values passed to the validator.
+    :param int rejections: Number of values rejected by the validator.
+    :param int exhausted: Number of values replaced by the default value.
+    :param int validator_ns: Time spent in the validator, in nanoseconds.
+    """
+    with _validation_lock:
+        stats.calls += 1
+        stats.attempts += attempts
+        stats.rejections += rejections
+        stats.exhausted += exhausted
+        stats.validator_ns += validator_ns
+        if (
+            _rejection_threshold is None
+            or stats.attempts < _rejection_min_attempts
+            or stats.rejection_ratio < _rejection_threshold
+            or stats.name in _rejections_logged
+        ):
+            return
+        _rejections_logged.add(stats.name)
+    logger.warning(
+        "The validator of %s rejected %.1f%% of %d generated values, %d of them "
+        "replaced by the default value",
+        stats.name,
+        100 * stats.rejection_ratio,
+        stats.attempts,
+        stats.exhausted,
+    )
+
+
+def validation_stats() -> dict[str, dict[str, Any]]:
+    """Return the validation counters of every factory called with a validator.
+
+    :returns: A dictionary mapping factory names to their number of validated
+        ``calls``, the number of values passed to the validator
+        (``attempts``), rejected by it (``rejections``) and replaced by the
+        default value after running out of tries (``exhausted``), the time
+        spent in the validator (``validator_ns``) and the
+        ``rejection_ratio``.
+    :rtype: dict
+
+    """
+    with _validation_lock:
+        return {
+            name: stats.as_dict()
+            for name, stats in _validation_stats.items()
+            if stats.calls
+        }
+
+
+def reset_validation_stats() -> None:
+    """Reset the validation counters of every factory."""
+    with _validation_lock:
+        for stats in _validation_stats.values():
+            stats.clear()
+        _rejections_logged.clear()
+
+
+def log_rejections(threshold: float | None = 0.5, min_attempts: int = 100) -> None:
+    """Log a warning when validators reject too many values.
+
+    The warning is logged through the ``fauxfactory`` logger, once per
+    factory and process, as soon as the validator of a factory rejected at
+    least ``threshold`` of the values generated for it.
+
+    :param threshold: Rejection ratio, between 0 and 1, above which the
+        warning is logged. ``None`` disables the warning.
+    :param int min_attempts: Number of values a validator must check before
+        its rejection ratio is considered.
+    """
+    global _rejection_threshold, _rejection_min_attempts
+    with _validation_lock:
+        _rejection_threshold = threshold
+        _rejection_min_attempts = min_attempts
+
+
 def check_validation(fcn: F) -> F:
     """Decorate functions requiring validation.
 
     Simple decorator to validate values generated by function `fnc`
     according to parameters `validator`, `default` and `tries`.
 
+    Calls with a validator are counted in the validation statistics of the
+    function (see :func:`validation_stats`).
+
     :param fcn: function to be enhanced
     :return: decorated function
     """
+    stats = validation_stats_of(fcn.__name__)
 
     @wraps(fcn)
     def validate(*args: Any, **kwargs: Any) -> Any:
@@ -97,33 +438,29 @@ def check_validation(fcn: F) -> F:
             raise ValueError(
                 'If "validator" param is defined, "default" parameter must not be None'
             )
-        if validator is None:
-
-            def validator_fcn(_: Any) -> bool:
-                """No validation passed."""
-                return True
-
-        else:
-            validator_fcn = validator
-
-        if not callable(validator_fcn):
-
-            def regex_validator(value: str) -> Any:
-                """Perform RegEx validation."""
-                return re.match(validator, value)
-
-            validator_fcn = regex_validator
 
         # Removing params related to validation but not fcn
         for key in ("validator", "default", "tries"):
             if key in kwargs:
                 kwargs.pop(key)
 
-        for _ in range(tries):
+        if validator is None:
+            return fcn(*args, **kwargs) if tries > 0 else default
+
+        validator_fcn = validator_function(validator)
+        clock = time.perf_counter_ns
+        validator_ns = 0
+        for attempt in range(1, tries + 1):
             value = fcn(*args, **kwargs)
-            if validator_fcn(value):
+            start = clock()
+            valid = validator_fcn(value)
+            validator_ns += clock() - start
+            if valid:
+                record_validation(stats, attempt, attempt - 1, 0, validator_ns)
                 return value
 
+        attempts = max(tries, 0)
+        record_validation(stats, attempts, attempts, 1, validator_ns)
         return default
 
     return validate  # type: ignore[return-value]
@@ -142,6 +479,121 @@ def is_positive_int(length: Any) -> None:
         raise ValueError(f"{length} is an invalid length.")
 
 
+def unicode_letters_cache_file() -> Path | None:
+    """Return the on-disk location of the unicode letters table.
+
+    The file name is keyed by :data:`unicodedata.unidata_version` so that a
+    Python upgrade shipping a newer Unicode database never reads a stale
+    table. The file holds a checksum followed by the letters encoded as
+    UTF-32, and is rewritten whenever the checksum does not match. The
+    directory defaults to ``$XDG_CACHE_HOME/fauxfactory`` (or
+    ``~/.cache/fauxfactory``) and can be overridden with the
+    ``FAUXFACTORY_CACHE_DIR`` environment variable.
+
+    :return: The cache file path, or ``None`` if the disk cache is disabled
+        through the ``FAUXFACTORY_DISABLE_DISK_CACHE`` environment variable.
+
+    """
+    if "FAUXFACTORY_DISABLE_DISK_CACHE" in os.environ:
+        return None
+    cache_dir = os.environ.get("FAUXFACTORY_CACHE_DIR")
+    if cache_dir:
+        directory = Path(cache_dir)
+    else:
+        xdg_cache = os.environ.get("XDG_CACHE_HOME")
+        directory = (
+            Path(xdg_cache) if xdg_cache else Path.home() / ".cache"
+        ) / "fauxfactory"
+    return directory / f"unicode-letters-v2-{unicodedata.unidata_version}.bin"
+
+
+def _scan_unicode_letters() -> str:
+    """Walk the BMP and SMP planes collecting the letters category."""
+    return "".join(
+        char
+        for char in map(chr, range(BMP.min, SMP.max))
+        if unicodedata.category(char).startswith("L")
+    )
+
+
+def _letters_digest(data: bytes) -> bytes:
+    """Return the checksum stored ahead of a persisted letters table."""
+    return hashlib.blake2b(data, digest_size=LETTERS_DIGEST_SIZE).digest()
+
+
+def _read_unicode_letters(path: Path) -> str | None:
+    """Load a previously persisted letters table, ``None`` if unusable.
+
+    The table is only used if its checksum matches, so that a truncated or
+    corrupted file is rebuilt instead of changing the letters for good.
+    """
+    try:
+        content = path.read_bytes()
+    except OSError:
+        return None
+    digest, data = content[:LETTERS_DIGEST_SIZE], content[LETTERS_DIGEST_SIZE:]
+    if not data or digest != _letters_digest(data):
+        return None
+    try:
+        letters = data.decode("utf-32-le")
+    except UnicodeDecodeError:
+        return None
+    if ord(letters[-1]) >= SMP.max:
+        return None
+    return letters
+
+
+def _write_unicode_letters(path: Path, letters: str) -> None:
+    """Persist the letters table atomically, ignoring any I/O failure."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        descriptor, temp_name = tempfile.mkstemp(
+            dir=path.parent, prefix=f".{path.name}."
+        )
+    except OSError:
+        return
+    temp_path = Path(temp_name)
+    try:
+        data = letters.encode("utf-32-le")
+        with os.fdopen(descriptor, "wb") as handler:
+            handler.write(_letters_digest(data) + data)
+        temp_path.replace(path)
+    except OSError:
+        temp_path.unlink(missing_ok=True)
+
+
+@cache
+def unicode_letters(smp: bool = True) -> str:
+    """Return every unicode character in the letters category.
+
+    The table is built once per process and kept as a single string, which
+    is itself a compact array of code points that :func:`random.choices` can
+    index directly. The full table is also persisted to
+    :func:`unicode_letters_cache_file` so that a cold start only pays for
+    reading it back instead of scanning ~130k code points.
+
+    :param bool smp: Include Supplementary Multilingual Plane (SMP)
+        characters
+    :return: a string holding all unicode letters available, ordered by
+        code point
+
+    """
+    if not smp:
+        letters = unicode_letters(smp=True)
+        return letters[: bisect_left(letters, chr(BMP.max))]
+
+    path = unicode_letters_cache_file()
+    if path is not None:
+        cached = _read_unicode_letters(path)
+        if cached is not None:
+            return cached
+
+    letters = _scan_unicode_letters()
+    if path is not None:
+        _write_unicode_letters(path, letters)
+    return letters
+
+
 def unicode_letters_generator(smp: bool = True) -> Generator[str, None, None]:
     """Generate unicode characters in the letters category.
 
@@ -150,7 +602,59 @@ def unicode_letters_generator(smp: bool = True) -> Generator[str, None, None]:
     :return: a generator which will generates all unicode letters available
 
     """
-    for i in range(BMP.min, SMP.max if smp else BMP.max):
-        char = chr(i)
-        if unicodedata.category(char).startswith("L"):
-            yield char
+    yield from unicode_letters(smp)
+
+
+def map_chunks(
+    function: Callable[..., T],
+    chunks: Iterable[tuple[Any, ...]],
+    processes: int,
+    *,
+    initializer: Callable[..., object] | None = None,
+    initargs: tuple[Any, ...] = (),
+    mp_context: BaseContext | None = None,
+) -> Generator[T, None, None]:
+    """Call ``function`` on every chunk in a pool of processes.
+
+    Results are yielded in the order of the chunks, as soon as they are
+    ready. Only a couple of chunks per process are submitted ahead, so the
+    chunks may be an endless iterator and the results are not all held in
+    memory at once.
+
+    :param function: The function called with the arguments of a chunk. It
+        must be picklable, as well as the chunks and the results.
+    :param chunks: The arguments of every call.
+    :param int processes: The number of worker processes. ``1`` calls
+        ``function`` in the current process and ignores ``initializer``.
+    :param initializer: Called with ``initargs`` in every worker process
+        before any chunk. With the ``spawn`` and ``forkserver`` start
+        methods, ``initargs`` must be picklable.
+    :param mp_context: The multiprocessing context of the pool, the default
+        start method of the platform by default.
+    :returns: An iterator over the results.
+    :rtype: iterator
+
+    """
+    chunks = iter(chunks)
+    if processes == 1:
+        for chunk in chunks:
+            yield function(*chunk)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=mp_context,
+        initializer=initializer,
+        initargs=initargs,
+    ) as executor:
+        pending = deque(
+            executor.submit(function, *chunk) for chunk in islice(chunks, 2 * processes)
+        )
+        try:
+            while pending:
+                result = pending.popleft().result()
+                for chunk in islice(chunks, 1):
+                    pending.append(executor.submit(function, *chunk))
+                yield result
+        finally:
+            executor.shutdown(cancel_futures=True)
@@ -0,0 +1,250 @@
+"""Opt-in instrumentation of the factories calls.
+
+Once enabled, every ``gen_*`` factory records how many times it is called,
+the total time spent in it and a histogram of its latencies::
+
+    import fauxfactory
+    from fauxfactory import instrument
+
+    instrument.enable()
+    fauxfactory.gen_alpha()
+    print(instrument.report())
+
+:func:`enable` loads every factory module and replaces the factories by
+recording wrappers in the namespaces of the package and of all its modules,
+so that calls through ``fauxfactory.gen_alpha``, ``from
+fauxfactory.factories.strings import gen_alpha`` or :class:`~fauxfactory.Faux`
+instances are all recorded. :func:`disable` puts the factories back, so
+calls cost nothing more than usual when instrumentation is disabled.
+
+References to a factory taken outside of :mod:`fauxfactory` before
+:func:`enable` is called (e.g. by ``from fauxfactory import gen_alpha`` at
+the top of a test module, or stored in a schema) still point to the factory
+itself and their calls are not recorded. :func:`enable` should then be
+called early, for example from a ``conftest.py`` file. Calls made by a
+factory to other factories are not recorded separately: their time is part
+of the time of the outer factory, including the retries of its
+``validator``.
+"""
+
+import sys
+import threading
+import time
+from collections.abc import Callable
+from functools import wraps
+from typing import Any
+
+import fauxfactory
+
+# Latencies are counted in buckets of powers of two nanoseconds: bucket ``i``
+# holds the calls which took less than 2**i nanoseconds (and at least
+# 2**(i - 1) nanoseconds).
+HISTOGRAM_BUCKETS = 64
+
+
+class FactoryStats:
+    """Statistics recorded for a factory.
+
+    :param str name: Name of the factory.
+    """
+
+    __slots__ = ("calls", "histogram", "max_ns", "min_ns", "name", "total_ns")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.calls = 0
+        self.total_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+        self.histogram = [0] * HISTOGRAM_BUCKETS
+
+    def record(self, duration: int) -> None:
+        """Record a call which took ``duration`` nanoseconds."""
+        if not self.calls or duration < self.min_ns:
+            self.min_ns = duration
+        if duration > self.max_ns:
+            self.max_ns = duration
+        self.calls += 1
+        self.total_ns += duration
+        self.histogram[duration.bit_length()] += 1
+
+    def clear(self) -> None:
+        """Forget the recorded calls."""
+        self.calls = self.total_ns = self.min_ns = self.max_ns = 0
+        self.histogram = [0] * HISTOGRAM_BUCKETS
+
+    def percentile(self, fraction: float) -> int:
+        """Return an upper bound of the given latency percentile.
+
+        :param float fraction: Fraction of the calls, between 0 and 1.
+        :returns: The upper bound (a power of two, in nanoseconds) of the
+            histogram bucket holding the percentile, 0 if nothing was
+            recorded.
+        :rtype: int
+        """
+        threshold = fraction * self.calls
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if count and seen >= threshold:
+                return min(1 << bucket, self.max_ns)
+        return 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics as a dictionary of plain values."""
+        return {
+            "calls": self.calls,
+            "total_ns": self.total_ns,
+            "mean_ns": self.total_ns // self.calls if self.calls else 0,
+            "min_ns": self.min_ns,
+            "max_ns": self.max_ns,
+            "p50_ns": self.percentile(0.5),
+            "p99_ns": self.percentile(0.99),
+            "histogram": {
+                1 << bucket: count
+                for bucket, count in enumerate(self.histogram)
+                if count
+            },
+        }
+
+
+_lock = threading.Lock()
+_stats: dict[str, FactoryStats] = {}
+_enabled = False
+# Tells whether the current thread is running an instrumented factory
+_running = threading.local()
+# Namespaces where a factory was replaced: namespace, name, factory, wrapper
+_replaced: list[tuple[dict[str, Any], str, Any, Any]] = []
+
+
+def _stats_of(name: str) -> FactoryStats:
+    """Return the statistics of a factory, creating them if needed."""
+    with _lock:
+        stats = _stats.get(name)
+        if stats is None:
+            stats = _stats[name] = FactoryStats(name)
+        return stats
+
+
+def _instrumented(name: str, factory: Callable[..., Any]) -> Callable[..., Any]:
+    """Return a wrapper of ``factory`` recording its calls."""
+    clock = time.perf_counter_ns
+    lock = _lock
+    record = _stats_of(name).record
+
+    @wraps(factory)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        # Factories called by another factory are part of its time
+        if not _enabled or getattr(_running, "factory", False):
+            return factory(*args, **kwargs)
+        _running.factory = True
+        start = clock()
+        try:
+            return factory(*args, **kwargs)
+        finally:
+            duration = clock() - start
+            _running.factory = False
+            with lock:
+                record(duration)
+
+    return wrapper
+
+
+def _replace_factories() -> None:
+    """Replace the factories by wrappers in the package and its modules."""
+    wrappers = {}
+    for name in fauxfactory.__all__:
+        if name.startswith("gen_"):
+            # Loads the module of the factory
+            factory = getattr(fauxfactory, name)
+            wrappers[id(factory)] = (factory, _instrumented(name, factory))
+    for module_name, module in list(sys.modules.items()):
+        if module_name != "fauxfactory" and not module_name.startswith("fauxfactory."):
+            continue
+        namespace = vars(module)
+        for key, value in list(namespace.items()):
+            factory, wrapper = wrappers.get(id(value), (None, None))
+            if factory is value:
+                namespace[key] = wrapper
+                _replaced.append((namespace, key, factory, wrapper))
+
+
+def _restore_factories() -> None:
+    """Put back the factories replaced by :func:`_replace_factories`."""
+    for namespace, key, factory, wrapper in _replaced:
+        # Leave alone the names bound to something else since
+        if namespace.get(key) is wrapper:
+            namespace[key] = factory
+    _replaced.clear()
+
+
+def enable() -> None:
+    """Start recording the calls to the factories."""
+    global _enabled
+    with _lock:
+        if _enabled:
+            return
+        _enabled = True
+    _replace_factories()
+
+
+def disable() -> None:
+    """Stop recording calls, the recorded data is kept."""
+    global _enabled
+    with _lock:
+        if not _enabled:
+            return
+        _enabled = False
+    _restore_factories()
+
+
+def is_enabled() -> bool:
+    """Return whether calls are being recorded."""
+    return _enabled
+
+
+def reset() -> None:
+    """Forget all the recorded calls."""
+    with _lock:
+        # Wrappers keep a reference to the statistics of their factory
+        for stats in _stats.values():
+            stats.clear()
+
+
+def snapshot() -> dict[str, dict[str, Any]]:
+    """Return a copy of the data recorded so far.
+
+    :returns: A dictionary mapping the name of every factory called to its
+        statistics: number of ``calls``, ``total_ns``, ``mean_ns``,
+        ``min_ns`` and ``max_ns`` durations, ``p50_ns`` and ``p99_ns``
+        latency upper bounds and the latency ``histogram`` (mapping the
+        upper bound of every non empty bucket, in nanoseconds, to its number
+        of calls).
+    :rtype: dict
+    """
+    with _lock:
+        return {name: stats.as_dict() for name, stats in _stats.items() if stats.calls}
+
+
+def report(data: dict[str, dict[str, Any]] | None = None) -> str:
+    """Return the recorded data as a table, most time consuming first.
+
+    :param data: A :func:`snapshot`, by default the current data.
+    :returns: A plain text table.
+    :rtype: str
+    """
+    if data is None:
+        data = snapshot()
+    rows = sorted(data.items(), key=lambda item: item[1]["total_ns"], reverse=True)
+    width = max([len("factory"), *(len(name) for name in data)])
+    lines = [
+        f"{'factory':<{width}} {'calls':>10} {'total ms':>10} {'mean us':>9}"
+        f" {'p50 us':>9} {'p99 us':>9}"
+    ]
+    for name, stats in rows:
+        lines.append(
+            f"{name:<{width}} {stats['calls']:>10} {stats['total_ns'] / 1e6:>10.1f}"
+            f" {stats['mean_ns'] / 1e3:>9.1f} {stats['p50_ns'] / 1e3:>9.1f}"
+            f" {stats['p99_ns'] / 1e3:>9.1f}"
+        )
+    return "\n".join(lines)
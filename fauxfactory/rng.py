@@ -0,0 +1,389 @@
+"""Random number generators used by :mod:`fauxfactory`.
+
+Factories never call the module level functions of :mod:`random` directly.
+They draw values from :func:`get_random` instead, which returns the
+generator activated for the current thread or asynchronous task, falling
+back to the global generator shared with the :mod:`random` module. That makes
+it possible to get reproducible and isolated streams of data without
+touching the global random state::
+
+    from fauxfactory import gen_alpha, seeded
+
+    with seeded(42):
+        first = gen_alpha()
+    with seeded(42):
+        assert gen_alpha() == first
+
+Work split between processes or machines gets one stream per part with
+:func:`derive_seed`, so that the parts put together are the same whatever
+the number of parts.
+
+Forked child processes (for example the workers of a ``multiprocessing``
+pool) would otherwise inherit the state of the generators of their parent
+and all generate the same data. They are reseeded after a fork, see
+:func:`set_fork_policy`.
+"""
+
+import hashlib
+import os
+import random
+import weakref
+from collections.abc import Callable, Generator, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+# Number of items of the chunks generated by the shards of a bulk generation
+SHARD_CHUNK_SIZE = 1000
+
+# Values accepted by random.Random.seed
+Seed = int | float | str | bytes | bytearray | None
+
+_active_random: ContextVar[random.Random] = ContextVar("fauxfactory_random")
+
+# What happens to the generators in a forked child process
+FORK_RESEED = "reseed"
+FORK_ENTROPY = "entropy"
+FORK_INHERIT = "inherit"
+FORK_POLICIES = (FORK_RESEED, FORK_ENTROPY, FORK_INHERIT)
+
+_fork_policy = FORK_RESEED
+# Generators reseeded after a fork, with the number of times the process
+# forked since they were created
+_fork_counts: "weakref.WeakKeyDictionary[random.Random, int]" = (
+    weakref.WeakKeyDictionary()
+)
+# Number of forks since the state of the global generator last changed,
+# along with that state
+_global_forks = 0
+_global_state: Any = None
+
+
+def get_random() -> random.Random:
+    """Return the random number generator factories should draw from.
+
+    :returns: The generator activated by :func:`use_random` (or
+        :func:`seeded`) in the current context, or the global generator
+        backing the :mod:`random` module functions.
+    :rtype: random.Random
+
+    """
+    return _active_random.get(random._inst)
+
+
+def get_active_random() -> random.Random | None:
+    """Return the generator activated in the current context, if any.
+
+    :returns: The generator activated by :func:`use_random` (or
+        :func:`seeded`) in the current context, or ``None`` when factories
+        fall back to the global generator.
+    :rtype: random.Random or None
+
+    """
+    return _active_random.get(None)
+
+
+@contextmanager
+def use_random(rng: random.Random) -> Generator[random.Random, None, None]:
+    """Make factories draw values from ``rng`` within a ``with`` block.
+
+    The generator is only activated for the current thread (or asynchronous
+    task), so concurrent code keeps using its own generator.
+
+    :param rng: The random number generator to activate.
+    :returns: A context manager yielding ``rng``.
+
+    """
+    fork_safe(rng)
+    token = _active_random.set(rng)
+    try:
+        yield rng
+    finally:
+        _active_random.reset(token)
+
+
+def call_with_random(
+    rng: random.Random, function: Callable[..., T], /, *args: Any, **kwargs: Any
+) -> T:
+    """Call ``function`` making factories draw values from ``rng``.
+
+    This is a cheaper equivalent of calling ``function`` inside a
+    :func:`use_random` block, except that ``rng`` is not registered with
+    :func:`fork_safe`.
+
+    :param rng: The random number generator to activate.
+    :param function: The function to call.
+    :returns: The value returned by ``function``.
+
+    """
+    token = _active_random.set(rng)
+    try:
+        return function(*args, **kwargs)
+    finally:
+        _active_random.reset(token)
+
+
+@contextmanager
+def seeded(seed: Seed) -> Generator[random.Random, None, None]:
+    """Make factories draw values from a freshly seeded generator.
+
+    Calling factories with the same arguments inside two blocks seeded with
+    the same value returns the same data. The global random state is neither
+    used nor modified.
+
+    :param seed: Any value accepted by :meth:`random.Random.seed`.
+    :returns: A context manager yielding the seeded generator.
+
+    """
+    with use_random(random.Random(seed)) as rng:
+        yield rng
+
+
+def fork_safe(rng: random.Random) -> random.Random:
+    """Reseed ``rng`` in forked child processes, following the fork policy.
+
+    Generators activated by :func:`use_random` or :func:`seeded` and those
+    of :class:`~fauxfactory.Faux` instances are registered automatically.
+
+    :param rng: The random number generator to register.
+    :returns: ``rng``.
+
+    """
+    _fork_counts.setdefault(rng, 0)
+    return rng
+
+
+def set_fork_policy(policy: str) -> str:
+    """Set how generators are reseeded in forked child processes.
+
+    The generators concerned are the global generator and the ones
+    registered with :func:`fork_safe`. The policies are:
+
+    * ``"reseed"`` (the default): every generator is reseeded from a seed
+      derived (with :func:`derive_seed`) from its state in the parent and
+      from the number of times the parent forked since the generator was
+      created (since its state last changed for the global generator).
+      Children get different streams, yet the same ones on every run of a
+      seeded program which forks in the same order.
+    * ``"entropy"``: every generator is reseeded from the operating system
+      randomness source, children streams are not reproducible.
+    * ``"inherit"``: registered generators are left untouched, so children
+      forked from the same state generate the same values. The global
+      generator is still reseeded from the operating system randomness
+      source by the :mod:`random` module itself.
+
+    :param str policy: One of ``"reseed"``, ``"entropy"`` or ``"inherit"``.
+    :returns: The previous policy.
+    :rtype: str
+    :raises: ValueError if ``policy`` is not a valid policy.
+
+    """
+    global _fork_policy
+    if policy not in FORK_POLICIES:
+        raise ValueError(
+            f"{policy!r} is not a valid fork policy. Valid policies are "
+            f"{', '.join(FORK_POLICIES)}."
+        )
+    previous, _fork_policy = _fork_policy, policy
+    return previous
+
+
+def get_fork_policy() -> str:
+    """Return how generators are reseeded in forked child processes."""
+    return _fork_policy
+
+
+def _before_fork() -> None:
+    global _global_forks, _global_state
+    if _fork_policy != FORK_RESEED:
+        return
+    for rng in _fork_counts:
+        _fork_counts[rng] += 1
+    # The random module reseeds its global generator in the child before
+    # this module gets a chance to look at it
+    state = random._inst.getstate()
+    _global_forks = _global_forks + 1 if state == _global_state else 1
+    _global_state = state
+
+
+def _after_fork_in_child() -> None:
+    global _global_forks, _global_state
+    if _fork_policy == FORK_INHERIT:
+        return
+    if _fork_policy == FORK_ENTROPY:
+        for rng in _fork_counts:
+            rng.seed()
+        return
+    for rng, forks in _fork_counts.items():
+        rng.seed(derive_seed(rng.getrandbits(128), "fork", forks))
+        _fork_counts[rng] = 0
+    if _global_state is not None:
+        parent = random.Random()
+        parent.setstate(_global_state)
+        random.seed(derive_seed(parent.getrandbits(128), "fork", _global_forks))
+    _global_forks = 0
+    _global_state = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(before=_before_fork, after_in_child=_after_fork_in_child)
+
+
+def derive_seed(seed: Seed, *path: Seed) -> int:
+    """Derive the seed of an independent stream from a root seed.
+
+    The derived seed is a hash (BLAKE2b) of ``seed`` and ``path``, so it is
+    the same in every process, on every machine and with every Python
+    version, and streams seeded from different paths are unrelated::
+
+        from fauxfactory.rng import derive_seed
+
+        # The same in every worker, whatever the number of workers
+        with seeded(derive_seed(42, "users", chunk_index)):
+            ...
+
+    :param seed: The root seed, any value accepted by
+        :meth:`random.Random.seed` except ``None``.
+    :param path: Values identifying the stream (a shard or chunk index, a
+        name...), of the same types as ``seed``. Values of different
+        types never give the same seed, even ``True`` and ``1``.
+    :returns: A 128-bit seed.
+    :rtype: int
+    :raises: ValueError if ``seed`` or a ``path`` value is ``None`` or not
+        a supported type.
+
+    """
+    digest = hashlib.blake2b(digest_size=16, person=b"fauxfactory")
+    for value in (seed, *path):
+        if isinstance(value, bytes | bytearray):
+            data = b"b" + bytes(value)
+        elif isinstance(value, str):
+            data = b"s" + value.encode()
+        elif isinstance(value, bool):
+            # Tagged apart from integers, True and 1 are different paths
+            data = b"t" + str(int(value)).encode()
+        elif isinstance(value, int):
+            data = b"i" + str(int(value)).encode()
+        elif isinstance(value, float):
+            data = b"f" + repr(value).encode()
+        else:
+            raise ValueError(f"{value!r} cannot be used to derive a seed.")
+        # Prefix every value by its length so that no two paths collide
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return int.from_bytes(digest.digest(), "big")
+
+
+def shard_range(count: int, shard_index: int, shard_count: int) -> range:
+    """Return the part of ``range(count)`` handled by a shard.
+
+    The parts of the ``shard_count`` shards are contiguous, in order and of
+    sizes differing by one at most, so concatenating them gives back
+    ``range(count)``.
+
+    :param int count: The number of items to split.
+    :param int shard_index: The index of the shard, from 0 to
+        ``shard_count - 1``.
+    :param int shard_count: The number of shards.
+    :returns: The indexes of the items of the shard.
+    :rtype: range
+    :raises: ValueError if ``count`` is negative, ``shard_count`` is not a
+        positive integer or ``shard_index`` is out of range.
+
+    """
+    if not isinstance(count, int) or count < 0:
+        raise ValueError(f"Count must be a non-negative integer, got {count}")
+    if not isinstance(shard_count, int) or shard_count < 1:
+        raise ValueError(f"{shard_count} is an invalid shard count.")
+    if not isinstance(shard_index, int) or not 0 <= shard_index < shard_count:
+        raise ValueError(f"{shard_index} is an invalid shard index.")
+    return range(
+        count * shard_index // shard_count, count * (shard_index + 1) // shard_count
+    )
+
+
+def shard_chunks(
+    count: int,
+    chunk_size: int,
+    shard_index: int,
+    shard_count: int,
+    seed: Seed,
+    *path: Seed,
+) -> Iterator[tuple[int, int]]:
+    """Return the seeds and sizes of the chunks of items generated by a shard.
+
+    The ``count`` items are split into chunks of ``chunk_size`` items, the
+    chunks into ``shard_count`` contiguous parts (see :func:`shard_range`)
+    and every chunk gets its own seed, derived from ``seed``, ``path`` and
+    the position of the chunk with :func:`derive_seed`.
+
+    :param int count: The number of items to generate.
+    :param int chunk_size: The number of items of a chunk.
+    :param int shard_index: The index of the shard, from 0 to
+        ``shard_count - 1``.
+    :param int shard_count: The number of shards.
+    :param seed: The root seed, shared by all the shards.
+    :param path: Values identifying the generation, see :func:`derive_seed`.
+    :returns: An iterator over the seed and size of every chunk of the shard.
+    :rtype: iterator
+    :raises: ValueError if ``count`` is negative, ``chunk_size`` or
+        ``shard_count`` are not positive integers or ``shard_index`` is out
+        of range.
+
+    """
+    if not isinstance(chunk_size, int) or chunk_size < 1:
+        raise ValueError(f"{chunk_size} is an invalid chunk size.")
+    if not isinstance(count, int) or count < 0:
+        raise ValueError(f"Count must be a non-negative integer, got {count}")
+    indexes = shard_range(-(-count // chunk_size), shard_index, shard_count)
+    return (
+        (derive_seed(seed, *path, index), min(chunk_size, count - index * chunk_size))
+        for index in indexes
+    )
+
+
+def generate_shard(
+    generate: Callable[[int], list[T]],
+    count: int,
+    shard_index: int = 0,
+    shard_count: int | None = None,
+    *path: Seed,
+    chunk_size: int = SHARD_CHUNK_SIZE,
+) -> Iterator[list[T]]:
+    """Call ``generate(size)`` to generate the items of a shard, by chunks.
+
+    Without ``shard_count``, the ``count`` items are all drawn from the
+    active generator. Otherwise, the chunks of the shard (see
+    :func:`shard_chunks`) are drawn from their own generator, seeded from a
+    root seed drawn from the active generator. Shards sharing the state of
+    their active generator (e.g. seeded alike) put together in order give
+    the items generated with ``shard_count=1``.
+
+    :param generate: The function generating a list of ``size`` items from
+        the active generator.
+    :param int count: The total number of items, for all the shards.
+    :param int shard_index: The index of the shard, from 0 to
+        ``shard_count - 1``.
+    :param int shard_count: The number of shards, if the items are sharded.
+    :param path: Values identifying the generation, see :func:`derive_seed`.
+    :param int chunk_size: The number of items of a chunk.
+    :returns: An iterator over the lists generated by ``generate``.
+    :rtype: iterator
+    :raises: ValueError if the shard is invalid.
+
+    """
+    if shard_count is None:
+        if shard_index != 0:
+            raise ValueError(f"{shard_index} is an invalid shard index.")
+        return (
+            generate(min(chunk_size, count - start))
+            for start in range(0, count, chunk_size)
+        )
+    seed = get_random().getrandbits(64)
+    chunks = shard_chunks(count, chunk_size, shard_index, shard_count, seed, *path)
+    return (
+        call_with_random(random.Random(chunk_seed), generate, size)
+        for chunk_seed, size in chunks
+    )
@@ -0,0 +1,630 @@
+"""Generate values without repeats.
+
+:func:`unique` wraps a factory so that it never returns the same value
+twice::
+
+    from fauxfactory import gen_email, unique
+
+    unique_email = unique(gen_email)
+    emails = [unique_email() for _ in range(10_000)]
+
+The values already returned are tracked in a set until there are
+``threshold`` of them. Past that, they are tracked either in Bloom filters,
+which take a few bytes per value but may reject (never return) a few
+values that were not returned yet, or in an SQLite file on disk, which is
+exact and handles hundreds of millions of values.
+
+Values can also be kept unique across processes, for example across the
+workers of a ``pytest-xdist`` run, with a :class:`UniqueRegistry` stored in
+a file they all share::
+
+    registry = UniqueRegistry(shared_directory / "unique.sqlite")
+    unique_email = unique(gen_email, registry=registry)
+"""
+
+import hashlib
+import math
+import os
+import sqlite3
+import tempfile
+from collections import deque
+from collections.abc import Callable
+from functools import update_wrapper
+from pathlib import Path
+from typing import Any, Generic, TypeVar
+
+from fauxfactory.helpers import is_positive_int
+
+T = TypeVar("T")
+
+
+def _key(value: Any) -> bytes:
+    """Return the bytes identifying ``value`` in the trackers."""
+    if isinstance(value, bytes):
+        return value
+    if isinstance(value, str):
+        return value.encode("utf-8", "surrogatepass")
+    return repr(value).encode("utf-8", "surrogatepass")
+
+
+def _hashes(key: bytes) -> tuple[int, int]:
+    """Return the two hashes the positions of ``key`` in a filter derive from."""
+    digest = hashlib.blake2b(key, digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little")
+
+
+class BloomFilter:
+    """Probabilistic set of byte strings.
+
+    Membership tests never miss a key that was added, but may report a
+    key that was not added as present, with a probability close to
+    ``false_positive_rate`` as long as at most ``capacity`` keys are added.
+
+    :param int capacity: The number of keys the filter is sized for.
+    :param float false_positive_rate: The probability of false positives
+        once ``capacity`` keys are added.
+    """
+
+    __slots__ = ("bits", "capacity", "count", "false_positive_rate", "hashes", "size")
+
+    def __init__(self, capacity: int, false_positive_rate: float) -> None:
+        is_positive_int(capacity)
+        if not 0 < false_positive_rate < 1:
+            raise ValueError(
+                f"{false_positive_rate} is an invalid false positive rate."
+            )
+        self.capacity = capacity
+        self.false_positive_rate = false_positive_rate
+        self.size = max(
+            8, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2)
+        )
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(capacity={self.capacity},"
+            f" false_positive_rate={self.false_positive_rate}, count={self.count})"
+        )
+
+    def __len__(self) -> int:
+        return self.count
+
+    # The positions of a key are derived from two hashes (Kirsch-Mitzenmacher
+    # double hashing), computed once for all the filters of a tracker
+
+    def _contains(self, first: int, second: int) -> bool:
+        bits = self.bits
+        size = self.size
+        second |= 1
+        for index in range(self.hashes):
+            position = (first + index * second) % size
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def _add(self, first: int, second: int) -> bool:
+        bits = self.bits
+        size = self.size
+        second |= 1
+        added = False
+        for index in range(self.hashes):
+            position = (first + index * second) % size
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                bits[position >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def __contains__(self, key: bytes) -> bool:
+        return self._contains(*_hashes(key))
+
+    def add(self, key: bytes) -> bool:
+        """Add a key to the filter.
+
+        :param bytes key: The key to add.
+        :returns: False if the key was (probably) already present.
+        :rtype: bool
+        """
+        return self._add(*_hashes(key))
+
+
+class SqliteSet:
+    """Exact set of byte strings stored in an SQLite database.
+
+    :param path: Path of the database file, emptied when the set is
+        created. By default, a temporary file deleted when the set is
+        closed.
+    """
+
+    __slots__ = ("_connection", "_temporary", "path")
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        self._temporary = None
+        if path is None:
+            self._temporary = tempfile.TemporaryDirectory(prefix="fauxfactory-")
+            path = Path(self._temporary.name) / "unique.sqlite"
+        self.path = Path(path)
+        self._connection = sqlite3.connect(self.path, isolation_level=None)
+        # The data only matters to the running process, durability is not
+        # worth the cost
+        self._connection.execute("PRAGMA journal_mode = OFF")
+        self._connection.execute("PRAGMA synchronous = OFF")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS seen (key BLOB PRIMARY KEY) WITHOUT ROWID"
+        )
+        self._connection.execute("DELETE FROM seen")
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({str(self.path)!r})"
+
+    def __len__(self) -> int:
+        return int(self._connection.execute("SELECT count(*) FROM seen").fetchone()[0])
+
+    def __contains__(self, key: bytes) -> bool:
+        return (
+            self._connection.execute(
+                "SELECT 1 FROM seen WHERE key = ?", (key,)
+            ).fetchone()
+            is not None
+        )
+
+    def add(self, key: bytes) -> bool:
+        """Add a key to the set.
+
+        :param bytes key: The key to add.
+        :returns: False if the key was already present.
+        :rtype: bool
+        """
+        cursor = self._connection.execute(
+            "INSERT OR IGNORE INTO seen (key) VALUES (?)", (key,)
+        )
+        return cursor.rowcount == 1
+
+    def update(self, keys: Any) -> None:
+        """Add several keys to the set at once."""
+        # A single transaction, rather than one per key
+        self._connection.execute("BEGIN")
+        self._connection.executemany(
+            "INSERT OR IGNORE INTO seen (key) VALUES (?)", ((key,) for key in keys)
+        )
+        self._connection.execute("COMMIT")
+
+    def close(self) -> None:
+        """Close the database, removing it if it is temporary."""
+        self._connection.close()
+        if self._temporary is not None:
+            self._temporary.cleanup()
+
+
+class UniqueTracker:
+    """Remember values to detect repeats, with a bounded memory usage.
+
+    Values are kept in a set until there are ``threshold`` of them, then
+    moved to Bloom filters (or to an :class:`SqliteSet` if ``spill`` is
+    set). A Bloom filter is added, twice as large and with half the false
+    positive rate of the previous one, every time the last one is full, so
+    the overall rate of false positives stays below ``false_positive_rate``.
+
+    :param int threshold: Number of values tracked exactly in memory.
+    :param float false_positive_rate: Maximum rate of false positives of
+        the Bloom filters.
+    :param spill: Track the values past ``threshold`` in an SQLite database
+        instead of Bloom filters: ``True`` for a temporary file, or the path
+        of the file.
+    """
+
+    __slots__ = (
+        "_blooms",
+        "_exact",
+        "_spilled",
+        "false_positive_rate",
+        "spill",
+        "threshold",
+    )
+
+    def __init__(
+        self,
+        threshold: int = 1_000_000,
+        false_positive_rate: float = 1e-6,
+        spill: bool | str | Path = False,
+    ) -> None:
+        is_positive_int(threshold)
+        if not 0 < false_positive_rate < 1:
+            raise ValueError(
+                f"{false_positive_rate} is an invalid false positive rate."
+            )
+        self.threshold = threshold
+        self.false_positive_rate = false_positive_rate
+        self.spill = spill
+        self._exact: set[bytes] = set()
+        self._blooms: list[BloomFilter] = []
+        self._spilled: SqliteSet | None = None
+
+    def __len__(self) -> int:
+        if self._spilled is not None:
+            return len(self._spilled)
+        return len(self._exact) + sum(len(bloom) for bloom in self._blooms)
+
+    def add(self, key: bytes) -> bool:
+        """Remember a key.
+
+        :param bytes key: The key to remember.
+        :returns: False if the key was already seen (or, once Bloom filters
+            are used, possibly seen).
+        :rtype: bool
+        """
+        if self._spilled is not None:
+            return self._spilled.add(key)
+        if self._blooms:
+            first, second = _hashes(key)
+            *full, bloom = self._blooms
+            if any(item._contains(first, second) for item in full):
+                return False
+            if bloom.count >= bloom.capacity:
+                if bloom._contains(first, second):
+                    return False
+                bloom = BloomFilter(2 * bloom.capacity, bloom.false_positive_rate / 2)
+                self._blooms.append(bloom)
+            return bloom._add(first, second)
+
+        exact = self._exact
+        if key in exact:
+            return False
+        exact.add(key)
+        if len(exact) >= self.threshold:
+            self._overflow()
+        return True
+
+    def _overflow(self) -> None:
+        """Move the keys out of the exact set."""
+        if self.spill:
+            self._spilled = SqliteSet(None if self.spill is True else self.spill)
+            self._spilled.update(self._exact)
+        else:
+            # Half of the rate for the first filter, which gets twice the
+            # number of keys tracked exactly
+            bloom = BloomFilter(2 * self.threshold, self.false_positive_rate / 2)
+            for key in self._exact:
+                bloom.add(key)
+            self._blooms.append(bloom)
+        self._exact = set()
+
+    def clear(self) -> None:
+        """Forget every key."""
+        self.close()
+        self._exact = set()
+        self._blooms = []
+
+    def close(self) -> None:
+        """Release the SQLite database, if any."""
+        if self._spilled is not None:
+            self._spilled.close()
+            self._spilled = None
+
+
+# Connections of registries inherited from a parent process. They are kept
+# referenced for the lifetime of the child process so that they are never
+# closed by the garbage collector.
+_inherited_connections: list[sqlite3.Connection] = []
+
+
+class UniqueRegistry:
+    """Values reserved by several processes, stored in an SQLite database.
+
+    Every value is reserved by one process at most, in a namespace (usually
+    the name of the factory generating it). Processes reserve values in
+    batches, each batch being a single write transaction, so that they do
+    not wait on each other for every value. The database uses write-ahead
+    logging and can be shared by processes running on the same machine.
+
+    The registry can be shared by forked processes too: each process opens
+    its own connection to the database, and leaves the one inherited from
+    its parent untouched, as SQLite requires.
+
+    :param path: Path of the database file, created if needed. Values
+        reserved by previous runs stay reserved until :meth:`clear` is
+        called.
+    :param float timeout: Seconds to wait for the other processes to
+        release the database before raising an error.
+    """
+
+    __slots__ = ("_connection", "_pid", "path", "timeout")
+
+    def __init__(self, path: str | Path, *, timeout: float = 30.0) -> None:
+        self.path = Path(path)
+        self.timeout = timeout
+        self._connection: sqlite3.Connection | None = None
+        self._pid = 0
+        self._connect()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({str(self.path)!r})"
+
+    def _forget_inherited(self) -> None:
+        """Drop a connection inherited from the parent process, unclosed."""
+        if self._connection is not None and self._pid != os.getpid():
+            # SQLite connections must not be used nor closed across fork():
+            # closing it in the child would release the locks of the parent
+            _inherited_connections.append(self._connection)
+            self._connection = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return the connection of the current process."""
+        self._forget_inherited()
+        if self._connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS reserved ("
+                " namespace TEXT NOT NULL, key BLOB NOT NULL,"
+                " PRIMARY KEY (namespace, key)) WITHOUT ROWID"
+            )
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def reserve(self, namespace: str, keys: list[bytes]) -> list[bool]:
+        """Reserve keys in a single transaction.
+
+        :param str namespace: The namespace of the keys.
+        :param keys: The keys to reserve.
+        :returns: Whether each key was reserved, False for the keys already
+            reserved (including the repeats in ``keys``).
+        :rtype: list[bool]
+        """
+        connection = self._connect()
+        insert = "INSERT OR IGNORE INTO reserved (namespace, key) VALUES (?, ?)"
+        # Take the write lock upfront rather than upgrading a read lock
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            reserved = [
+                connection.execute(insert, (namespace, key)).rowcount == 1
+                for key in keys
+            ]
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+        return reserved
+
+    def count(self, namespace: str | None = None) -> int:
+        """Return the number of values reserved in a namespace, or in all."""
+        connection = self._connect()
+        if namespace is None:
+            row = connection.execute("SELECT count(*) FROM reserved").fetchone()
+        else:
+            row = connection.execute(
+                "SELECT count(*) FROM reserved WHERE namespace = ?", (namespace,)
+            ).fetchone()
+        return int(row[0])
+
+    def clear(self, namespace: str | None = None) -> None:
+        """Release the values reserved in a namespace, or in all of them."""
+        connection = self._connect()
+        if namespace is None:
+            connection.execute("DELETE FROM reserved")
+        else:
+            connection.execute("DELETE FROM reserved WHERE namespace = ?", (namespace,))
+
+    def close(self) -> None:
+        """Close the connection of the current process."""
+        self._forget_inherited()
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+# Type parameter syntax is not available on Python 3.10
+class UniqueFactory(Generic[T]):  # noqa: UP046
+    """Factory wrapper never returning the same value twice.
+
+    Instances are created by :func:`unique`.
+
+    :param factory: The wrapped factory.
+    :param int max_tries: Number of values generated in a row without
+        finding a new one before giving up.
+    :param tracker: The tracker of the values already returned.
+    """
+
+    __slots__ = ("__dict__", "factory", "max_tries", "tracker")
+
+    def __init__(
+        self, factory: Callable[..., T], max_tries: int, tracker: UniqueTracker
+    ) -> None:
+        self.factory = factory
+        self.max_tries = max_tries
+        self.tracker = tracker
+        update_wrapper(self, factory)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.factory!r})"
+
+    def __call__(self, *args: Any, **kwargs: Any) -> T:
+        factory = self.factory
+        add = self.tracker.add
+        for _ in range(self.max_tries):
+            value = factory(*args, **kwargs)
+            if add(_key(value)):
+                return value
+        name = getattr(factory, "__name__", repr(factory))
+        raise ValueError(
+            f"{name} did not generate a new unique value in {self.max_tries} tries"
+            f" after {len(self.tracker)} unique values: the values it can"
+            " generate with these arguments are probably exhausted."
+        )
+
+    def clear(self) -> None:
+        """Forget the values returned so far, starting a new scope."""
+        self.tracker.clear()
+
+    def close(self) -> None:
+        """Release the resources of the tracker (its SQLite database)."""
+        self.tracker.close()
+
+
+class SharedUniqueFactory(UniqueFactory[T]):
+    """Factory wrapper never returning a value reserved in a registry.
+
+    Instances are created by :func:`unique` when given a ``registry``.
+    Values are generated ``batch_size`` at a time (for each set of
+    arguments the factory is called with) and reserved at once, then
+    returned one by one.
+
+    :param factory: The wrapped factory.
+    :param int max_tries: Number of batches generated in a row without
+        reserving a new value before giving up.
+    :param registry: The registry the values are reserved in.
+    :param str namespace: The namespace of the values in the registry.
+    :param int batch_size: Number of values reserved at once.
+    """
+
+    __slots__ = ("_reserved", "batch_size", "namespace", "registry")
+
+    def __init__(
+        self,
+        factory: Callable[..., T],
+        max_tries: int,
+        registry: UniqueRegistry,
+        namespace: str,
+        batch_size: int,
+    ) -> None:
+        update_wrapper(self, factory)
+        self.factory = factory
+        self.max_tries = max_tries
+        self.registry = registry
+        self.namespace = namespace
+        self.batch_size = batch_size
+        self._reserved: dict[str, deque[T]] = {}
+
+    def __call__(self, *args: Any, **kwargs: Any) -> T:
+        call = repr((args, sorted(kwargs.items())))
+        reserved = self._reserved.setdefault(call, deque())
+        if not reserved:
+            self._reserve(reserved, args, kwargs)
+        return reserved.popleft()
+
+    def _reserve(self, reserved: "deque[T]", args: Any, kwargs: Any) -> None:
+        """Reserve a batch of new values generated with the given arguments."""
+        factory = self.factory
+        registry = self.registry
+        # Processes generating the same values (e.g. seeded alike) only
+        # reserve them once the others are behind, so batches are counted
+        # as tries rather than values
+        for _ in range(self.max_tries):
+            values = [factory(*args, **kwargs) for _ in range(self.batch_size)]
+            keys = [_key(value) for value in values]
+            for value, new in zip(
+                values, registry.reserve(self.namespace, keys), strict=True
+            ):
+                if new:
+                    reserved.append(value)
+            if reserved:
+                return
+        raise ValueError(
+            f"{self.namespace} did not generate a new unique value in"
+            f" {self.max_tries} batches of {self.batch_size} after {registry.count(self.namespace)}"
+            " unique values: the values it can generate with these arguments"
+            " are probably exhausted."
+        )
+
+    def clear(self) -> None:
+        """Release the values of the namespace in the registry.
+
+        Values reserved by other processes in the same namespace are
+        released as well.
+        """
+        self._reserved.clear()
+        self.registry.clear(self.namespace)
+
+    def close(self) -> None:
+        """Close the connection of the registry."""
+        self.registry.close()
+
+
+def unique(
+    factory: Callable[..., T],
+    *,
+    max_tries: int = 100,
+    threshold: int = 1_000_000,
+    false_positive_rate: float = 1e-6,
+    spill: bool | str | Path = False,
+    registry: UniqueRegistry | None = None,
+    namespace: str | None = None,
+    batch_size: int = 100,
+) -> UniqueFactory[T]:
+    """Wrap a factory so that it never returns the same value twice.
+
+    The wrapper takes the same arguments as ``factory`` and generates
+    values until one was not returned yet. The values returned are
+    remembered exactly in a set, up to ``threshold`` values. Past that, they
+    are remembered in Bloom filters taking about 4 bytes per value at the
+    default ``false_positive_rate``: returned values are still never
+    repeated, but about ``false_positive_rate`` of the new values are
+    mistaken for repeats and skipped. With ``spill``, they are remembered
+    exactly in an SQLite database on disk instead.
+
+    With a ``registry``, values are unique across all the processes
+    sharing it instead: they are generated and reserved ``batch_size`` at
+    a time, then returned one by one, and ``threshold``,
+    ``false_positive_rate`` and ``spill`` are not used.
+
+    Values are compared by their string representation (``repr`` for
+    values other than ``str`` and ``bytes``).
+
+    :param factory: The factory, e.g. ``gen_email``.
+    :param int max_tries: Number of values generated in a row without
+        finding a new one before raising an error. With a ``registry``,
+        number of batches generated in a row without reserving a new value.
+    :param int threshold: Number of values remembered exactly in memory.
+    :param float false_positive_rate: Rate of new values mistaken for
+        repeats once Bloom filters are used.
+    :param spill: Remember the values past ``threshold`` in an SQLite
+        database: ``True`` for a temporary file, or the path of the file.
+    :param registry: Reserve the values in this registry, shared with
+        other processes.
+    :param str namespace: Namespace of the values in the registry, the
+        name of ``factory`` by default. Factories sharing a namespace never
+        return the same value.
+    :param int batch_size: Number of values reserved at once in the
+        registry.
+    :returns: The wrapped factory. Its ``clear()`` method forgets the
+        values returned so far.
+    :rtype: UniqueFactory
+    :raises: ValueError if an argument is invalid. The wrapped factory
+        raises ValueError when it cannot generate a new value in
+        ``max_tries`` tries, which happens when the values it can generate
+        are exhausted.
+
+    Example::
+
+        from fauxfactory import gen_integer, unique
+
+        dice = unique(gen_integer)
+        [dice(1, 6) for _ in range(6)]  # 1 to 6, in a random order
+        dice(1, 6)  # ValueError: ... probably exhausted.
+
+        # In a conftest.py, emails unique across the pytest-xdist workers
+        @pytest.fixture(scope="session")
+        def unique_email(tmp_path_factory):
+            shared = tmp_path_factory.getbasetemp().parent
+            return unique(gen_email, registry=UniqueRegistry(shared / "unique.db"))
+
+    """
+    if not callable(factory):
+        raise ValueError(f"{factory!r} is not callable.")
+    is_positive_int(max_tries)
+    if registry is not None:
+        is_positive_int(batch_size)
+        if namespace is None:
+            namespace = getattr(factory, "__name__", repr(factory))
+        return SharedUniqueFactory(factory, max_tries, registry, namespace, batch_size)
+    return UniqueFactory(
+        factory, max_tries, UniqueTracker(threshold, false_positive_rate, spill)
+    )
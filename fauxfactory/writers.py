@@ -0,0 +1,250 @@
+"""Stream records generated from schemas to files."""
+
+import csv
+import json
+import os
+from collections.abc import Generator
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+from typing import IO, Any
+
+from fauxfactory.factories.structures import compile_fields, compile_schema
+from fauxfactory.factories.systems import gen_fleet
+from fauxfactory.helpers import is_positive_int
+from fauxfactory.rng import generate_shard
+
+# Either a path or an already opened text file (anything with a write method)
+Output = str | os.PathLike[str] | IO[str]
+
+
+@contextmanager
+def _open_output(output: Output) -> Generator[IO[str], None, None]:
+    """Open ``output`` for writing if it is a path, use it as-is otherwise."""
+    if isinstance(output, (str, os.PathLike)):
+        with Path(output).open("w", encoding="utf-8", newline="") as handler:
+            yield handler
+    else:
+        yield output
+
+
+def _check_count(count: int) -> None:
+    """Make sure ``count`` is a valid number of records."""
+    if not isinstance(count, int) or count < 0:
+        raise ValueError(f"Count must be a non-negative integer, got {count}")
+
+
+def write_ndjson(
+    schema: dict[str, Any],
+    count: int,
+    output: Output,
+    *,
+    chunk_size: int = 1000,
+    shard_index: int = 0,
+    shard_count: int | None = None,
+    list_sizes: dict[str, int] | None = None,
+    max_depth: int = 10,
+) -> int:
+    """Write records generated from a schema as newline delimited JSON.
+
+    Records are generated and serialized ``chunk_size`` at a time and each
+    chunk is handed over to a single ``write`` call, so memory usage is
+    bounded by the chunk size no matter how many records are written.
+
+    With ``shard_count``, only the records of the shard ``shard_index`` are
+    written, every chunk being generated from its own seed as by
+    :func:`~fauxfactory.factories.structures.parallel_generate`. Files
+    written by shards whose active generators are seeded alike, put
+    together in order, are the file written with ``shard_count=1``.
+
+    :param schema: Schema definition (same format as
+        :func:`~fauxfactory.factories.structures.gen_dict`)
+    :param int count: Number of records to write.
+    :param output: Path of the file to create, or any text file object
+        opened for writing (which is left open).
+    :param int chunk_size: Number of records generated and written at once.
+        It must be the same for all the shards.
+    :param int shard_index: Index of the shard, from 0 to
+        ``shard_count - 1``.
+    :param int shard_count: Number of shards the records are split into.
+    :param list_sizes: Dictionary mapping field paths to list sizes
+    :param max_depth: Maximum recursion depth to prevent infinite loops
+    :returns: The number of records written.
+    :rtype: int
+    :raises: ValueError if ``count``, ``chunk_size`` or the shard are
+        invalid or if the schema is invalid.
+
+    Example::
+
+        from fauxfactory import gen_alpha, gen_email
+        from fauxfactory.writers import write_ndjson
+
+        write_ndjson({'name': gen_alpha, 'email': gen_email}, 10**6, 'users.jsonl')
+
+    """
+    _check_count(count)
+    is_positive_int(chunk_size)
+    plan = compile_schema(schema, list_sizes=list_sizes, max_depth=max_depth)
+    encode = json.JSONEncoder().encode
+
+    chunks = generate_shard(
+        plan.generate_many,
+        count,
+        shard_index,
+        shard_count,
+        "parallel",
+        chunk_size=chunk_size,
+    )
+
+    written = 0
+    with _open_output(output) as handler:
+        for records in chunks:
+            handler.write("".join([f"{encode(record)}\n" for record in records]))
+            written += len(records)
+    return written
+
+
+def write_csv(
+    schema: dict[str, Any],
+    count: int,
+    output: Output,
+    *,
+    chunk_size: int = 1000,
+    shard_index: int = 0,
+    shard_count: int | None = None,
+    header: bool = True,
+    flatten: bool = False,
+    list_sizes: dict[str, int] | None = None,
+    max_depth: int = 10,
+) -> int:
+    """Write records generated from a flat schema as CSV rows.
+
+    Columns follow the order of the fields in the schema. Rows are generated
+    directly (no intermediate dictionary is built) and handed over to
+    :meth:`csv.writer.writerows` ``chunk_size`` at a time, so memory usage is
+    bounded by the chunk size no matter how many rows are written.
+
+    With ``shard_count``, only the rows of the shard ``shard_index`` are
+    written, every chunk being generated from its own seed (see
+    :func:`fauxfactory.rng.generate_shard`). Files written by shards whose
+    active generators are seeded alike, put together in order (with the
+    header of the first one only), are the file written with
+    ``shard_count=1``.
+
+    :param schema: Schema definition (same format as
+        :func:`~fauxfactory.factories.structures.gen_dict`). Fields must not
+        be nested dictionaries unless ``flatten`` is True. Any other non
+        scalar value is written as its ``str()`` representation.
+    :param int count: Number of rows to write.
+    :param output: Path of the file to create, or any text file object
+        opened for writing with ``newline=''`` (which is left open).
+    :param int chunk_size: Number of rows generated and written at once.
+        It must be the same for all the shards.
+    :param int shard_index: Index of the shard, from 0 to
+        ``shard_count - 1``.
+    :param int shard_count: Number of shards the rows are split into.
+    :param bool header: Write the column names as the first row.
+    :param bool flatten: Turn the fields of nested dictionaries into columns
+        named after their dotted path (e.g. ``'user.email'``).
+    :param list_sizes: Dictionary mapping field paths to list sizes
+    :param max_depth: Maximum recursion depth to prevent infinite loops
+    :returns: The number of rows written, not counting the header.
+    :rtype: int
+    :raises: ValueError if ``count``, ``chunk_size`` or the shard are
+        invalid or if the schema is invalid.
+
+    Example::
+
+        from fauxfactory import gen_alpha, gen_email
+        from fauxfactory.writers import write_csv
+
+        write_csv(
+            {'name': gen_alpha, 'contact': {'email': gen_email}},
+            10**6,
+            'users.csv',
+            flatten=True,
+        )
+
+    """
+    _check_count(count)
+    is_positive_int(chunk_size)
+    fields = compile_fields(
+        schema, list_sizes=list_sizes, max_depth=max_depth, flatten=flatten
+    )
+    builders = tuple(fields.values())
+
+    def generate_rows(size: int) -> list[list[Any]]:
+        return [[build() for build in builders] for _ in range(size)]
+
+    chunks = generate_shard(
+        generate_rows, count, shard_index, shard_count, "csv", chunk_size=chunk_size
+    )
+
+    written = 0
+    with _open_output(output) as handler:
+        writer = csv.writer(handler)
+        if header:
+            writer.writerow(fields)
+        for rows in chunks:
+            writer.writerows(rows)
+            written += len(rows)
+    return written
+
+
+def write_fleet(
+    count: int,
+    output: Output,
+    *,
+    per_host: bool = False,
+    chunk_size: int = 1000,
+    **options: Any,
+) -> int:
+    """Write the system facts of a fleet of hosts.
+
+    Hosts are generated by :func:`~fauxfactory.factories.systems.gen_fleet`
+    and written as they come, either as newline delimited JSON (one host per
+    line) or as one JSON file per host.
+
+    :param int count: Number of hosts in the fleet.
+    :param output: Path of the file to create, or any text file object
+        opened for writing (which is left open). If ``per_host`` is True,
+        path of the directory to write the files to, which is created if
+        needed.
+    :param bool per_host: Write every host to its own file, named after its
+        FQDN (e.g. ``'host.example.com.json'``).
+    :param int chunk_size: Number of hosts generated and written at once.
+        It is passed on to
+        :func:`~fauxfactory.factories.systems.gen_fleet`, whose output
+        depends on it for a given ``seed``.
+    :param options: Any other keyword argument accepted by
+        :func:`~fauxfactory.factories.systems.gen_fleet`. Fleets cannot be
+        sharded, see :func:`~fauxfactory.factories.systems.gen_fleet`.
+    :returns: The number of hosts written.
+    :rtype: int
+    :raises: ValueError if ``count`` or ``chunk_size`` are invalid, or if
+        ``per_host`` is True and ``output`` is not a path.
+
+    Example::
+
+        from fauxfactory.writers import write_fleet
+
+        write_fleet(100_000, 'fleet.jsonl', domain='example.com', seed=42)
+
+    """
+    hosts = gen_fleet(count, chunk_size=chunk_size, **options)
+    encode = json.JSONEncoder().encode
+
+    if per_host:
+        if not isinstance(output, (str, os.PathLike)):
+            raise ValueError("Output must be a directory path when per_host is True")
+        directory = Path(output)
+        directory.mkdir(parents=True, exist_ok=True)
+        for host in hosts:
+            path = directory / f"{host['fqdn']}.json"
+            path.write_text(encode(host), encoding="utf-8")
+        return count
+
+    with _open_output(output) as handler:
+        while chunk := list(islice(hosts, chunk_size)):
+            handler.write("".join([f"{encode(host)}\n" for host in chunk]))
+    return count
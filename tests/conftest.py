@@ -0,0 +1,12 @@
+"""Shared fixtures of the test suite."""
+
+import pytest
+
+
+@pytest.fixture(autouse=True, scope="session")
+def cache_dir(tmp_path_factory):
+    """Keep the disk caches of the test session out of the home directory."""
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        path = tmp_path_factory.mktemp("cache")
+        monkeypatch.setenv("FAUXFACTORY_CACHE_DIR", str(path))
+        yield path
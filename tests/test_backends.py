@@ -0,0 +1,201 @@
+"""Tests for the random number generator backends."""
+
+import multiprocessing
+import random
+import threading
+import timeit
+from functools import partial
+
+import pytest
+
+import fauxfactory.backends
+from fauxfactory import BufferedSystemRandom, Faux, NumpyRandom, gen_alpha
+from fauxfactory.backends import BufferedRandom, random_integers
+from fauxfactory.rng import use_random
+
+fork = pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="fork is not available",
+)
+
+
+def sample(source):
+    """Generate a few values with every kind of underlying random call."""
+    return [
+        source.gen_alpha(20),
+        source.gen_utf8(5),
+        source.gen_integer(0, 1000),
+        source.gen_ipaddr(ipv6=True),
+        source.gen_mac(),
+        source.gen_time(),
+        source.gen_uuid(),
+        source.gen_choice(range(1000)),
+        source.gen_from_template("{int:0:9}-{ipv4}"),
+    ]
+
+
+@pytest.mark.parametrize("buffer_size", [1, 8, 100, 4096])
+def test_buffered_system_random(buffer_size):
+    """Values are drawn from the buffer, refilled when empty."""
+    rng = BufferedSystemRandom(buffer_size=buffer_size)
+    floats = [rng.random() for _ in range(1000)]
+    assert all(0.0 <= value < 1.0 for value in floats)
+    assert len(set(floats)) == 1000
+    assert rng.getrandbits(0) == 0
+    for bits in (1, 7, 64, 65, 130):
+        values = [rng.getrandbits(bits) for _ in range(200)]
+        assert all(0 <= value < 2**bits for value in values)
+        assert max(values).bit_length() == bits
+    assert len(rng.randbytes(0)) == 0
+    assert len(rng.randbytes(5000)) == 5000
+    assert {rng.randint(1, 6) for _ in range(200)} == {1, 2, 3, 4, 5, 6}
+    assert sorted(rng.sample(range(10), 10)) == list(range(10))
+
+
+def best_time(function, argument):
+    """Return the shortest of three timings of ``function(argument)``."""
+    return min(timeit.repeat(partial(function, argument), number=1, repeat=3))
+
+
+def test_buffered_system_random_large_values():
+    """Large values take about as long as with random.SystemRandom.
+
+    They are read in one block, building them word by word is quadratic.
+    """
+    rng = BufferedSystemRandom()
+    system = random.SystemRandom()
+    size = 4 * 10**6
+    for method, argument in (("randbytes", size), ("getrandbits", size * 8)):
+        reference = best_time(getattr(system, method), argument)
+        duration = best_time(getattr(rng, method), argument)
+        assert duration < 10 * reference + 0.05
+    assert len(rng.randbytes(size)) == size
+    assert rng.getrandbits(size * 8).bit_length() > size * 8 - 64
+    with use_random(rng):
+        assert len(gen_alpha(10**6)) == 10**6
+
+
+def test_buffered_system_random_invalid():
+    """Invalid arguments are rejected and there is no state to save."""
+    with pytest.raises(ValueError):
+        BufferedSystemRandom().getrandbits(-1)
+    with pytest.raises(ValueError):
+        BufferedSystemRandom().randbytes(-1)
+    for buffer_size in (0, -1, 1.5):
+        with pytest.raises(ValueError):
+            BufferedSystemRandom(buffer_size=buffer_size)
+    rng = BufferedSystemRandom()
+    with pytest.raises(NotImplementedError):
+        rng.getstate()
+    with pytest.raises(NotImplementedError):
+        rng.setstate(None)
+
+
+def test_buffered_system_random_factories():
+    """Factories draw from the backend when it is activated."""
+    rng = BufferedSystemRandom()
+    with use_random(rng):
+        first = sample(fauxfactory)
+    second = sample(Faux(rng=rng))
+    assert first != second
+
+
+def test_buffered_system_random_threads():
+    """Threads sharing a generator never get the same words."""
+    rng = BufferedSystemRandom(buffer_size=64)
+    results = [[] for _ in range(4)]
+
+    def worker(values):
+        values.extend(rng.getrandbits(64) for _ in range(5000))
+
+    threads = [threading.Thread(target=worker, args=(values,)) for values in results]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({value for values in results for value in values}) == 20000
+
+
+def _child_values(queue, rng):
+    queue.put([rng.getrandbits(64) for _ in range(10)])
+
+
+@fork
+def test_buffered_system_random_fork():
+    """Forked children do not reuse the buffered words of their parent."""
+    rng = BufferedSystemRandom()
+    rng.random()
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    processes = [
+        context.Process(target=_child_values, args=(queue, rng)) for _ in range(2)
+    ]
+    for process in processes:
+        process.start()
+    values = [queue.get(timeout=30) for _ in processes]
+    for process in processes:
+        process.join()
+    values.append([rng.getrandbits(64) for _ in range(10)])
+    assert len({value for words in values for value in words}) == 30
+
+
+def test_buffered_random_abstract():
+    """Subclasses must implement _fill to be instantiated."""
+
+    class Incomplete(BufferedRandom):
+        pass
+
+    class Zeros(BufferedRandom):
+        def _fill(self, size):
+            return bytes(size)
+
+    for cls in (BufferedRandom, Incomplete):
+        with pytest.raises(TypeError, match="_fill"):
+            cls()
+    rng = Zeros(buffer_size=16)
+    assert rng.random() == 0.0
+    assert rng.randbytes(20) == bytes(20)
+
+
+def test_random_integers():
+    """Bulk integers fall back to randint without an integers method."""
+    rng = random.Random(3)
+    values = random_integers(rng, -5, 5, 1000)
+    rng.seed(3)
+    assert values == [rng.randint(-5, 5) for _ in range(1000)]
+    assert set(values) == set(range(-5, 6))
+    assert random_integers(BufferedSystemRandom(), 7, 7, 3) == [7, 7, 7]
+
+
+def test_numpy_random_missing(monkeypatch):
+    """A clear error is raised when NumPy is not installed."""
+
+    def import_module(name):
+        raise ImportError(name)
+
+    monkeypatch.setattr(fauxfactory.backends, "import_module", import_module)
+    with pytest.raises(ImportError, match="NumPy"):
+        NumpyRandom()
+
+
+def test_numpy_random():
+    """The NumPy backend is reproducible and generates bulk integers."""
+    pytest.importorskip("numpy")
+    first = NumpyRandom(42)
+    assert sample(Faux(rng=first)) == sample(Faux(rng=NumpyRandom(42)))
+    assert sample(Faux(rng=NumpyRandom("42"))) != sample(Faux(rng=NumpyRandom(42)))
+    state = first.getstate()
+    values = [first.random() for _ in range(1000)], first.integers(0, 9, 100)
+    first.setstate(state)
+    assert values == ([first.random() for _ in range(1000)], first.integers(0, 9, 100))
+    assert set(first.integers(-3, 3, 1000)) == set(range(-3, 4))
+    assert set(random_integers(first, 0, 2**70, 100)) <= set(range(2**70 + 1))
+    with pytest.raises(ValueError):
+        first.integers(1, 0, 10)
+
+
+def test_backends_gen_alpha():
+    """Every backend generates valid strings."""
+    for rng in (random.Random(1), BufferedSystemRandom()):
+        with use_random(rng):
+            assert gen_alpha(12).isalpha()
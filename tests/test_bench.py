@@ -0,0 +1,138 @@
+"""Tests for the benchmark reports comparison."""
+
+import json
+
+import pytest
+
+from fauxfactory.bench import (
+    IMPROVEMENT,
+    INCONCLUSIVE,
+    REGRESSION,
+    REPORT_FORMAT,
+    UNCHANGED,
+    Comparison,
+    compare,
+    load_report,
+    main,
+    merge_reports,
+    t_quantile,
+)
+
+
+def make_report(**rounds: list[float]):
+    """Return a report with the given rounds throughput per case."""
+    return {
+        "format": REPORT_FORMAT,
+        "fauxfactory": "test",
+        "results": {
+            name: {
+                "rounds": values,
+                "ops_per_sec": sorted(values)[len(values) // 2],
+                "samples": 10,
+                "p50_ns": 100,
+                "p99_ns": 200,
+                "peak_bytes": 64,
+            }
+            for name, values in rounds.items()
+        },
+    }
+
+
+@pytest.mark.parametrize(
+    ("df", "expected"), [(2, 4.303), (4, 2.776), (10, 2.228), (30, 2.042)]
+)
+def test_t_quantile(df, expected):
+    """The t distribution quantiles match the tables."""
+    assert t_quantile(0.975, df) == pytest.approx(expected, rel=0.01)
+
+
+@pytest.mark.parametrize(
+    ("old", "new", "status"),
+    [
+        ([100, 101, 99, 100], [80, 81, 79, 80], REGRESSION),
+        ([100, 101, 99, 100], [120, 121, 119, 120], IMPROVEMENT),
+        ([100, 101, 99, 100], [100, 99, 101, 100], UNCHANGED),
+        ([100, 101, 99, 100], [97, 98, 96, 97], UNCHANGED),
+        ([100, 150, 60, 100], [80, 120, 50, 85], INCONCLUSIVE),
+    ],
+)
+def test_comparison_status(old, new, status):
+    """Cases are only flagged when the whole interval is beyond zero."""
+    comparison = Comparison("case", old, new, threshold=0.05)
+    assert comparison.status == status
+    assert comparison.low <= comparison.change <= comparison.high
+
+
+def test_comparison_single_round():
+    """Without repeated rounds the change is compared to the threshold."""
+    comparison = Comparison("case", [100], [90])
+    assert comparison.change == pytest.approx(-0.1)
+    assert comparison.low == comparison.high == comparison.change
+    assert comparison.status == REGRESSION
+
+
+def test_compare_sorted_by_change():
+    """Comparisons are sorted by change and missing cases reported."""
+    old = make_report(a=[100, 100], b=[100, 100], gone=[1, 1])
+    new = make_report(a=[150, 150], b=[50, 50], added=[1, 1])
+    comparisons, removed, added = compare(old, new)
+    assert [item.name for item in comparisons] == ["b", "a"]
+    assert removed == ["gone"]
+    assert added == ["added"]
+    comparisons, _, _ = compare(old, new, pattern="^a")
+    assert [item.name for item in comparisons] == ["a"]
+
+
+def test_merge_reports():
+    """Merging reports pools the rounds of every case."""
+    merged = merge_reports(
+        [make_report(a=[1, 2], b=[5]), make_report(a=[3]), make_report(a=[4])]
+    )
+    assert merged["runs"] == 3
+    assert merged["results"]["a"]["rounds"] == [1, 2, 3, 4]
+    assert merged["results"]["a"]["samples"] == 30
+    assert merged["results"]["b"]["rounds"] == [5]
+    with pytest.raises(ValueError):
+        merge_reports([])
+
+
+def test_load_report_invalid(tmp_path):
+    """Files which are not benchmark reports are rejected."""
+    path = tmp_path / "report.json"
+    for content in ("not json", "[]", '{"results": {}}'):
+        path.write_text(content)
+        with pytest.raises(ValueError):
+            load_report(path)
+
+
+def write(path, report):
+    """Write a report as JSON and return its path as a string."""
+    path.write_text(json.dumps(report))
+    return str(path)
+
+
+def test_main_compare(tmp_path, capsys):
+    """Regressions make the comparison fail."""
+    old = write(tmp_path / "old.json", make_report(a=[100, 101], b=[100, 99]))
+    new = write(tmp_path / "new.json", make_report(a=[60, 61], b=[100, 101]))
+    assert main(["compare", old, new]) == 1
+    output = capsys.readouterr().out
+    assert output.index("a ") < output.index("b ")
+    assert "1 regression(s) above 5%" in output
+    assert main(["compare", old, new, "--threshold", "50"]) == 0
+    assert main(["compare", old, new, "-k", "b"]) == 0
+
+
+def test_main_merge(tmp_path, capsys):
+    """Reports of repeated runs can be merged."""
+    first = write(tmp_path / "1.json", make_report(a=[100]))
+    second = write(tmp_path / "2.json", make_report(a=[110]))
+    output = tmp_path / "merged.json"
+    assert main(["merge", first, second, "-o", str(output)]) == 0
+    assert load_report(output)["results"]["a"]["rounds"] == [100, 110]
+
+
+def test_main_error(tmp_path, capsys):
+    """Invalid reports are reported as errors."""
+    assert main(["compare", str(tmp_path / "a"), str(tmp_path / "b")]) == 2
+    assert "error:" in capsys.readouterr().err
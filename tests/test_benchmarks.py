@@ -0,0 +1,62 @@
+"""Tests for the benchmark suite."""
+
+import json
+
+import fauxfactory
+from benchmarks.__main__ import main
+from benchmarks.cases import Case, all_cases
+from benchmarks.harness import measure, percentile
+
+OPTIONS = {"rounds": 2, "round_time": 0.001, "max_samples": 10}
+
+
+def test_every_factory_has_cases():
+    """Every exported factory is benchmarked."""
+    factories = {name for name in fauxfactory.__all__ if name.startswith("gen_")}
+    cases = all_cases()
+    assert {case.factory for case in cases} == factories
+    assert len({case.name for case in cases}) == len(cases)
+
+
+def test_cases_run():
+    """Every case calls its factory successfully."""
+    for case in all_cases():
+        with fauxfactory.seeded(0):
+            case.call()
+
+
+def test_measure():
+    """Measuring a case reports its throughput, latencies and allocations."""
+    result = measure(Case("gen_alpha", "default", fauxfactory.gen_alpha), **OPTIONS)
+    assert result["factory"] == "gen_alpha"
+    assert len(result["rounds"]) == 2
+    assert result["ops_per_sec"] > 0
+    assert 0 <= result["p50_ns"] <= result["p99_ns"]
+    assert result["samples"] == 10
+    assert result["peak_bytes"] > 0
+
+
+def test_percentile():
+    """Percentiles are picked out of the sorted values."""
+    values = list(range(100, 0, -1))
+    assert percentile(values, 0.5) == 51
+    assert percentile(values, 0.99) == 100
+    assert percentile([7], 0.99) == 7
+
+
+def test_main_json(tmp_path, capsys):
+    """Results can be saved as JSON."""
+    path = tmp_path / "results.json"
+    args = ["-k", r"gen_boolean\[", "-k", "^gen_uuid", "-o", str(path)]
+    args += ["--rounds", "2", "--round-time", "0.001", "--max-samples", "10"]
+    assert main(args) == 0
+    report = json.loads(path.read_text())
+    assert set(report["results"]) == {"gen_boolean[default]", "gen_uuid[default]"}
+    assert report["options"]["rounds"] == 2
+    assert "gen_uuid[default]" in capsys.readouterr().out
+
+
+def test_main_no_case(capsys):
+    """Filters matching no case are reported."""
+    assert main(["-k", "no such factory"]) == 1
+    assert "No benchmark case" in capsys.readouterr().err
@@ -1,10 +1,18 @@
 """Tests related to generator validation methods."""
 
+import logging
+from itertools import cycle
 from unittest import mock
 
 import pytest
 
-from fauxfactory.helpers import check_validation
+from fauxfactory import gen_string_many
+from fauxfactory.helpers import (
+    check_validation,
+    log_rejections,
+    reset_validation_stats,
+    validation_stats,
+)
 
 # pylint: disable=invalid-name
 # pylint: disable=E1123
@@ -58,3 +66,69 @@ def test_callable():
         == "not a number"
     )
     my_callable.assert_called_once_with("not a number")
+
+
+@pytest.fixture
+def stats():
+    """Start from empty validation statistics and stop logging rejections."""
+    reset_validation_stats()
+    yield
+    log_rejections(None)
+    reset_validation_stats()
+
+
+@pytest.mark.usefixtures("stats")
+def test_validation_stats():
+    """Attempts, rejections and exhausted tries are counted per function."""
+    answers = cycle([False, False, True])
+    decorated_f(validator=lambda _: next(answers), default="default")
+    decorated_f(validator=r"\d", default="default", tries=4)
+    decorated_f()
+    stats = validation_stats()["decorated_f"]
+    assert stats["calls"] == 2
+    assert stats["attempts"] == 7
+    assert stats["rejections"] == 6
+    assert stats["exhausted"] == 1
+    assert stats["rejection_ratio"] == pytest.approx(6 / 7)
+    assert stats["validator_ns"] > 0
+    reset_validation_stats()
+    assert "decorated_f" not in validation_stats()
+
+
+@pytest.mark.usefixtures("stats")
+def test_validation_stats_gen_string_many():
+    """Strings validated by gen_string_many are counted."""
+    answers = cycle([False, True])
+    gen_string_many(
+        "alpha", 10, validator=lambda _: next(answers), default="x", tries=2
+    )
+    stats = validation_stats()["gen_string_many"]
+    assert stats["calls"] == 1
+    assert stats["attempts"] == 15
+    assert stats["rejections"] == 8
+    assert stats["exhausted"] == 3
+
+
+@pytest.mark.usefixtures("stats")
+def test_log_rejections(caplog):
+    """High rejection ratios are logged once."""
+    caplog.set_level(logging.WARNING, logger="fauxfactory")
+    log_rejections(0.9, min_attempts=20)
+    for _ in range(3):
+        decorated_f(validator=r"\d", default="default")
+    messages = [record.getMessage() for record in caplog.records]
+    assert messages == [
+        "The validator of decorated_f rejected 100.0% of 20 generated values, "
+        "2 of them replaced by the default value"
+    ]
+
+
+@pytest.mark.usefixtures("stats")
+def test_log_rejections_below_threshold(caplog):
+    """Rejection ratios below the threshold are not logged."""
+    caplog.set_level(logging.WARNING, logger="fauxfactory")
+    log_rejections(0.9, min_attempts=1)
+    answers = cycle([False, True])
+    for _ in range(10):
+        decorated_f(validator=lambda _: next(answers), default="default")
+    assert not caplog.records
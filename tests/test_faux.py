@@ -0,0 +1,315 @@
+"""Tests for the instance based access to factories and seeded generators."""
+
+import multiprocessing
+import random
+import threading
+
+import pytest
+
+import fauxfactory
+from fauxfactory import Faux, gen_alpha, gen_dict, gen_integer, gen_uuid, seeded
+from fauxfactory.rng import (
+    derive_seed,
+    generate_shard,
+    get_fork_policy,
+    get_random,
+    set_fork_policy,
+    shard_chunks,
+    shard_range,
+    use_random,
+)
+
+
+def sample(source):
+    """Generate a few values with every kind of underlying random call."""
+    return [
+        source.gen_alpha(20),
+        source.gen_utf8(5),
+        source.gen_cjk(5),
+        source.gen_integer(0, 1000),
+        source.gen_ipaddr(ipv6=True),
+        source.gen_mac(),
+        source.gen_time(),
+        source.gen_uuid(),
+        source.gen_choice(range(1000)),
+    ]
+
+
+def test_faux_exposes_every_factory():
+    """All factories are available as methods."""
+    faux = Faux()
+    for name in fauxfactory.__all__:
+        if name.startswith("gen_"):
+            assert callable(getattr(faux, name))
+            assert name in dir(faux)
+
+
+def test_faux_unknown_attribute():
+    """Only factories are exposed."""
+    with pytest.raises(AttributeError):
+        Faux().gen_nonexistent
+    with pytest.raises(AttributeError):
+        Faux().Faux
+
+
+def test_faux_reproducible():
+    """Instances with the same seed generate the same values."""
+    assert sample(Faux(seed=42)) == sample(Faux(seed=42))
+
+
+def test_faux_different_seeds():
+    """Instances with different seeds generate different values."""
+    assert Faux(seed=1).gen_alpha(20) != Faux(seed=2).gen_alpha(20)
+
+
+def test_faux_does_not_touch_global_state():
+    """Using an instance neither reads nor modifies the global random state."""
+    state = random.getstate()
+    Faux(seed=1).gen_alpha(50)
+    assert random.getstate() == state
+
+
+def test_faux_reseed():
+    """Reseeding an instance restarts its stream."""
+    faux = Faux(seed=7)
+    value = faux.gen_alphanumeric()
+    faux.seed(7)
+    assert faux.gen_alphanumeric() == value
+
+
+def test_faux_custom_rng():
+    """A custom random generator can be plugged in."""
+    rng = random.Random(3)
+    faux = Faux(rng=rng)
+    assert faux.random is rng
+    assert faux.gen_integer(0, 10**9) == random.Random(3).randint(0, 10**9)
+
+
+def test_faux_nested_calls():
+    """Factories called from schemas use the instance generator too."""
+    schema = {"name": gen_alpha, "age": lambda: gen_integer(0, 100), "id": gen_uuid}
+    assert Faux(seed=5).gen_dict(schema) == Faux(seed=5).gen_dict(schema)
+
+
+def test_faux_threads():
+    """Each thread gets the stream of its own instance."""
+    results = {}
+
+    def worker(index):
+        results[index] = Faux(seed=index % 2).gen_alpha(30)
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({results[index] for index in range(0, 8, 2)}) == 1
+    assert len({results[index] for index in range(1, 8, 2)}) == 1
+    assert results[0] != results[1]
+
+
+def test_seeded_reproducible():
+    """Blocks seeded with the same value generate the same values."""
+    with seeded(42):
+        first = sample(fauxfactory)
+    with seeded(42):
+        second = sample(fauxfactory)
+    assert first == second
+
+
+def test_seeded_restores_generator():
+    """The previous generator is active again after the block."""
+    state = random.getstate()
+    with seeded(1) as rng:
+        assert get_random() is rng
+        gen_dict({"name": gen_alpha})
+    assert get_random() is random._inst
+    assert random.getstate() == state
+
+
+def test_use_random_nested():
+    """Activated generators can be nested."""
+    outer, inner = random.Random(1), random.Random(2)
+    with use_random(outer):
+        with use_random(inner):
+            assert get_random() is inner
+        assert get_random() is outer
+
+
+def test_derive_seed():
+    """Derived seeds are stable and differ for every path."""
+    assert derive_seed(42, "users", 0) == derive_seed(42, "users", 0)
+    # Computed once, must never change between versions
+    assert derive_seed(42, "users", 0) == 0x25D5B3399BA2C339FA7B57C0476BD2DF
+    seeds = {
+        derive_seed(42),
+        derive_seed(42, 0),
+        derive_seed(42, "0"),
+        derive_seed(42, b"0"),
+        derive_seed(42, 0.0),
+        derive_seed(42, False),
+        derive_seed(42, 0, 1),
+        derive_seed(42, 1, 0),
+        derive_seed(43, 0),
+        derive_seed("42", 0),
+    }
+    assert len(seeds) == 10
+    assert derive_seed(b"ab") == derive_seed(bytearray(b"ab"))
+    assert derive_seed(True) != derive_seed(1)
+    assert derive_seed(42, True) != derive_seed(42, 1)
+    assert derive_seed(42, True) == derive_seed(42, True)
+
+
+@pytest.mark.parametrize("args", [(None,), (1, None), (1, [2]), (object(),)])
+def test_derive_seed_invalid(args):
+    """Only the seed types of random.Random are supported."""
+    with pytest.raises(ValueError):
+        derive_seed(*args)
+
+
+@pytest.mark.parametrize(("count", "shard_count"), [(0, 1), (10, 3), (2, 5), (7, 7)])
+def test_shard_range(count, shard_count):
+    """Shards split the items in contiguous parts of similar sizes."""
+    parts = [shard_range(count, index, shard_count) for index in range(shard_count)]
+    assert [item for part in parts for item in part] == list(range(count))
+    assert max(map(len, parts)) - min(map(len, parts)) <= 1
+
+
+@pytest.mark.parametrize(
+    ("count", "shard_index", "shard_count"),
+    [(-1, 0, 1), (1, 1, 1), (1, -1, 2), (1, 0, 0), (1, "0", 1)],
+)
+def test_shard_range_invalid(count, shard_index, shard_count):
+    """Invalid counts and shards are rejected."""
+    with pytest.raises(ValueError):
+        shard_range(count, shard_index, shard_count)
+
+
+def test_shard_chunks():
+    """Chunks of a shard are seeded from the root seed and their position."""
+    chunks = [list(shard_chunks(25, 10, index, 2, 4, "x")) for index in range(2)]
+    assert chunks == [
+        [(derive_seed(4, "x", 0), 10)],
+        [(derive_seed(4, "x", 1), 10), (derive_seed(4, "x", 2), 5)],
+    ]
+    for args in ((25, 0, 0, 1, 4), (-1, 10, 0, 1, 4), (25, 10, 2, 2, 4)):
+        with pytest.raises(ValueError):
+            shard_chunks(*args)
+
+
+def generate_integers(size):
+    """Generate a list of integers from the active generator."""
+    return [get_random().randrange(10**6) for _ in range(size)]
+
+
+@pytest.mark.parametrize("shard_count", [1, 3])
+def test_generate_shard(shard_count):
+    """Shards put together give the items of a single shard."""
+    with seeded(8):
+        full = [
+            item
+            for chunk in generate_shard(generate_integers, 25, 0, 1, "x", chunk_size=4)
+            for item in chunk
+        ]
+    parts = []
+    for index in range(shard_count):
+        with seeded(8):
+            chunks = generate_shard(
+                generate_integers, 25, index, shard_count, "x", chunk_size=4
+            )
+        parts.extend(item for chunk in chunks for item in chunk)
+    assert parts == full
+
+
+def test_generate_shard_unsharded():
+    """Without shard count, items are drawn from the active generator."""
+    with seeded(8):
+        chunks = list(generate_shard(generate_integers, 25, chunk_size=4))
+    assert list(map(len, chunks)) == [4] * 6 + [1]
+    with seeded(8):
+        assert [item for chunk in chunks for item in chunk] == generate_integers(25)
+    with pytest.raises(ValueError):
+        generate_shard(generate_integers, 25, 1)
+
+
+fork = pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="fork is not available",
+)
+
+
+@pytest.fixture
+def fork_policy():
+    """Restore the fork policy after the test."""
+    policy = get_fork_policy()
+    yield set_fork_policy
+    set_fork_policy(policy)
+
+
+def _child_values(queue, faux):
+    queue.put((gen_alpha(16), faux.gen_alpha(16), random.random()))
+
+
+def forked_values(children, faux):
+    """Return the values generated by children forked one after the other."""
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    values = []
+    for _ in range(children):
+        process = context.Process(target=_child_values, args=(queue, faux))
+        process.start()
+        values.append(queue.get(timeout=30))
+        process.join()
+    return values
+
+
+@fork
+def test_fork_reseed(fork_policy):
+    """Forked children get distinct streams, reproducible from the seed."""
+    fork_policy("reseed")
+    runs = []
+    for _ in range(2):
+        with seeded(42):
+            runs.append(forked_values(3, Faux(seed=7)))
+    assert [values[:2] for values in runs[0]] == [values[:2] for values in runs[1]]
+    assert len({value for values in runs[0] for value in values}) == 9
+    assert len({values[2] for values in runs[0] + runs[1]}) == 6
+
+
+@fork
+def test_fork_entropy(fork_policy):
+    """Children streams are distinct but not reproducible."""
+    fork_policy("entropy")
+    runs = []
+    for _ in range(2):
+        with seeded(42):
+            runs.extend(forked_values(2, Faux(seed=7)))
+    assert len({value for values in runs for value in values[:2]}) == 8
+
+
+@fork
+def test_fork_inherit(fork_policy):
+    """Children forked from the same state generate the same values."""
+    fork_policy("inherit")
+    with seeded(42):
+        first, second = forked_values(2, Faux(seed=7))
+    assert first[:2] == second[:2]
+
+
+@fork
+def test_fork_pool(fork_policy):
+    """Workers of a process pool do not generate the same values."""
+    fork_policy("reseed")
+    context = multiprocessing.get_context("fork")
+    with seeded(42), context.Pool(3) as pool:
+        values = pool.map(gen_alpha, [16] * 12, chunksize=1)
+    assert len(set(values)) == 12
+
+
+def test_set_fork_policy(fork_policy):
+    """Only the known policies are accepted."""
+    assert fork_policy("inherit") == "reseed"
+    assert get_fork_policy() == "inherit"
+    with pytest.raises(ValueError):
+        fork_policy("unknown")
+    assert get_fork_policy() == "inherit"
@@ -3,9 +3,20 @@
 These tests are heavily just artificial tests to get 100% coverage.
 """
 
+import random
+import subprocess
+import sys
+from importlib import import_module
+from pathlib import Path
+
 import pytest
 
 import fauxfactory
+import fauxfactory.factories
+
+# Generous budget (in microseconds) for ``import fauxfactory``, which only
+# takes about a millisecond when factories are not loaded eagerly
+IMPORT_TIME_BUDGET_US = 15000
 
 
 def test_fauxfactory_getattr():
@@ -17,3 +28,77 @@ def test_fauxfactory_getattr_raises_attributeerror():
     """Check __getattr__ raises AttributeError."""
     with pytest.raises(AttributeError):
         fauxfactory.nonexistentattribute
+
+
+def test_fauxfactory_symbols_match_factories():
+    """Check every factory is listed in the lazy loading table."""
+    factories_dir = Path(fauxfactory.factories.__file__).parent
+    for path in factories_dir.iterdir():
+        if path.suffix == ".py" and not path.name.startswith("__"):
+            module = import_module(f"fauxfactory.factories.{path.stem}")
+            for name in module.__all__:
+                assert name in fauxfactory.__all__
+                assert getattr(fauxfactory, name) is getattr(module, name)
+
+
+def run_python(*args: str):
+    """Run a fresh Python interpreter from the project root directory."""
+    return subprocess.run(  # noqa: S603
+        [sys.executable, *args],
+        cwd=Path(__file__).parents[1],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+
+def test_fauxfactory_import_is_lazy():
+    """Check importing fauxfactory neither loads factories nor parses facts."""
+    result = run_python(
+        "-c",
+        "import sys, fauxfactory, fauxfactory.constants as constants; "
+        "print(any(name.startswith('fauxfactory.factories') for name in sys.modules)); "
+        "print('FACTS_JSON' in vars(constants)); "
+        "fauxfactory.gen_system_facts(); "
+        "print('FACTS_JSON' in vars(constants))",
+    )
+    assert result.stdout.split() == ["False", "False", "True"]
+
+
+def test_fauxfactory_import_loads_no_submodule():
+    """Check importing fauxfactory does not import any of its submodules."""
+    result = run_python(
+        "-c",
+        "import sys, fauxfactory; "
+        "print([name for name in sys.modules if name.startswith('fauxfactory.')])",
+    )
+    assert result.stdout.strip() == "[]"
+
+
+def test_fauxfactory_import_time():
+    """Check importing fauxfactory stays within its import time budget.
+
+    The fastest of three runs is kept to avoid failing on a busy machine.
+    """
+    timings = []
+    for _ in range(3):
+        result = run_python("-X", "importtime", "-c", "import fauxfactory")
+        cumulative = {}
+        for line in result.stderr.splitlines()[1:]:
+            _, fields = line.split(":", 1)
+            _, total, name = (field.strip() for field in fields.split("|"))
+            cumulative[name] = int(total)
+        assert not [name for name in cumulative if name.startswith("fauxfactory.")]
+        timings.append(cumulative["fauxfactory"])
+    assert min(timings) < IMPORT_TIME_BUDGET_US
+
+
+def test_fauxfactory_seed_after_import():
+    """Check seeding the global generator after the import is honored."""
+    code = (
+        "import fauxfactory, random; random.seed(5); "
+        "print(fauxfactory.gen_integer(0, 10**9), fauxfactory.gen_alpha())"
+    )
+    runs = {run_python("-c", code).stdout for _ in range(2)}
+    assert len(runs) == 1
+    assert runs.pop().split()[0] == str(random.Random(5).randint(0, 10**9))
@@ -0,0 +1,114 @@
+"""Tests for the factories calls instrumentation."""
+
+import pytest
+
+import fauxfactory
+from fauxfactory import instrument
+from fauxfactory.factories.strings import gen_alpha
+from fauxfactory.instrument import FactoryStats
+
+
+@pytest.fixture
+def instrumented():
+    """Enable instrumentation for a test."""
+    instrument.reset()
+    instrument.enable()
+    yield
+    instrument.disable()
+    instrument.reset()
+
+
+def test_disabled_by_default():
+    """Factories are not wrapped unless instrumentation is enabled."""
+    assert not instrument.is_enabled()
+    assert fauxfactory.gen_alpha is gen_alpha
+
+
+@pytest.mark.usefixtures("instrumented")
+def test_enable_records_calls():
+    """Calls of the factories looked up through the package are recorded."""
+    assert fauxfactory.gen_alpha is not gen_alpha
+    for _ in range(3):
+        fauxfactory.gen_alpha(5)
+    fauxfactory.gen_email()
+    data = instrument.snapshot()
+    # Factories called by gen_email are part of its own time
+    assert set(data) == {"gen_alpha", "gen_email"}
+    stats = data["gen_alpha"]
+    assert stats["calls"] == 3
+    assert stats["min_ns"] <= stats["mean_ns"] <= stats["max_ns"]
+    assert stats["total_ns"] >= stats["max_ns"]
+    assert sum(stats["histogram"].values()) == 3
+    assert stats["p50_ns"] <= stats["p99_ns"] <= stats["max_ns"]
+
+
+@pytest.mark.usefixtures("instrumented")
+def test_failed_calls_are_recorded():
+    """Calls raising an exception are recorded too."""
+    with pytest.raises(ValueError):
+        fauxfactory.gen_alpha(-1)
+    assert instrument.snapshot()["gen_alpha"]["calls"] == 1
+
+
+@pytest.mark.usefixtures("instrumented")
+def test_faux_calls_are_recorded():
+    """Factories called through Faux instances are recorded."""
+    fauxfactory.Faux(seed=1).gen_integer()
+    assert instrument.snapshot()["gen_integer"]["calls"] == 1
+
+
+@pytest.mark.usefixtures("instrumented")
+def test_module_calls_are_recorded():
+    """Factories imported from their own module are recorded too."""
+    from fauxfactory.factories.strings import gen_alpha as module_gen_alpha
+
+    assert module_gen_alpha is fauxfactory.gen_alpha
+    module_gen_alpha(5)
+    fauxfactory.factories.strings.gen_numeric_string(3)
+    data = instrument.snapshot()
+    assert data["gen_alpha"]["calls"] == 1
+    assert data["gen_numeric_string"]["calls"] == 1
+
+
+@pytest.mark.usefixtures("instrumented")
+def test_nested_calls_are_not_recorded():
+    """Factories called by other factories are part of the outer call."""
+    fauxfactory.factories.internet.gen_url()
+    assert set(instrument.snapshot()) == {"gen_url"}
+
+
+def test_disable(instrumented):
+    """Disabling stops recording and restores the factories."""
+    factory = fauxfactory.gen_boolean
+    factory()
+    instrument.disable()
+    factory()
+    assert fauxfactory.gen_boolean is fauxfactory.factories.booleans.gen_boolean
+    assert fauxfactory.factories.strings.gen_alpha is gen_alpha
+    assert fauxfactory.factories.internet.gen_alpha is gen_alpha
+    assert instrument.snapshot()["gen_boolean"]["calls"] == 1
+    instrument.reset()
+    assert instrument.snapshot() == {}
+
+
+@pytest.mark.usefixtures("instrumented")
+def test_report():
+    """The report lists the most time consuming factories first."""
+    fauxfactory.gen_boolean()
+    fauxfactory.gen_alpha(length=10000)
+    lines = instrument.report().splitlines()
+    assert lines[0].split()[:3] == ["factory", "calls", "total"]
+    assert [line.split()[0] for line in lines[1:]] == ["gen_alpha", "gen_boolean"]
+
+
+def test_factory_stats_histogram():
+    """Latencies are counted in buckets of powers of two nanoseconds."""
+    stats = FactoryStats("gen_test")
+    assert stats.percentile(0.5) == 0
+    for duration in (3, 3, 5, 1000):
+        stats.record(duration)
+    data = stats.as_dict()
+    assert data["histogram"] == {4: 2, 8: 1, 1024: 1}
+    assert (data["min_ns"], data["max_ns"], data["mean_ns"]) == (3, 1000, 252)
+    assert data["p50_ns"] == 4
+    assert data["p99_ns"] == 1000
@@ -0,0 +1,120 @@
+"""Tests for the sampling of integers and addresses without replacement."""
+
+import ipaddress
+import sys
+
+import pytest
+
+from fauxfactory import (
+    IntegerPermutation,
+    gen_unique_integers,
+    gen_unique_ipaddrs,
+    gen_unique_macs,
+    seeded,
+)
+
+
+@pytest.mark.parametrize(
+    ("min_value", "max_value"), [(0, 0), (5, 6), (-10, 10), (0, 1000), (1, 4096)]
+)
+def test_permutation_covers_range(min_value, max_value):
+    """Every integer of the range is generated exactly once."""
+    permutation = IntegerPermutation(min_value, max_value, seed=1)
+    values = list(permutation)
+    assert len(values) == len(permutation) == permutation.size
+    assert permutation.size == max_value - min_value + 1
+    assert sorted(values) == list(range(min_value, max_value + 1))
+
+
+def test_permutation_shuffles():
+    """Different seeds give different orders, the same seed the same one."""
+    first = list(IntegerPermutation(0, 999, seed=1))
+    assert first != list(range(1000))
+    assert first == list(IntegerPermutation(0, 999, seed=1))
+    assert first != list(IntegerPermutation(0, 999, seed=2))
+    with seeded(3):
+        seeded_values = list(IntegerPermutation(0, 99))
+    with seeded(3):
+        assert list(IntegerPermutation(0, 99)) == seeded_values
+
+
+def test_permutation_indexing():
+    """Values are looked up by position."""
+    permutation = IntegerPermutation(-5, 5, seed=4)
+    values = list(permutation)
+    assert permutation[0] == values[0]
+    assert permutation[-1] == values[-1]
+    assert permutation[2:5] == values[2:5]
+    with pytest.raises(IndexError):
+        permutation[11]
+    assert repr(permutation) == "IntegerPermutation(-5, 5)"
+
+
+@pytest.mark.parametrize("bits", [64, 127, 200])
+def test_permutation_huge_ranges(bits):
+    """Huge ranges are sampled in constant memory."""
+    permutation = IntegerPermutation(0, 2**bits - 1, seed=5)
+    values = permutation[:1000]
+    assert len(set(values)) == 1000
+    assert all(0 <= value < 2**bits for value in values)
+    assert permutation[2**bits - 1] in range(2**bits)
+
+
+@pytest.mark.parametrize(("min_value", "max_value"), [(1, 0), (0.5, 2), (0, "9")])
+def test_permutation_invalid_bounds(min_value, max_value):
+    """Invalid ranges are rejected."""
+    with pytest.raises(ValueError):
+        IntegerPermutation(min_value, max_value)
+
+
+def test_gen_unique_integers():
+    """Integers are unique and within bounds."""
+    values = list(gen_unique_integers(1024, 65535, 5000))
+    assert len(set(values)) == 5000
+    assert all(1024 <= value <= 65535 for value in values)
+    assert sorted(gen_unique_integers(0, 9, seed=1)) == list(range(10))
+    value = next(gen_unique_integers())
+    assert -sys.maxsize - 1 <= value <= sys.maxsize
+    for count in (-1, 11, "1"):
+        with pytest.raises(ValueError):
+            gen_unique_integers(0, 9, count)
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "total"),
+    [
+        ({"prefix": [10, 0, 1]}, 255),
+        ({"prefix": [10, 0], "ip3": True}, 255),
+        ({"prefix": [10, 0]}, 255**2),
+        ({"prefix": ["fe80", 0, 0, 0, 0, 0, 1], "ipv6": True}, 2**16),
+    ],
+)
+def test_gen_unique_ipaddrs_exhaustive(kwargs, total):
+    """Every address of a prefix is generated exactly once."""
+    addresses = list(gen_unique_ipaddrs(**kwargs, seed=1))
+    assert len(addresses) == len(set(addresses)) == total
+    for address in addresses[:100]:
+        ipaddress.ip_address(address)
+
+
+def test_gen_unique_ipaddrs():
+    """Addresses are valid and unique."""
+    addresses = list(gen_unique_ipaddrs(1000, ipv6=True))
+    assert len(set(addresses)) == 1000
+    for address in addresses:
+        assert ipaddress.ip_address(address).version == 6
+    for address in gen_unique_ipaddrs(100):
+        assert all(0 <= int(field) <= 254 for field in address.split("."))
+    with pytest.raises(ValueError):
+        gen_unique_ipaddrs(prefix=[1, 2, 3, 4])
+    with pytest.raises(ValueError):
+        gen_unique_ipaddrs(prefix=[1, 2, 3, 4, 5])
+
+
+def test_gen_unique_macs():
+    """MAC addresses are valid and unique."""
+    macs = list(gen_unique_macs(1000, delimiter="-", seed=2))
+    assert len(set(macs)) == 1000
+    assert all(len(mac.split("-")) == 6 for mac in macs)
+    with pytest.raises(ValueError):
+        gen_unique_macs(delimiter=".")
@@ -0,0 +1,159 @@
+"""Tests for the regular expression driven string generator."""
+
+import re
+
+import pytest
+
+from fauxfactory import compile_regex, gen_from_regex, seeded
+from fauxfactory.factories.regex import PRINTABLE, RegexPlan
+
+PATTERNS = [
+    r"[A-Z]{3}-\d{4}",
+    r"^\w+@\w+\.(com|org)$",
+    r"(ab|c)[^a-z\d]{2,}\1(?(1)x|y)",
+    r"a.b.c",
+    r"\D\S\W\s",
+    r"(?:x|y)*z+?",
+    r"[\w.-]+",
+    r"(?P<digit>\d)(?P=digit)",
+    r"((a)|b)(?(2)c|d)",
+    r"[^\W\d_]{8}",
+    r"(?i)[^a-c]{5}",
+    r"(?i:hello) WORLD",
+    r"\A[0-9a-f]{8}(-[0-9a-f]{4}){3}-[0-9a-f]{12}\Z",
+    r"",
+]
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_gen_from_regex(pattern):
+    """Generated strings match the whole pattern."""
+    for value in compile_regex(pattern).generate_many(200):
+        assert re.fullmatch(pattern, value), value
+    assert re.fullmatch(pattern, gen_from_regex(pattern))
+
+
+def test_gen_from_regex_compiled_pattern():
+    """Compiled patterns and their flags are supported."""
+    pattern = re.compile(r"[^a]{20}", re.IGNORECASE)
+    value = gen_from_regex(pattern)
+    assert "a" not in value.lower()
+    assert pattern.fullmatch(value)
+
+
+def test_gen_from_regex_max_repeat():
+    """Unbounded quantifiers are limited by max_repeat."""
+    plan = compile_regex(r"a+b*", max_repeat=3)
+    lengths = {len(value) for value in plan.generate_many(500)}
+    assert lengths <= set(range(1, 8))
+    assert max(lengths) > 4
+    assert compile_regex(r"x*", max_repeat=0).generate() == ""
+
+
+def test_gen_from_regex_printable():
+    """Any character and negated classes generate printable ASCII."""
+    value = "".join(compile_regex(r".[^x]\W").generate_many(500))
+    assert all(PRINTABLE[0] <= ord(char) <= PRINTABLE[1] for char in value)
+
+
+def test_gen_from_regex_seeded():
+    """Generated strings are reproducible."""
+    with seeded(5):
+        first = compile_regex(r"[a-z]+\d*").generate_many(10)
+    with seeded(5):
+        assert compile_regex(r"[a-z]+\d*").generate_many(10) == first
+
+
+def test_compile_regex_cache():
+    """Plans are cached by pattern, flags and max_repeat."""
+    plan = compile_regex(r"\d+")
+    assert isinstance(plan, RegexPlan)
+    assert compile_regex(r"\d+") is plan
+    assert compile_regex(r"\d+", re.ASCII) is not plan
+    assert compile_regex(r"\d+", max_repeat=3) is not plan
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        r"foo(?=bar)",
+        r"(?<!a)b",
+        r"\bword\b",
+        r"[^\x20-\x7e]",
+        r"(unbalanced",
+        b"bytes",
+        r"a^b",
+        r"x$y",
+        r"a\Ab",
+        r"(^a)+",
+        r"(a|b$)c",
+        r"(a)?\1",
+        r"(?:(a)|b)\1",
+        r"(a|(b))\2",
+        r"(?:(a)b)*\1",
+        r"(a)?(?(1)x|\1)",
+    ],
+)
+def test_gen_from_regex_unsupported(pattern):
+    """Invalid and unsupported patterns are reported."""
+    with pytest.raises(ValueError):
+        gen_from_regex(pattern)
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        r"(a)?(?(1)\1)",
+        r"(?:(a)|b)(?(1)\1|c)",
+        r"(a|b)+\1",
+        r"(?:x(a)?y)+(?(1)\1|z)",
+        r"((a)|b)(?:c|(?(2)\2|d))",
+    ],
+)
+def test_gen_from_regex_optional_groups(pattern):
+    """Backreferences to optional or alternated groups still match."""
+    for value in compile_regex(pattern).generate_many(200):
+        assert re.fullmatch(pattern, value), value
+
+
+@pytest.mark.parametrize("max_repeat", [-1, 1.5])
+def test_gen_from_regex_invalid_max_repeat(max_repeat):
+    """The max_repeat argument must be a non negative integer."""
+    with pytest.raises(ValueError):
+        gen_from_regex("a*", max_repeat=max_repeat)
+
+
+@pytest.mark.parametrize(
+    "pattern", [r"^a$", r"\Aab\Z", r"(^a|b)c", r"^(?:x|^y)$", r"(?:^a)?b", r"^$"]
+)
+def test_gen_from_regex_anchors(pattern):
+    """Anchors are supported at the start and at the end of the pattern."""
+    for value in compile_regex(pattern).generate_many(50):
+        assert re.fullmatch(pattern, value), value
+
+
+@pytest.mark.parametrize("count", [-1, "1"])
+def test_generate_many_invalid_count(count):
+    """The number of strings must be a non-negative integer."""
+    with pytest.raises(ValueError):
+        compile_regex("a").generate_many(count)
+
+
+def test_generate_many_shards():
+    """Shards put together give the strings generated with one shard."""
+    plan = compile_regex(r"[a-z]{3}\d")
+    with seeded(6):
+        full = plan.generate_many(2500, shard_count=1)
+    parts = []
+    for index in range(3):
+        with seeded(6):
+            parts.extend(plan.generate_many(2500, shard_index=index, shard_count=3))
+    assert parts == full
+    assert all(re.fullmatch(r"[a-z]{3}\d", value) for value in full)
+    with pytest.raises(ValueError):
+        plan.generate_many(10, shard_index=3, shard_count=3)
+
+
+def test_generate_many_zero():
+    """Generating no string returns an empty list."""
+    assert compile_regex("a+").generate_many(0) == []
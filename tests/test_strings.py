@@ -3,6 +3,7 @@
 import string
 import unicodedata
 from random import randint
+from unittest import mock
 
 import pytest
 
@@ -16,9 +17,18 @@ from fauxfactory import (
     gen_numeric_string,
     gen_special,
     gen_string,
+    gen_string_many,
     gen_utf8,
 )
-from fauxfactory.helpers import BMP, unicode_letters_generator
+from fauxfactory.factories.strings import CJK_CODEPOINTS
+from fauxfactory.helpers import (
+    BMP,
+    _read_unicode_letters,
+    _write_unicode_letters,
+    unicode_letters,
+    unicode_letters_cache_file,
+    unicode_letters_generator,
+)
 
 GENERATORS = [
     gen_html,
@@ -133,6 +143,74 @@ def test_chars_in_letters_category():
         assert unicodedata.category(char) in ("Lu", "Ll", "Lt", "Lm", "Lo")
 
 
+@pytest.fixture
+def letters_cache_dir(tmp_path, monkeypatch):
+    """Point the unicode letters disk cache to a temporary directory."""
+    monkeypatch.setenv("FAUXFACTORY_CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv("FAUXFACTORY_DISABLE_DISK_CACHE", raising=False)
+    unicode_letters.cache_clear()
+    yield tmp_path
+    unicode_letters.cache_clear()
+
+
+def test_unicode_letters_is_cached():
+    """Unicode letters table is built once and reused."""
+    assert unicode_letters() is unicode_letters()
+    assert unicode_letters(smp=False) is unicode_letters(smp=False)
+
+
+def test_unicode_letters_bmp_is_prefix():
+    """BMP letters table is the BMP part of the full table."""
+    bmp_letters = unicode_letters(smp=False)
+    assert unicode_letters().startswith(bmp_letters)
+    assert ord(bmp_letters[-1]) <= BMP.max
+    assert ord(unicode_letters()[len(bmp_letters)]) > BMP.max
+
+
+def test_unicode_letters_disk_cache(letters_cache_dir):
+    """Unicode letters table is persisted and read back from disk."""
+    path = unicode_letters_cache_file()
+    assert path.parent == letters_cache_dir
+    assert unicodedata.unidata_version in path.name
+    letters = unicode_letters()
+    assert _read_unicode_letters(path) == letters
+
+    # A cold start must read the table back instead of scanning
+    unicode_letters.cache_clear()
+    _write_unicode_letters(path, "abc")
+    assert unicode_letters() == "abc"
+
+
+@pytest.mark.parametrize(
+    "corrupt",
+    [
+        lambda content: b"\xff",
+        lambda content: content[:-4],
+        lambda content: content[:-1],
+        lambda content: content[:16] + "abc".encode("utf-32-le"),
+        lambda content: "abc".encode("utf-32-le"),
+        lambda content: content[:16],
+    ],
+)
+def test_unicode_letters_corrupted_disk_cache(letters_cache_dir, corrupt):
+    """A truncated or corrupted disk cache is rebuilt and rewritten."""
+    path = unicode_letters_cache_file()
+    letters = unicode_letters()
+    path.write_bytes(corrupt(path.read_bytes()))
+    unicode_letters.cache_clear()
+    assert _read_unicode_letters(path) is None
+    assert unicode_letters() == letters
+    assert _read_unicode_letters(path) == letters
+
+
+def test_unicode_letters_disk_cache_disabled(letters_cache_dir, monkeypatch):
+    """Disk cache can be disabled through the environment."""
+    monkeypatch.setenv("FAUXFACTORY_DISABLE_DISK_CACHE", "1")
+    assert unicode_letters_cache_file() is None
+    assert unicode_letters()
+    assert not list(letters_cache_dir.iterdir())
+
+
 def test_bmp_chars_only():
     """Unicode letters generator generates only BMP unicode letters."""
     for char in gen_utf8(length=50, smp=False):
@@ -147,7 +225,22 @@ def test_gen_cjk_bmp_only():
         # Verify character is in BMP range
         assert 0x0000 <= codepoint <= 0xFFFF
         # Verify it's in the allowed CJK BMP blocks
-        assert (0x3400 <= codepoint <= 0x4DBF) or (0x4E00 <= codepoint <= 0x9FFF)
+        assert (0x3400 <= codepoint <= 0x4DBF) or (0x4E00 <= codepoint <= 0x9FFC)
+
+
+def test_gen_cjk_assigned_characters():
+    """Every CJK character is assigned and has a Unicode name.
+
+    Ranges must hold no character assigned after Unicode 13.0 either, since
+    Python 3.10 names characters up to that version only.
+    """
+    for char in gen_cjk(1000):
+        assert unicodedata.name(char, None), hex(ord(char))
+    for low, high in CJK_CODEPOINTS.ranges:
+        for codepoint in range(low, high + 1):
+            assert unicodedata.name(chr(codepoint), None), hex(codepoint)
+    for codepoint in (0x9FFD, 0x9FFF, 0x2A6DE, 0x2B735, 0x2B81E):
+        assert chr(codepoint) not in CJK_CODEPOINTS, hex(codepoint)
 
 
 def test_gen_cjk_default_includes_all_blocks():
@@ -161,7 +254,7 @@ def test_gen_cjk_default_includes_all_blocks():
         # Verify it's in one of the valid CJK blocks (BMP or non-BMP)
         in_valid_block = (
             (0x3400 <= codepoint <= 0x4DBF)
-            or (0x4E00 <= codepoint <= 0x9FFF)
+            or (0x4E00 <= codepoint <= 0x9FFC)
             or (0x20000 <= codepoint <= 0x2A6DF)
             or (0x2A700 <= codepoint <= 0x2B73F)
             or (0x2B740 <= codepoint <= 0x2B81F)
@@ -169,6 +262,13 @@ def test_gen_cjk_default_includes_all_blocks():
         assert in_valid_block
 
 
+def test_gen_latin1_full_block():
+    """gen_latin1 draws every letter of the Latin-1 Supplement block."""
+    signs = {"\u00d7", "\u00f7"}
+    expected = {chr(codepoint) for codepoint in range(0xC0, 0x100)} - signs
+    assert set(gen_latin1(5000)) == expected
+
+
 def test_invalid_string_type():
     """Only valid string types can be generated."""
     with pytest.raises(ValueError):
@@ -192,3 +292,70 @@ def test_start_string(fnc):
     assert start == random_str[: len(start)]
     assert separator == random_str[len(start)]
     assert len(random_str) == 10
+
+
+@pytest.mark.parametrize("str_type", STRING_TYPES)
+def test_gen_string_many(str_type):
+    """Batches hold the requested number of strings of the given length."""
+    result = gen_string_many(str_type, 20, 5)
+    assert len(result) == 20
+    if str_type != "html":
+        assert all(len(value) == 5 for value in result)
+    assert len(set(result)) > 1
+
+
+def test_gen_string_many_characters():
+    """Batched strings are made up of the characters of their type."""
+    for value in gen_string_many("numeric", 50, length=3):
+        assert value.isdigit()
+    for value in gen_string_many("PUNCTUATION", 50):
+        assert len(value) == 10
+        assert set(value) <= set(string.punctuation)
+
+
+def test_gen_string_many_empty():
+    """An empty batch can be requested."""
+    assert gen_string_many("alpha", 0) == []
+
+
+@pytest.mark.parametrize("count", [-1, "1", None])
+def test_gen_string_many_invalid_count(count):
+    """Count must be a non negative integer."""
+    with pytest.raises(ValueError):
+        gen_string_many("alpha", count)
+
+
+@pytest.mark.parametrize("length", [0, -1, "1"])
+def test_gen_string_many_invalid_length(length):
+    """Length must be a positive integer."""
+    with pytest.raises(ValueError):
+        gen_string_many("alpha", 3, length)
+
+
+def test_gen_string_many_invalid_string_type():
+    """Only valid string types can be generated."""
+    with pytest.raises(ValueError):
+        gen_string_many("foo", 3)
+
+
+def test_gen_string_many_validator_without_default():
+    """Validator requires a default value."""
+    with pytest.raises(ValueError):
+        gen_string_many("alpha", 3, validator=r"^a")
+
+
+def test_gen_string_many_validator():
+    """Rejected strings are generated again until they pass validation."""
+    result = gen_string_many(
+        "numeric", 100, 1, validator=r"[0-4]", default="x", tries=50
+    )
+    assert len(result) == 100
+    assert all(value in "01234" for value in result)
+
+
+def test_gen_string_many_validator_default():
+    """Strings rejected on every try are replaced by the default."""
+    validator = mock.Mock(return_value=False)
+    result = gen_string_many("alpha", 4, validator=validator, default="x", tries=3)
+    assert result == ["x"] * 4
+    assert validator.call_count == 12
@@ -1,18 +1,30 @@
 """Tests for structured data generators."""
 
 import json
+import multiprocessing
+import pickle
+from array import array
 
 import pytest
 
 from fauxfactory import (
+    Faux,
+    compile_schema,
     gen_alpha,
     gen_boolean,
+    gen_columns,
     gen_dict,
     gen_email,
     gen_integer,
     gen_json,
     gen_list,
     gen_uuid,
+    parallel_generate,
+    seeded,
+)
+from fauxfactory.factories.structures import (
+    StringColumn,
+    compile_fields,
 )
 
 
@@ -735,3 +747,353 @@ def test_gen_list_multiple_generator_types():
     assert all("@" in x for x in emails)
     assert all(isinstance(x, bool) for x in booleans)
     assert all(isinstance(x, str) and len(x) == 36 for x in uuids)
+
+
+COMPILED_SCHEMA = {
+    "id": gen_uuid,
+    "name": gen_alpha,
+    "status": "active",
+    "profile": {
+        "email": gen_email,
+        "age": lambda: gen_integer(min_value=18, max_value=100),
+        "verified": False,
+    },
+    "tags": [gen_alpha],
+    "scores": [lambda: gen_integer(min_value=0, max_value=9)],
+    "roles": ["admin", "user"],
+    "history": [],
+}
+
+
+def test_compile_schema_matches_gen_dict():
+    """Test compiled plans generate the same records as gen_dict."""
+    list_sizes = {"tags": 2, "scores": 5}
+    plan = compile_schema(COMPILED_SCHEMA, list_sizes=list_sizes)
+    with seeded(1):
+        expected = [gen_dict(COMPILED_SCHEMA, list_sizes=list_sizes) for _ in range(5)]
+    with seeded(1):
+        assert plan.generate_many(5) == expected
+    with seeded(1):
+        assert plan.generate() == expected[0]
+
+
+def test_compile_schema_records_are_independent():
+    """Test records do not share mutable containers."""
+    first, second = compile_schema(COMPILED_SCHEMA).generate_many(2)
+    assert first["profile"] is not second["profile"]
+    assert first["history"] is not second["history"]
+    assert list(first) == list(COMPILED_SCHEMA)
+    assert list(first["profile"]) == list(COMPILED_SCHEMA["profile"])
+
+
+def test_compile_schema_generate_many_empty():
+    """Test generating no records."""
+    assert compile_schema(COMPILED_SCHEMA).generate_many(0) == []
+
+
+def test_compile_schema_generate_many_shards():
+    """Test shards put together give the records of parallel_generate."""
+    plan = compile_schema(COMPILED_SCHEMA)
+    with seeded(4):
+        full = list(parallel_generate(plan, 2100, workers=1))
+    parts = []
+    for index in range(3):
+        with seeded(4):
+            parts.extend(plan.generate_many(2100, shard_index=index, shard_count=3))
+    assert parts == full
+    with seeded(4):
+        assert plan.generate_many(2100, shard_count=1) == full
+
+
+def test_compile_schema_generate_many_negative():
+    """Test negative record counts are rejected."""
+    with pytest.raises(ValueError, match="Count must be non-negative"):
+        compile_schema(COMPILED_SCHEMA).generate_many(-1)
+
+
+@pytest.mark.parametrize("schema", [None, "not a dict", [gen_alpha]])
+def test_compile_schema_invalid_schema(schema):
+    """Test compile_schema rejects what gen_dict rejects."""
+    with pytest.raises(ValueError, match="Schema"):
+        compile_schema(schema)  # type: ignore[arg-type]
+
+
+def test_compile_schema_errors_are_raised_at_compile_time():
+    """Test invalid schemas are reported before generating any record."""
+    with pytest.raises(ValueError, match="must contain exactly one element"):
+        compile_schema({"tags": [gen_alpha, gen_email]})
+    with pytest.raises(ValueError, match="Maximum recursion depth"):
+        compile_schema({"a": {"b": {"c": gen_alpha}}}, max_depth=1)
+
+
+def test_compile_fields():
+    """Test fields are compiled on their own, in schema order."""
+    fields = compile_fields(
+        {"name": gen_alpha, "status": "active", "tags": [gen_alpha]}
+    )
+    assert list(fields) == ["name", "status", "tags"]
+    assert isinstance(fields["name"](), str)
+    assert fields["status"]() == "active"
+    assert len(fields["tags"]()) == 3
+
+
+def test_compile_fields_flatten():
+    """Test nested fields are flattened to their dotted path."""
+    schema = {"user": {"name": gen_alpha, "contact": {"tags": [gen_alpha]}}}
+    with pytest.raises(ValueError, match="flatten=True"):
+        compile_fields(schema)
+    fields = compile_fields(schema, flatten=True, list_sizes={"user.contact.tags": 1})
+    assert list(fields) == ["user.name", "user.contact.tags"]
+    assert len(fields["user.contact.tags"]()) == 1
+    with pytest.raises(ValueError, match="Maximum recursion depth"):
+        compile_fields(schema, flatten=True, max_depth=1)
+
+
+COLUMNS_SCHEMA = {
+    "name": gen_alpha,
+    "age": lambda: gen_integer(min_value=18, max_value=100),
+    "score": lambda: gen_integer(min_value=0, max_value=100) / 10,
+    "active": gen_boolean,
+    "status": "active",
+    "contact": {"email": gen_email, "rank": 1},
+    "tags": [gen_alpha],
+}
+
+
+def test_gen_columns():
+    """Test every field gets a column of count values."""
+    columns = gen_columns(COLUMNS_SCHEMA, 50)
+    assert list(columns) == [
+        "name",
+        "age",
+        "score",
+        "active",
+        "status",
+        "contact.email",
+        "contact.rank",
+        "tags",
+    ]
+    assert all(len(column) == 50 for column in columns.values())
+    assert all(18 <= age <= 100 for age in columns["age"])
+    assert all("@" in email for email in columns["contact.email"])
+    assert all(len(tags) == 3 for tags in columns["tags"])
+
+
+def test_gen_columns_types():
+    """Test numeric columns are compact arrays."""
+    columns = gen_columns(COLUMNS_SCHEMA, 10)
+    assert isinstance(columns["age"], array)
+    assert columns["age"].typecode == "q"
+    assert isinstance(columns["score"], array)
+    assert columns["score"].typecode == "d"
+    assert isinstance(columns["contact.rank"], array)
+    assert isinstance(columns["name"], list)
+    assert isinstance(columns["active"], list)
+    assert columns["status"] == ["active"] * 10
+
+
+def test_gen_columns_string_buffers():
+    """Test string columns can be stored in a single buffer."""
+    columns = gen_columns(COLUMNS_SCHEMA, 20, string_buffers=True)
+    names = columns["name"]
+    assert isinstance(names, StringColumn)
+    assert len(names) == 20
+    assert all(len(name) == 10 for name in names)
+    assert names[-1] == list(names)[-1]
+    assert names[2:4] == list(names)[2:4]
+    assert names.buffer == "".join(names)
+    with pytest.raises(IndexError):
+        names[20]
+    assert isinstance(columns["tags"], list)
+
+
+def test_gen_columns_mixed_types():
+    """Test values not fitting in an array fall back to a list."""
+    values = iter([1, 2, "three", 4])
+    assert gen_columns({"mixed": lambda: next(values)}, 4)["mixed"] == [
+        1,
+        2,
+        "three",
+        4,
+    ]
+    values = iter([1, 2**70, 3])
+    assert gen_columns({"big": lambda: next(values)}, 3)["big"] == [1, 2**70, 3]
+    values = iter(["a", 1])
+    assert gen_columns({"text": lambda: next(values)}, 2, string_buffers=True)[
+        "text"
+    ] == ["a", 1]
+
+
+def test_gen_columns_empty():
+    """Test generating no values."""
+    assert gen_columns({"name": gen_alpha}, 0) == {"name": []}
+
+
+def test_gen_columns_invalid_count():
+    """Test negative counts are rejected."""
+    with pytest.raises(ValueError, match="Count must be non-negative"):
+        gen_columns(COLUMNS_SCHEMA, -1)
+
+
+# Tests for parallel_generate()
+
+
+def gen_age():
+    """Generate an adult age, picklable unlike a lambda."""
+    return gen_integer(min_value=18, max_value=100)
+
+
+PARALLEL_SCHEMA = {
+    "name": gen_alpha,
+    "age": gen_age,
+    "tags": [gen_alpha],
+}
+
+
+def test_parallel_generate_same_items_for_any_worker_count():
+    """The same seed gives the same items whatever the number of workers."""
+    items = list(
+        parallel_generate(PARALLEL_SCHEMA, 25, workers=1, seed=3, chunk_size=4)
+    )
+    assert len(items) == 25
+    assert all(18 <= item["age"] <= 100 for item in items)
+    assert len({item["name"] for item in items}) == 25
+    for workers in (2, 3):
+        assert (
+            list(
+                parallel_generate(
+                    PARALLEL_SCHEMA, 25, workers=workers, seed=3, chunk_size=4
+                )
+            )
+            == items
+        )
+    assert list(parallel_generate(PARALLEL_SCHEMA, 25, workers=1, seed=4)) != items
+
+
+def test_parallel_generate_compiled_schema():
+    """Compiled schemas and list sizes are supported."""
+    plan = compile_schema(PARALLEL_SCHEMA, list_sizes={"tags": 2})
+    items = list(parallel_generate(plan, 5, workers=2, seed=1, chunk_size=2))
+    assert len(items) == 5
+    assert all(len(item["tags"]) == 2 for item in items)
+    assert list(
+        parallel_generate(PARALLEL_SCHEMA, 5, seed=1, list_sizes={"tags": 2})
+    ) == list(parallel_generate(plan, 5, seed=1))
+
+
+@pytest.mark.parametrize(
+    "method",
+    [
+        method
+        for method in ("spawn", "forkserver", "fork")
+        if method in multiprocessing.get_all_start_methods()
+    ],
+)
+def test_parallel_generate_start_methods(method):
+    """Every start method gives the items generated in a single process."""
+    context = multiprocessing.get_context(method)
+    items = list(parallel_generate(PARALLEL_SCHEMA, 9, workers=1, seed=6, chunk_size=2))
+    assert (
+        list(
+            parallel_generate(
+                PARALLEL_SCHEMA, 9, workers=2, seed=6, chunk_size=2, mp_context=context
+            )
+        )
+        == items
+    )
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="fork is not available",
+)
+def test_parallel_generate_fork_lambdas():
+    """Schemas holding lambdas are supported by forked workers."""
+    schema = {"age": lambda: gen_integer(min_value=1, max_value=9)}
+    context = multiprocessing.get_context("fork")
+    items = list(
+        parallel_generate(
+            schema, 6, workers=2, seed=1, chunk_size=2, mp_context=context
+        )
+    )
+    assert items == list(parallel_generate(schema, 6, workers=1, seed=1, chunk_size=2))
+
+
+def test_schema_plan_pickle():
+    """Plans of picklable schemas can be pickled and generate the same records."""
+    plan = compile_schema(PARALLEL_SCHEMA, list_sizes={"tags": 3})
+    copy = pickle.loads(pickle.dumps(plan))  # noqa: S301
+    with seeded(2):
+        records = plan.generate_many(5)
+    with seeded(2):
+        assert copy.generate_many(5) == records
+    with pytest.raises((AttributeError, pickle.PicklingError)):
+        pickle.dumps(compile_schema({"age": lambda: 1}))
+
+
+def test_parallel_generate_lazy():
+    """Items are generated chunk by chunk, as they are consumed."""
+    items = parallel_generate(gen_alpha, 10**9, workers=1, chunk_size=2)
+    assert len([next(items) for _ in range(3)]) == 3
+    items.close()
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"count": -1},
+        {"count": 1, "workers": 0},
+        {"count": 1, "chunk_size": 0},
+    ],
+)
+def test_parallel_generate_invalid_arguments(kwargs):
+    """Invalid arguments are rejected upfront."""
+    with pytest.raises(ValueError):
+        parallel_generate(gen_alpha, **kwargs)
+
+
+def test_gen_list_workers():
+    """Seeded lists generated in parallel do not depend on the worker count."""
+    with seeded(5):
+        first = gen_list(PARALLEL_SCHEMA, size=30, workers=1)
+    with seeded(5):
+        second = gen_list(PARALLEL_SCHEMA, size=30, workers=3)
+    assert len(first) == 30
+    assert first == second
+
+
+def test_parallel_generate_shards():
+    """Shards put together give the items generated by a single process."""
+    items = list(
+        parallel_generate(PARALLEL_SCHEMA, 23, workers=1, seed=9, chunk_size=3)
+    )
+    shards = [
+        list(
+            parallel_generate(
+                PARALLEL_SCHEMA,
+                23,
+                workers=2,
+                seed=9,
+                chunk_size=3,
+                shard_index=index,
+                shard_count=3,
+            )
+        )
+        for index in range(3)
+    ]
+    assert all(shards)
+    assert [item for shard in shards for item in shard] == items
+
+
+def test_gen_list_shards():
+    """Lists are sharded the same way through a Faux instance."""
+    full = Faux(seed=2).gen_list(PARALLEL_SCHEMA, size=2500, workers=2)
+    shards = [
+        Faux(seed=2).gen_list(
+            PARALLEL_SCHEMA, size=2500, shard_index=index, shard_count=4
+        )
+        for index in range(4)
+    ]
+    assert [item for shard in shards for item in shard] == full
+    with pytest.raises(ValueError):
+        gen_list(gen_alpha, size=1, shard_index=2, shard_count=2)
@@ -2,7 +2,12 @@
 
 import re
 
-from fauxfactory import gen_system_facts
+import pytest
+
+from fauxfactory import gen_fleet, gen_system_facts, seeded
+from fauxfactory.constants import FACTS_JSON
+from fauxfactory.factories import systems
+from fauxfactory.factories.systems import FactsOverlay, FactsTemplate
 
 REGEX = r"^([a-z0-9]+(-[a-z0-9]+)*\.)+[a-z]{2,}$"
 
@@ -45,3 +50,142 @@ def test_gen_system_facts_with_fqdn():
     assert facts["fqdn"] == "faux.example.com"
     assert facts["domain"] == "example.com"
     assert facts["hostname"] == "faux"
+
+
+def test_gen_system_facts_matches_template():
+    """Facts are the template facts, in the same order, plus generated ones."""
+    facts = gen_system_facts()
+    assert isinstance(facts, dict)
+    assert list(facts)[: len(FACTS_JSON)] == list(FACTS_JSON)
+    assert facts["bios_vendor"] == FACTS_JSON["bios_vendor"]
+
+
+def test_gen_system_facts_do_not_share_containers():
+    """Modifying a host never affects the template or other hosts."""
+    first = gen_system_facts()
+    first["processors"]["models"].append("foo")
+    for value in first.values():
+        if isinstance(value, (dict, list)):
+            value.clear()
+    second = gen_system_facts()
+    assert "foo" not in second["processors"]["models"]
+    assert all(second[key] for key in ("os", "partitions", "system_uptime"))
+
+
+def test_gen_system_facts_overlay():
+    """Overlays expose the same facts as plain dictionaries."""
+    with seeded(11):
+        expected = gen_system_facts(name="faux.example.com")
+    with seeded(11):
+        overlay = gen_system_facts(name="faux.example.com", materialize=False)
+    assert isinstance(overlay, FactsOverlay)
+    assert len(overlay) == len(expected)
+    assert list(overlay) == list(expected)
+    assert dict(overlay) == expected
+    assert overlay.materialize() == expected
+    assert overlay["hostname"] == "faux"
+
+
+def test_facts_overlay_copy_on_write():
+    """Overlays copy template containers before they can be modified."""
+    template = FactsTemplate({"scalar": 1, "nested": {"items": [1, 2]}})
+    first = template.overlay({})
+    second = template.overlay({"extra": True})
+    first["nested"]["items"].append(3)
+    first["scalar"] = 2
+    assert first.materialize() == {"scalar": 2, "nested": {"items": [1, 2, 3]}}
+    assert second.materialize() == {
+        "scalar": 1,
+        "nested": {"items": [1, 2]},
+        "extra": True,
+    }
+    assert template.facts["nested"]["items"] == (1, 2)
+
+
+def test_facts_overlay_delete():
+    """Facts can be removed from an overlay."""
+    overlay = FactsTemplate({"a": 1, "b": 2}).overlay({"c": 3})
+    del overlay["a"]
+    del overlay["c"]
+    assert "a" not in overlay
+    assert len(overlay) == 1
+    assert overlay.materialize() == {"b": 2}
+    with pytest.raises(KeyError):
+        overlay["a"]
+    with pytest.raises(KeyError):
+        del overlay["a"]
+    overlay["a"] = 4
+    assert overlay.materialize() == {"a": 4, "b": 2}
+
+
+def test_gen_fleet():
+    """Fleets are made of unique hosts in the requested domain."""
+    hosts = list(
+        gen_fleet(50, domain="example.com", memory=8, processors=4, chunk_size=7)
+    )
+    assert len(hosts) == 50
+    assert len({host["hostname"] for host in hosts}) == 50
+    assert len({host["uuid"] for host in hosts}) == 50
+    for host in hosts:
+        assert host["fqdn"] == f"{host['hostname']}.example.com"
+        assert host["domain"] == "example.com"
+        assert host["memorysize"] == "8 GB"
+        assert host["processorcount"] == 4
+        assert list(host)[: len(FACTS_JSON)] == list(FACTS_JSON)
+
+
+def test_gen_fleet_is_lazy():
+    """Hosts are generated a chunk at a time."""
+    hosts = gen_fleet(10**9, chunk_size=2, processes=1)
+    assert next(hosts)["fqdn"] != next(hosts)["fqdn"]
+
+
+def test_gen_fleet_seed():
+    """The same seed gives the same fleet whatever the number of processes."""
+    fleet = list(gen_fleet(12, seed=7, chunk_size=5, processes=1))
+    assert list(gen_fleet(12, seed=7, chunk_size=3, processes=1)) != fleet
+    assert list(gen_fleet(12, seed=7, chunk_size=5, processes=2)) == fleet
+    with seeded(1):
+        first = list(gen_fleet(3))
+    with seeded(1):
+        assert list(gen_fleet(3)) == first
+
+
+def test_gen_fleet_unique_identifiers(monkeypatch):
+    """Identifiers used by another host of the fleet are replaced."""
+    calls = {"uuid": 0, "mac": 0}
+    gen_uuid, gen_mac = systems.gen_uuid, systems.gen_mac
+
+    def duplicated(name, factory):
+        def wrapper():
+            calls[name] += 1
+            return f"duplicate-{name}" if calls[name] % 2 else factory()
+
+        return wrapper
+
+    monkeypatch.setattr(systems, "gen_uuid", duplicated("uuid", gen_uuid))
+    monkeypatch.setattr(systems, "gen_mac", duplicated("mac", gen_mac))
+    monkeypatch.setattr(systems, "gen_domain", lambda: "host.example.com")
+    hosts = list(gen_fleet(20, processes=1))
+    assert len({host["hostname"] for host in hosts}) == 20
+    assert len({host["fqdn"] for host in hosts}) == 20
+    assert len({host["uuid"] for host in hosts}) == 20
+    assert all(host["uuid"] == host["dmi::system::uuid"] for host in hosts)
+    macs = [host[key] for host in hosts for key in ("macaddress", "macaddress_enp11s0")]
+    assert len(set(macs)) == 40
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"count": -1},
+        {"count": 1, "processes": 0},
+        {"count": 1, "chunk_size": 0},
+        {"count": 1, "memory": 0},
+        {"count": 1, "memory": 2},
+    ],
+)
+def test_gen_fleet_invalid(kwargs):
+    """Invalid arguments are reported before generating any host."""
+    with pytest.raises(ValueError):
+        gen_fleet(**kwargs)
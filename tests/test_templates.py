@@ -0,0 +1,154 @@
+"""Tests for the format template string generator."""
+
+import re
+import uuid
+
+import pytest
+
+from fauxfactory import (
+    compile_template,
+    gen_domain,
+    gen_email,
+    gen_from_template,
+    gen_ipaddr,
+    gen_mac,
+    gen_uuid,
+    seeded,
+)
+from fauxfactory.constants import SUBDOMAINS, TLDS
+from fauxfactory.factories.templates import TemplatePlan
+
+DOMAIN = rf"[a-z]{{8}}\.({'|'.join(SUBDOMAINS)})\.({'|'.join(TLDS)})"
+
+TEMPLATES = [
+    ("usr-{alpha:8}-{int:0:999}@{domain}", rf"usr-[a-zA-Z]{{8}}-\d{{1,3}}@{DOMAIN}"),
+    ("{alpha}", r"[a-zA-Z]{10}"),
+    ("{alphanumeric:3}{numeric:4}", r"[a-zA-Z0-9]{3}\d{4}"),
+    ("{int:-5:-1}", r"-[1-5]"),
+    ("{int}", r"-?\d+"),
+    ("{choice:red|green|blue}", r"red|green|blue"),
+    (
+        "{{{uuid}}}",
+        r"\{[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}\}",
+    ),
+    ("{email}", rf"[a-zA-Z]{{8}}@({'|'.join(SUBDOMAINS)})\.({'|'.join(TLDS)})"),
+    ("{ipv4}/{ipv6}", r"(\d{1,3}\.){3}\d{1,3}/([0-9a-f]{1,4}:){7}[0-9a-f]{1,4}"),
+    ("{mac}", r"([0-9a-f]{2}:){5}[0-9a-f]{2}"),
+    ("no placeholder", r"no placeholder"),
+]
+
+
+@pytest.mark.parametrize(("template", "pattern"), TEMPLATES)
+def test_gen_from_template(template, pattern):
+    """Rendered strings fill every placeholder."""
+    assert re.fullmatch(pattern, gen_from_template(template))
+    values = compile_template(template).render_many(100)
+    assert len(values) == 100
+    for value in values:
+        assert re.fullmatch(pattern, value), value
+
+
+def test_template_values():
+    """Placeholders generate values in the requested range."""
+    values = compile_template("{int:0:3}").render_many(500)
+    assert {int(value) for value in values} == {0, 1, 2, 3}
+    for value in compile_template("{uuid}").render_many(10):
+        assert uuid.UUID(value).version == 4
+    assert len(compile_template("{cjk:5}").render()) == 5
+
+
+def test_compile_template_cached():
+    """Compiling the same template returns the same plan."""
+    plan = compile_template("{alpha:4}-{int:1:9}")
+    assert isinstance(plan, TemplatePlan)
+    assert compile_template("{alpha:4}-{int:1:9}") is plan
+    assert repr(plan) == "TemplatePlan('{alpha:4}-{int:1:9}')"
+
+
+def test_template_seeded():
+    """Rendering is reproducible with a seeded generator."""
+    plan = compile_template("{alpha:8}-{int:0:999}@{domain}/{mac}")
+    with seeded(7):
+        first = [plan.render() for _ in range(3)], plan.render_many(20)
+    with seeded(7):
+        second = [plan.render() for _ in range(3)], plan.render_many(20)
+    assert first == second
+    assert len(set(second[1])) == 20
+
+
+@pytest.mark.parametrize(
+    "template",
+    [
+        "{unknown}",
+        "{alpha:0}",
+        "{alpha:x}",
+        "{alpha:1:2}",
+        "{int:1}",
+        "{int:9:1}",
+        "{int:a:b}",
+        "{uuid:4}",
+        "{choice}",
+        "{alpha!r}",
+        "{}",
+        "{alpha",
+        "}",
+    ],
+)
+def test_invalid_template(template):
+    """Invalid templates are rejected when compiled."""
+    with pytest.raises(ValueError):
+        compile_template(template)
+
+
+@pytest.mark.parametrize("count", [-1, "1", 1.0])
+def test_render_many_invalid_count(count):
+    """The number of strings must be a non-negative integer."""
+    with pytest.raises(ValueError):
+        compile_template("{alpha}").render_many(count)
+
+
+def test_render_many_shards():
+    """Shards put together give the strings rendered with one shard."""
+    plan = compile_template("{alpha:5}-{int:0:99}")
+    with seeded(6):
+        full = plan.render_many(2500, shard_count=1)
+    parts = []
+    for index in range(4):
+        with seeded(6):
+            parts.extend(plan.render_many(2500, shard_index=index, shard_count=4))
+    assert parts == full
+    assert len(full) == 2500
+    with pytest.raises(ValueError):
+        plan.render_many(10, shard_index=1)
+
+
+@pytest.mark.parametrize("template", ["{alpha}-{email}", "literal"])
+def test_render_many_zero(template):
+    """Rendering no string returns an empty list."""
+    assert compile_template(template).render_many(0) == []
+
+
+@pytest.mark.parametrize(
+    ("placeholder", "factory", "kwargs"),
+    [
+        ("domain", gen_domain, {}),
+        ("email", gen_email, {}),
+        ("ipv4", gen_ipaddr, {}),
+        ("ipv6", gen_ipaddr, {"ipv6": True}),
+        ("mac", gen_mac, {}),
+        ("uuid", gen_uuid, {}),
+    ],
+)
+def test_template_factories(placeholder, factory, kwargs):
+    """Placeholders generate the same values as their factory."""
+    plan = compile_template(f"{{{placeholder}}}")
+    with seeded(11):
+        expected = [factory(**kwargs) for _ in range(4)]
+    with seeded(11):
+        assert [plan.render(), *plan.render_many(3)] == expected
+
+
+def test_compile_template_not_string():
+    """Only string templates are supported."""
+    with pytest.raises(ValueError):
+        compile_template(b"{alpha}")  # type: ignore[arg-type]
@@ -0,0 +1,242 @@
+"""Tests for the unique values generation."""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from fauxfactory import (
+    Faux,
+    UniqueRegistry,
+    gen_alpha,
+    gen_email,
+    gen_integer,
+    seeded,
+    unique,
+)
+from fauxfactory.uniqueness import BloomFilter, SqliteSet, UniqueTracker
+
+
+def test_unique_values():
+    """Wrapped factories never return the same value twice."""
+    dice = unique(gen_integer)
+    assert sorted(dice(1, 6) for _ in range(6)) == [1, 2, 3, 4, 5, 6]
+    assert dice.__name__ == "gen_integer"
+    with pytest.raises(ValueError, match="probably exhausted"):
+        dice(1, 6)
+    dice.clear()
+    assert dice(1, 1) == 1
+
+
+def test_unique_unhashable_values():
+    """Values are compared by their representation."""
+    factory = unique(lambda: [gen_integer(0, 2)])
+    assert sorted(factory() for _ in range(3)) == [[0], [1], [2]]
+
+
+@pytest.mark.parametrize("spill", [False, True])
+def test_unique_past_threshold(spill):
+    """Values are still unique once tracked out of the exact set."""
+    factory = unique(gen_integer, threshold=50, spill=spill)
+    values = [factory(0, 299) for _ in range(250)]
+    assert len(set(values)) == 250
+    assert len(factory.tracker) == 250
+    factory.close()
+
+
+def test_unique_spill_path(tmp_path):
+    """Values past the threshold can be stored in a given file."""
+    path = tmp_path / "seen.sqlite"
+    factory = unique(gen_alpha, threshold=10, spill=path)
+    values = {factory(4) for _ in range(100)}
+    assert len(values) == 100
+    assert path.exists()
+    factory.clear()
+    assert len(factory.tracker) == 0
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"max_tries": 0},
+        {"threshold": 0},
+        {"false_positive_rate": 0},
+        {"false_positive_rate": 1},
+    ],
+)
+def test_unique_invalid_arguments(kwargs):
+    """Invalid arguments are rejected."""
+    with pytest.raises(ValueError):
+        unique(gen_alpha, **kwargs)
+    with pytest.raises(ValueError):
+        unique("gen_alpha")
+
+
+def test_bloom_filter():
+    """Added keys are always found, false positives stay rare."""
+    bloom = BloomFilter(10_000, 0.01)
+    keys = [str(index).encode() for index in range(10_000)]
+    assert all(bloom.add(key) for key in keys[:100])
+    for key in keys[100:]:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+    assert not bloom.add(keys[0])
+    false_positives = sum(f"x{index}".encode() in bloom for index in range(10_000))
+    assert false_positives < 300
+
+
+def test_tracker_grows_bloom_filters():
+    """Full Bloom filters are followed by larger ones."""
+    tracker = UniqueTracker(threshold=10, false_positive_rate=0.001)
+    # New keys are seldom mistaken for repeats
+    assert sum(tracker.add(str(index).encode()) for index in range(1000)) > 990
+    assert len(tracker._blooms) > 1
+    assert not any(tracker.add(str(index).encode()) for index in range(1000))
+
+
+def test_sqlite_set(tmp_path):
+    """The set is exact and starts empty."""
+    path = tmp_path / "set.sqlite"
+    keys = SqliteSet(path)
+    assert keys.add(b"a")
+    assert not keys.add(b"a")
+    keys.update([b"a", b"b"])
+    assert b"b" in keys
+    assert len(keys) == 2
+    keys.close()
+    keys = SqliteSet(path)
+    assert len(keys) == 0
+    keys.close()
+
+
+def test_faux_unique():
+    """Factory methods of unique instances do not repeat values."""
+    faux = Faux(seed=1, unique=True)
+    assert sorted(faux.gen_integer(1, 3) for _ in range(3)) == [1, 2, 3]
+    with pytest.raises(ValueError):
+        faux.gen_integer(1, 3)
+    faux.gen_integer.clear()
+    assert faux.gen_integer(2, 2) == 2
+    assert Faux(seed=1).gen_integer(1, 1) == Faux(seed=1).gen_integer(1, 1)
+
+
+def test_unique_seeded():
+    """Unique values are reproducible with a seeded generator."""
+    with seeded(3):
+        first = [unique(gen_alpha)(2) for _ in range(5)]
+    with seeded(3):
+        assert [unique(gen_alpha)(2) for _ in range(5)] == first
+
+
+def test_registry_reserve(tmp_path):
+    """Keys are reserved once per namespace."""
+    registry = UniqueRegistry(tmp_path / "registry.db")
+    assert registry.reserve("a", [b"1", b"2", b"1"]) == [True, True, False]
+    assert registry.reserve("a", [b"2", b"3"]) == [False, True]
+    assert registry.reserve("b", [b"1"]) == [True]
+    assert registry.count("a") == 3
+    assert registry.count() == 4
+    registry.close()
+    # Reservations are kept in the file until cleared
+    registry = UniqueRegistry(tmp_path / "registry.db")
+    assert registry.count() == 4
+    registry.clear("a")
+    assert registry.count() == 1
+    registry.clear()
+    assert registry.count() == 0
+    registry.close()
+
+
+def test_unique_registry(tmp_path):
+    """Values are reserved in batches and exhausted values are reported."""
+    registry = UniqueRegistry(tmp_path / "registry.db")
+    dice = unique(gen_integer, registry=registry, batch_size=20)
+    assert sorted(dice(1, 6) for _ in range(6)) == [1, 2, 3, 4, 5, 6]
+    assert registry.count("gen_integer") == 6
+    with pytest.raises(ValueError, match="probably exhausted"):
+        dice(1, 6)
+    # Factories sharing a namespace share the values
+    other = unique(
+        lambda low, high: gen_integer(low, high),
+        registry=registry,
+        namespace="gen_integer",
+    )
+    with pytest.raises(ValueError):
+        other(1, 6)
+    assert 7 <= other(1, 7) <= 7
+    dice.clear()
+    assert registry.count("gen_integer") == 0
+    assert dice(2, 2) == 2
+    dice.close()
+
+
+def test_unique_registry_reserves_batches(tmp_path):
+    """A batch is reserved for every set of arguments."""
+    registry = UniqueRegistry(tmp_path / "registry.db")
+    factory = unique(gen_alpha, registry=registry, batch_size=10)
+    values = [factory(8) for _ in range(15)] + [factory(length=4) for _ in range(3)]
+    assert len(set(values)) == 18
+    assert registry.count("gen_alpha") == 30
+    with pytest.raises(ValueError):
+        unique(gen_alpha, registry=registry, batch_size=0)
+    registry.close()
+
+
+def _reserve_emails(path, count):
+    registry = UniqueRegistry(path)
+    unique_email = unique(gen_email, registry=registry, batch_size=25)
+    emails = [unique_email() for _ in range(count)]
+    registry.close()
+    return emails
+
+
+def test_unique_registry_processes(tmp_path):
+    """Processes sharing a registry never return the same value."""
+    path = tmp_path / "registry.db"
+    UniqueRegistry(path).close()
+    with seeded(0), ProcessPoolExecutor(max_workers=4) as executor:
+        # Forked workers would generate the same emails without the registry
+        results = list(executor.map(_reserve_emails, [path] * 8, [60] * 8))
+    emails = [email for result in results for email in result]
+    assert len(emails) == 480
+    assert len(set(emails)) == 480
+
+
+def _fork_reserve(queue, registry):
+    reserved = registry.reserve("numbers", [b"1", b"2"])
+    queue.put((reserved, registry.count("numbers")))
+    registry.close()
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="fork is not available",
+)
+def test_unique_registry_fork(tmp_path):
+    """The parent keeps using its connection after a child used the registry."""
+    registry = UniqueRegistry(tmp_path / "registry.db")
+    assert registry.reserve("numbers", [b"0", b"1"]) == [True, True]
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    process = context.Process(target=_fork_reserve, args=(queue, registry))
+    process.start()
+    assert queue.get(timeout=30) == ([False, True], 3)
+    process.join()
+    assert process.exitcode == 0
+    assert registry.reserve("numbers", [b"2", b"3"]) == [False, True]
+    assert registry.count("numbers") == 4
+    registry.clear("numbers")
+    assert registry.count() == 0
+    registry.close()
+
+
+def test_faux_unique_registry(tmp_path):
+    """Faux instances reserve the values of their methods in a registry."""
+    registry = UniqueRegistry(tmp_path / "registry.db")
+    first = Faux(seed=1, unique=registry)
+    second = Faux(seed=1, unique=registry)
+    values = {first.gen_alpha(3) for _ in range(50)}
+    values |= {second.gen_alpha(3) for _ in range(50)}
+    assert len(values) == 100
+    assert registry.count("gen_alpha") == 200
+    registry.close()
@@ -1,8 +1,12 @@
 """Unittests for all methods found in `utils.py`."""
 
+import random
+import string
+from collections import Counter
+
 import pytest
 
-from fauxfactory.helpers import is_positive_int
+from fauxfactory.helpers import AsciiAlphabet, CodepointSet, is_positive_int
 
 
 @pytest.mark.parametrize("length", [1, 2, 3, 30, 100])
@@ -41,3 +45,82 @@ def test_non_numeric_value(length):
     """Non-numeric values are not allowed."""
     with pytest.raises(ValueError):
         is_positive_int(length)
+
+
+def test_codepoint_set_len_and_indexing():
+    """Code point sets index characters across all their ranges."""
+    codepoints = CodepointSet((0x41, 0x43), (0x61, 0x62))
+    assert len(codepoints) == 5
+    assert "".join(codepoints[index] for index in range(5)) == "ABCab"
+    assert codepoints[-1] == "b"
+    with pytest.raises(IndexError):
+        codepoints[5]
+
+
+def test_codepoint_set_contains():
+    """Membership is checked against the inclusive ranges."""
+    codepoints = CodepointSet((0x41, 0x43), (0x61, 0x62))
+    assert "C" in codepoints
+    assert "b" in codepoints
+    assert "D" not in codepoints
+    assert "AB" not in codepoints
+    assert 0x41 not in codepoints
+
+
+@pytest.mark.parametrize(
+    "ranges", [((0x41, 0x43),), ((0x41, 0x43), (0x61, 0x62), (0x30, 0x30))]
+)
+def test_codepoint_set_sample(ranges):
+    """Sampled strings have the requested length and stay in the ranges."""
+    codepoints = CodepointSet(*ranges)
+    sample = codepoints.sample(500)
+    assert len(sample) == 500
+    assert set(sample) == {codepoints[index] for index in range(len(codepoints))}
+
+
+def test_codepoint_set_is_a_population():
+    """Code point sets can be handed over to random.choices."""
+    codepoints = CodepointSet((0x0400, 0x04FF))
+    assert all(char in codepoints for char in random.choices(codepoints, k=50))
+
+
+@pytest.mark.parametrize("ranges", [(), ((0x43, 0x41),)])
+def test_codepoint_set_invalid_ranges(ranges):
+    """Empty or reversed ranges are not allowed."""
+    with pytest.raises(ValueError):
+        CodepointSet(*ranges)
+
+
+@pytest.mark.parametrize(
+    "alphabet", [string.digits, string.ascii_letters, string.punctuation, "ab"]
+)
+def test_ascii_alphabet_sample(alphabet):
+    """Sampled strings have the requested length and use the whole alphabet."""
+    sample = AsciiAlphabet(alphabet).sample(5000)
+    assert len(sample) == 5000
+    assert set(sample) == set(alphabet)
+
+
+def test_ascii_alphabet_sample_is_uniform():
+    """Rejected bytes do not bias the distribution of characters."""
+    # 256 is not a multiple of 10, a plain modulo would favor 0 to 5
+    sample = AsciiAlphabet(string.digits).sample(100000)
+    counts = Counter(sample)
+    assert all(9000 < count < 11000 for count in counts.values())
+
+
+def test_ascii_alphabet_sequence():
+    """ASCII alphabets can be handed over to random.choices."""
+    alphabet = AsciiAlphabet("xyz")
+    assert len(alphabet) == 3
+    assert alphabet[1] == "y"
+    assert "z" in alphabet
+    assert "w" not in alphabet
+    assert set(random.choices(alphabet, k=50)) <= {"x", "y", "z"}
+
+
+@pytest.mark.parametrize("alphabet", ["", "é", "a" * 257])
+def test_ascii_alphabet_invalid(alphabet):
+    """Only non empty ASCII alphabets are allowed."""
+    with pytest.raises(ValueError):
+        AsciiAlphabet(alphabet)
@@ -1,9 +1,44 @@
 """Tests for UUID generator."""
 
-from fauxfactory import gen_uuid
+import subprocess
+import sys
+import uuid
+from pathlib import Path
+
+from fauxfactory import Faux, gen_uuid, seeded
 
 
 def test_gen_uuid_1():
     """Create a random UUID4 value."""
     for _ in range(100):
         assert gen_uuid()
+
+
+def test_gen_uuid_seeded():
+    """UUIDs drawn from an activated generator are reproducible."""
+    with seeded(7):
+        first = [gen_uuid() for _ in range(10)]
+    with seeded(7):
+        assert [gen_uuid() for _ in range(10)] == first
+    assert [Faux(seed=7).gen_uuid() for _ in range(2)] == first[:1] * 2
+    assert all(uuid.UUID(value).version == 4 for value in first)
+
+
+def test_gen_uuid_global_seed():
+    """Processes seeding the global generator alike get different UUIDs."""
+    outputs = {
+        subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import random, fauxfactory; random.seed(0); "
+                "print(fauxfactory.gen_uuid())",
+            ],
+            cwd=Path(__file__).parents[1],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+        for _ in range(2)
+    }
+    assert len(outputs) == 2
@@ -0,0 +1,215 @@
+"""Tests for the record writers."""
+
+import csv
+import io
+import json
+
+import pytest
+
+from fauxfactory import (
+    gen_alpha,
+    gen_dict,
+    gen_email,
+    gen_fleet,
+    gen_integer,
+    parallel_generate,
+    seeded,
+)
+from fauxfactory.factories.structures import compile_schema
+from fauxfactory.writers import write_csv, write_fleet, write_ndjson
+
+SCHEMA = {
+    "name": gen_alpha,
+    "age": lambda: gen_integer(min_value=0, max_value=99),
+    "address": {"city": gen_alpha, "zip": lambda: gen_integer(10000, 99999)},
+    "tags": [gen_alpha],
+    "active": True,
+}
+
+
+class CountingWriter(io.StringIO):
+    """In memory text file counting the write calls."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text: str) -> int:
+        self.writes += 1
+        return super().write(text)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1000])
+def test_write_ndjson(chunk_size):
+    """Every record is written as a JSON document on its own line."""
+    output = CountingWriter()
+    with seeded(3):
+        assert write_ndjson(SCHEMA, 25, output, chunk_size=chunk_size) == 25
+    with seeded(3):
+        expected = compile_schema(SCHEMA).generate_many(25)
+    lines = output.getvalue().splitlines()
+    assert [json.loads(line) for line in lines] == expected
+    assert output.writes == -(-25 // chunk_size)
+
+
+def test_write_ndjson_path(tmp_path):
+    """Records can be written to a path."""
+    path = tmp_path / "records.jsonl"
+    write_ndjson(SCHEMA, 10, path, list_sizes={"tags": 1})
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(records) == 10
+    assert all(len(record["tags"]) == 1 for record in records)
+
+
+def test_write_ndjson_no_records():
+    """Writing no records writes nothing."""
+    output = io.StringIO()
+    assert write_ndjson(SCHEMA, 0, output) == 0
+    assert output.getvalue() == ""
+
+
+@pytest.mark.parametrize(("count", "chunk_size"), [(-1, 10), ("1", 10), (1, 0)])
+def test_write_ndjson_invalid_arguments(count, chunk_size):
+    """Counts must be non-negative and chunks must not be empty."""
+    with pytest.raises(ValueError):
+        write_ndjson(SCHEMA, count, io.StringIO(), chunk_size=chunk_size)
+
+
+def test_write_ndjson_shards():
+    """Shards put together give the records of parallel_generate."""
+    with seeded(5):
+        expected = list(parallel_generate(SCHEMA, 23, workers=1, chunk_size=4))
+    lines = []
+    for index in range(3):
+        output = io.StringIO()
+        with seeded(5):
+            written = write_ndjson(
+                SCHEMA, 23, output, chunk_size=4, shard_index=index, shard_count=3
+            )
+        assert written == len(output.getvalue().splitlines())
+        lines.extend(output.getvalue().splitlines())
+    assert [json.loads(line) for line in lines] == expected
+    with pytest.raises(ValueError):
+        write_ndjson(SCHEMA, 23, io.StringIO(), shard_index=3, shard_count=3)
+
+
+FLAT_SCHEMA = {
+    "id": lambda: gen_integer(min_value=1, max_value=10**6),
+    "name": gen_alpha,
+    "email": gen_email,
+    "status": "active",
+}
+
+
+def test_write_csv():
+    """Rows follow the schema order and start with a header."""
+    output = io.StringIO(newline="")
+    assert write_csv(FLAT_SCHEMA, 20, output, chunk_size=6) == 20
+    rows = list(csv.reader(io.StringIO(output.getvalue())))
+    assert rows[0] == list(FLAT_SCHEMA)
+    assert len(rows) == 21
+    for row in rows[1:]:
+        assert int(row[0]) >= 1
+        assert "@" in row[2]
+        assert row[3] == "active"
+
+
+def test_write_csv_reproducible():
+    """Rows hold the values gen_dict would generate."""
+    output = io.StringIO(newline="")
+    with seeded(9):
+        write_csv(FLAT_SCHEMA, 5, output, header=False)
+    with seeded(9):
+        expected = [
+            [str(value) for value in gen_dict(FLAT_SCHEMA).values()] for _ in range(5)
+        ]
+    assert list(csv.reader(io.StringIO(output.getvalue()))) == expected
+
+
+def test_write_csv_shards():
+    """Shards put together give the rows written with a single shard."""
+    output = io.StringIO(newline="")
+    with seeded(2):
+        assert write_csv(FLAT_SCHEMA, 23, output, chunk_size=4, shard_count=1) == 23
+    parts = []
+    for index in range(4):
+        part = io.StringIO(newline="")
+        with seeded(2):
+            write_csv(
+                FLAT_SCHEMA,
+                23,
+                part,
+                chunk_size=4,
+                shard_index=index,
+                shard_count=4,
+                header=index == 0,
+            )
+        parts.append(part.getvalue())
+    assert "".join(parts) == output.getvalue()
+
+
+def test_write_csv_path(tmp_path):
+    """Rows can be written to a path."""
+    path = tmp_path / "records.csv"
+    write_csv(FLAT_SCHEMA, 3, path)
+    with path.open(newline="") as handler:
+        assert len(list(csv.DictReader(handler))) == 3
+
+
+def test_write_csv_nested_schema():
+    """Nested dictionaries require flattening."""
+    with pytest.raises(ValueError, match="address"):
+        write_csv(SCHEMA, 1, io.StringIO())
+
+
+def test_write_csv_flatten():
+    """Flattened nested fields are named after their dotted path."""
+    output = io.StringIO(newline="")
+    write_csv(SCHEMA, 2, output, flatten=True, list_sizes={"tags": 2})
+    reader = csv.DictReader(io.StringIO(output.getvalue()))
+    assert reader.fieldnames == [
+        "name",
+        "age",
+        "address.city",
+        "address.zip",
+        "tags",
+        "active",
+    ]
+    for row in reader:
+        assert len(row["address.zip"]) == 5
+        assert row["tags"].startswith("[")
+
+
+@pytest.mark.parametrize(("count", "chunk_size"), [(-1, 10), (1, 0)])
+def test_write_csv_invalid_arguments(count, chunk_size):
+    """Counts must be non-negative and chunks must not be empty."""
+    with pytest.raises(ValueError):
+        write_csv(FLAT_SCHEMA, count, io.StringIO(), chunk_size=chunk_size)
+
+
+def test_write_fleet():
+    """Every host is written as a JSON document on its own line."""
+    output = CountingWriter()
+    assert write_fleet(10, output, seed=1, chunk_size=4, domain="example.com") == 10
+    hosts = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert hosts == list(gen_fleet(10, seed=1, chunk_size=4, domain="example.com"))
+    assert hosts != list(gen_fleet(10, seed=1, domain="example.com"))
+    assert output.writes == 3
+
+
+def test_write_fleet_per_host(tmp_path):
+    """Every host can be written to its own file."""
+    directory = tmp_path / "fleet"
+    assert write_fleet(5, directory, per_host=True, seed=2) == 5
+    hosts = list(gen_fleet(5, seed=2))
+    assert sorted(path.name for path in directory.iterdir()) == sorted(
+        f"{host['fqdn']}.json" for host in hosts
+    )
+    for host in hosts:
+        assert json.loads((directory / f"{host['fqdn']}.json").read_text()) == host
+
+
+def test_write_fleet_per_host_file_object():
+    """Writing one file per host requires a directory path."""
+    with pytest.raises(ValueError):
+        write_fleet(1, io.StringIO(), per_host=True)